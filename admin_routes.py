@@ -1,23 +1,28 @@
 from fastapi import APIRouter, Request, Form, Depends, HTTPException
 from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
-from fastapi.templating import Jinja2Templates
 from database import supabase
-from auth import verify_password, create_token
+from auth import PasswordCheckBusy, verify_password_async, create_token
 from jose import jwt, JWTError
+import asyncio
 import os
 import json
+import re
+import functools
 import traceback
 from datetime import datetime
 from urllib.parse import urlencode
 from dotenv import load_dotenv
 
 # pricing helpers
+from utils import cache_bus, http_clients, plan_catalog
 from utils.currency import get_price_context
+from utils.rate_limit import admin_login_account_limiter, admin_login_ip_limiter, get_client_ip
+from utils.templating import templates
+from utils.workflows import load_workflow
 
 load_dotenv()
 
 router = APIRouter()
-templates = Jinja2Templates(directory="templates")
 
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = "HS256"
@@ -35,6 +40,37 @@ def check_auth(request: Request):
         raise HTTPException(status_code=401)
     
 
+def _mutation_succeeded(response) -> bool:
+    if isinstance(response, dict):
+        return response.get("success", True) is not False
+    if getattr(response, "status_code", 200) >= 400:
+        return False
+    if isinstance(response, JSONResponse):
+        try:
+            return json.loads(response.body).get("success", True) is not False
+        except (ValueError, AttributeError):
+            return True
+    return True
+
+
+def invalidates(*kinds: str, key: str | None = None):
+    """
+    Publish cache_bus events for kinds once the wrapped admin mutation succeeds.
+    `key` names the route argument holding the changed row's id; the event then
+    carries that id so subscribers can refresh just that row.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            response = await func(*args, **kwargs)
+            if _mutation_succeeded(response):
+                for kind in kinds:
+                    cache_bus.publish(kind, kwargs.get(key) if key else None)
+            return response
+        return wrapper
+    return decorator
+
+
 @router.get("/admin/login")
 async def admin_login_page(request: Request):
     ctx = await get_price_context(request)
@@ -49,6 +85,16 @@ async def admin_root():
     return RedirectResponse(url="/admin/login", status_code=302)
 
 
+async def admin_login_error(request: Request, error: str, status_code: int = 200, retry_after: int = 0):
+    ctx = await get_price_context(request)
+    return templates.TemplateResponse(
+        "admin.html",
+        {"request": request, "error": error, **ctx},
+        status_code=status_code,
+        headers={"Retry-After": str(retry_after)} if retry_after else None,
+    )
+
+
 @router.post("/admin/login")
 async def admin_login(
     request: Request,
@@ -56,19 +102,47 @@ async def admin_login(
     password: str = Form(...)
 ):
 
-    if email != ADMIN_EMAIL:
-        ctx = await get_price_context(request)
-        return templates.TemplateResponse(
-            "admin.html",
-            {"request": request, "error": "Invalid email address", **ctx}
+    # Every attempt counts against both limits before hashing, so a rejected
+    # attempt costs no bcrypt work and concurrent attempts cannot slip through.
+    # A successful login clears the account's attempts, so only failures lock
+    # it and knowing the admin email alone is not enough to lock the admin out.
+    client_ip = get_client_ip(request)
+    account = (email or "").strip().lower()
+    if not admin_login_ip_limiter.hit(client_ip):
+        return await admin_login_error(
+            request,
+            "Too many login attempts. Please try again later.",
+            status_code=429,
+            retry_after=admin_login_ip_limiter.retry_after(client_ip),
+        )
+    if not admin_login_account_limiter.hit(account):
+        return await admin_login_error(
+            request,
+            "Too many login attempts. Please try again later.",
+            status_code=429,
+            retry_after=admin_login_account_limiter.retry_after(account),
         )
 
-    if not verify_password(password):
-        ctx = await get_price_context(request)
-        return templates.TemplateResponse(
-            "admin.html",
-            {"request": request, "error": "Invalid password", **ctx}
+    if email != ADMIN_EMAIL:
+        return await admin_login_error(request, "Invalid email address")
+
+    try:
+        password_ok = await verify_password_async(password)
+    except PasswordCheckBusy:
+        return await admin_login_error(
+            request,
+            "Login is busy right now. Please try again in a moment.",
+            status_code=503,
+            retry_after=1,
         )
+    except Exception as e:
+        print(f"❌ Error verifying admin password: {str(e)}")
+        password_ok = False
+
+    if not password_ok:
+        return await admin_login_error(request, "Invalid password")
+
+    admin_login_account_limiter.clear(account)
 
     token = create_token()
 
@@ -96,136 +170,8 @@ async def admin_dashboard(
     except HTTPException:
         return RedirectResponse(url="/admin/login", status_code=302)
 
-    # Fetch all blogs and stories from Supabase
-    try:
-        blogs_data = supabase.table("blogs").select("*").execute()
-        blogs = blogs_data.data if blogs_data.data else []
-    except Exception as e:
-        blogs = []
-    
-    try:
-        stories_data = supabase.table("stories").select("*").execute()
-        stories = stories_data.data if stories_data.data else []
-    except Exception as e:
-        stories = []
-
-    try:
-        ai_tools_data = (
-            supabase
-            .table("ai_tools")
-            .select("*")
-            .order("display_order", desc=False)
-            .execute()
-        )
-        ai_tools = ai_tools_data.data if ai_tools_data.data else []
-
-        details_map = {}
-        tool_ids = [tool.get("id") for tool in ai_tools if tool.get("id") is not None]
-        if tool_ids:
-            details_res = (
-                supabase
-                .table("ai_tool_details")
-                .select("*")
-                .in_("ai_tool_id", tool_ids)
-                .execute()
-            )
-            for detail in (details_res.data or []):
-                if detail.get("pros"):
-                    try:
-                        detail["pros"] = json.loads(detail["pros"]) if isinstance(detail["pros"], str) else detail["pros"]
-                    except Exception:
-                        pass
-                if detail.get("cons"):
-                    try:
-                        detail["cons"] = json.loads(detail["cons"]) if isinstance(detail["cons"], str) else detail["cons"]
-                    except Exception:
-                        pass
-                if detail.get("pricing"):
-                    try:
-                        detail["pricing"] = json.loads(detail["pricing"]) if isinstance(detail["pricing"], str) else detail["pricing"]
-                    except Exception:
-                        pass
-
-                ai_tool_id = detail.get("ai_tool_id")
-                if ai_tool_id is not None and ai_tool_id not in details_map:
-                    details_map[ai_tool_id] = detail
-
-        for tool in ai_tools:
-            tool["details"] = details_map.get(tool.get("id"))
-    except Exception:
-        ai_tools = []
-    
-    # Fetch use cases with tool names
-    try:
-        use_cases_data = (
-            supabase
-            .table("ai_tool_use_cases")
-            .select("*, ai_tools(name)")
-            .order("id", desc=False)
-            .execute()
-        )
-        use_cases = []
-        if use_cases_data.data:
-            for uc in use_cases_data.data:
-                use_cases.append({
-                    "id": uc.get("id"),
-                    "ai_tool_id": uc.get("ai_tool_id"),
-                    "tool_name": uc.get("ai_tools", {}).get("name", "Unknown") if uc.get("ai_tools") else "Unknown",
-                    "title": uc.get("title", ""),
-                    "icon": uc.get("icon", ""),
-                    "description": uc.get("description", ""),
-                    "is_active": uc.get("is_active", True)
-                })
-    except Exception as e:
-        print(f"❌ Error fetching use cases: {str(e)}")
-        use_cases = []
-    
-    # Fetch FAQs with tool names
-    try:
-        faqs_data = (
-            supabase
-            .table("ai_tool_faqs")
-            .select("*, ai_tools(name)")
-            .order("id", desc=False)
-            .execute()
-        )
-        faqs = []
-        if faqs_data.data:
-            for faq in faqs_data.data:
-                faqs.append({
-                    "id": faq.get("id"),
-                    "ai_tool_id": faq.get("ai_tool_id"),
-                    "tool_name": faq.get("ai_tools", {}).get("name", "Unknown") if faq.get("ai_tools") else "Unknown",
-                    "question": faq.get("question", ""),
-                    "answer": faq.get("answer", ""),
-                    "is_active": faq.get("is_active", True)
-                })
-    except Exception as e:
-        print(f"❌ Error fetching FAQs: {str(e)}")
-        faqs = []
-
-    try:
-        pricing_res = (
-            supabase
-            .table("pricing_plans")
-            .select("*")
-            .order("display_order", desc=False)
-            .execute()
-        )
-        pricing_plans = pricing_res.data if pricing_res.data else []
-        for plan in pricing_plans:
-            plan["features_list_1"] = parse_json_list(plan.get("features_list_1"))
-            plan["features_list_2"] = parse_json_list(plan.get("features_list_2"))
-        # Only active paid plans for user access assignment (exclude free / null-price / inactive plans)
-        paid_plans = [
-            p for p in pricing_plans
-            if p.get("is_active") and p.get("price_inr") is not None and float(p.get("price_inr") or 0) > 0
-        ]
-    except Exception as e:
-        print(f"❌ Error fetching pricing plans: {str(e)}")
-        pricing_plans = []
-        paid_plans = []
-
+    # Sections are fetched lazily by the dashboard through /admin/api/sections/*;
+    # only the settings page is rendered inline.
     try:
         settings_res = supabase.table("site_settings").select("key,value").execute()
         site_settings = {row["key"]: row["value"] for row in (settings_res.data or [])}
@@ -238,35 +184,6 @@ async def admin_dashboard(
             site_settings = {}
     free_pdf_filename = site_settings.get("free_pdf_filename", "BudasAI Insight Feb 2026.pdf")
 
-    try:
-        users_res = (
-            supabase
-            .table("user_profiles")
-            .select("*")
-            .order("created_at", desc=True)
-            .execute()
-        )
-        user_profiles = users_res.data if users_res.data else []
-        for user in user_profiles:
-            user["plan_ids"] = parse_json_list(user.get("plan_ids"))
-    except Exception as e:
-        print(f"❌ Error fetching user profiles: {str(e)}")
-        user_profiles = []
-
-    try:
-        billing_res = (
-            supabase
-            .table("billing_records")
-            .select("*")
-            .order("created_at", desc=True)
-            .limit(150)
-            .execute()
-        )
-        billing_records = billing_res.data if billing_res.data else []
-    except Exception as e:
-        print(f"❌ Error fetching billing records: {str(e)}")
-        billing_records = []
-    
     ctx = await get_price_context(request)
     status = request.query_params.get("status")
     message = request.query_params.get("message")
@@ -274,15 +191,6 @@ async def admin_dashboard(
         "admin_dashboard.html",
         {
             "request": request,
-            "blogs": blogs,
-            "stories": stories,
-            "ai_tools": ai_tools,
-            "use_cases": use_cases,
-            "faqs": faqs,
-            "pricing_plans": pricing_plans,
-            "paid_plans": paid_plans,
-            "user_profiles": user_profiles,
-            "billing_records": billing_records,
             "free_pdf_filename": free_pdf_filename,
             "admin_status": status,
             "admin_message": message,
@@ -291,6 +199,273 @@ async def admin_dashboard(
     )
 
 
+# ── Admin dashboard sections ──
+# Each dashboard tab fetches its rows from /admin/api/sections/<name> when it is
+# opened. Columns, sort keys and filters are whitelisted per section so the
+# query string can never select or order by arbitrary columns.
+SECTION_DEFAULT_PAGE_SIZE = 25
+SECTION_MAX_PAGE_SIZE = 200
+
+AI_TOOL_DETAIL_COLUMNS = (
+    "id,ai_tool_id,tagline,company,founded,headquarters,website,founders,about,"
+    "mmlu_score,humaneval_score,gsm8k_score,hellaswag_score,truthfulqa_score,pros,cons,pricing"
+)
+
+
+def _as_bool(value: str) -> bool:
+    return str(value).strip().lower() in {"1", "true", "yes", "on", "active"}
+
+
+def _parse_json_field(value):
+    if isinstance(value, str):
+        try:
+            return json.loads(value)
+        except Exception:
+            return value
+    return value
+
+
+def _attach_tool_details(tools: list) -> None:
+    tool_ids = [tool.get("id") for tool in tools if tool.get("id") is not None]
+    details_map = {}
+    if tool_ids:
+        details_res = (
+            supabase
+            .table("ai_tool_details")
+            .select(AI_TOOL_DETAIL_COLUMNS)
+            .in_("ai_tool_id", tool_ids)
+            .execute()
+        )
+        for detail in (details_res.data or []):
+            for key in ("pros", "cons", "pricing"):
+                if detail.get(key):
+                    detail[key] = _parse_json_field(detail[key])
+            ai_tool_id = detail.get("ai_tool_id")
+            if ai_tool_id is not None and ai_tool_id not in details_map:
+                details_map[ai_tool_id] = detail
+    for tool in tools:
+        tool["details"] = details_map.get(tool.get("id"))
+
+
+def _flatten_tool_name(rows: list) -> None:
+    for row in rows:
+        tool = row.pop("ai_tools", None)
+        row["tool_name"] = (tool or {}).get("name") or "Unknown"
+
+
+def _parse_plan_features(plans: list) -> None:
+    for plan in plans:
+        plan["features_list_1"] = parse_json_list(plan.get("features_list_1"))
+        plan["features_list_2"] = parse_json_list(plan.get("features_list_2"))
+
+
+def _parse_user_plans(users: list) -> None:
+    for user in users:
+        user["plan_ids"] = parse_json_list(user.get("plan_ids"))
+
+
+ADMIN_SECTIONS = {
+    "blogs": {
+        "table": "blogs",
+        # html_content is heavy; the edit form loads it per blog via the item endpoint.
+        "columns": "id,title,slug,category,image_url,excerpt,date,is_published,create_at",
+        "item_columns": "id,title,slug,category,image_url,excerpt,date,is_published,create_at,html_content",
+        "sort": {"id": "id", "title": "title", "created": "create_at"},
+        "default_sort": ("id", True),
+        "search": ["title", "slug"],
+        "filters": {"is_published": ("is_published", "eq", _as_bool), "category": ("category", "eq", str)},
+    },
+    "stories": {
+        "table": "stories",
+        "columns": (
+            "id,title,category,img_url,problem,solution,before_text,after_text,cta_text,"
+            "results,is_publish,created_at"
+        ),
+        "sort": {"id": "id", "title": "title", "created": "created_at"},
+        "default_sort": ("id", True),
+        "search": ["title"],
+        "filters": {"is_publish": ("is_publish", "eq", _as_bool), "category": ("category", "eq", str)},
+    },
+    "ai_tools": {
+        "table": "ai_tools",
+        "columns": (
+            "id,name,best_for,image_url,display_order,is_active,quality_score,ease_score,"
+            "accuracy_score,speed_score,value_score,creativity_score,integration_score,"
+            "consistency_score,support_score,time_saved_score"
+        ),
+        "sort": {"order": "display_order", "id": "id", "name": "name"},
+        "default_sort": ("display_order", False),
+        "search": ["name"],
+        "filters": {"is_active": ("is_active", "eq", _as_bool)},
+        "extras": {"details": _attach_tool_details},
+    },
+    "use_cases": {
+        "table": "ai_tool_use_cases",
+        "columns": "id,ai_tool_id,title,icon,description,is_active,ai_tools(name)",
+        "sort": {"id": "id", "title": "title"},
+        "default_sort": ("id", False),
+        "search": ["title"],
+        "filters": {"ai_tool_id": ("ai_tool_id", "eq", int), "is_active": ("is_active", "eq", _as_bool)},
+        "post": _flatten_tool_name,
+    },
+    "faqs": {
+        "table": "ai_tool_faqs",
+        "columns": "id,ai_tool_id,question,answer,is_active,ai_tools(name)",
+        "sort": {"id": "id", "question": "question"},
+        "default_sort": ("id", False),
+        "search": ["question"],
+        "filters": {"ai_tool_id": ("ai_tool_id", "eq", int), "is_active": ("is_active", "eq", _as_bool)},
+        "post": _flatten_tool_name,
+    },
+    "pricing_plans": {
+        "table": "pricing_plans",
+        "columns": (
+            "id,plan_name,plan_heading,plan_subheading,price_inr,discount_percent,"
+            "features_heading_1,features_list_1,features_heading_2,features_list_2,"
+            "button_text,price_note,button_url,show_terms,is_popular,display_order,is_active,"
+            "card_bg_color,badge_bg_color,badge_text_color,badge_text"
+        ),
+        "sort": {"order": "display_order", "price": "price_inr", "id": "id"},
+        "default_sort": ("display_order", False),
+        "search": ["plan_name", "plan_heading"],
+        # is_active=true&min_price=0 gives the paid plans used for billing.
+        "filters": {"is_active": ("is_active", "eq", _as_bool), "min_price": ("price_inr", "gt", float)},
+        "post": _parse_plan_features,
+    },
+    "user_profiles": {
+        "table": "user_profiles",
+        "columns": (
+            "id,email,full_name,phone_number,dob,profession,plan_ids,primary_plan_id,"
+            "is_active,created_at"
+        ),
+        "sort": {"created": "created_at", "email": "email"},
+        "default_sort": ("created_at", True),
+        "search": ["email", "full_name", "phone_number"],
+        "filters": {"is_active": ("is_active", "eq", _as_bool)},
+        "post": _parse_user_plans,
+    },
+    "billing_records": {
+        "table": "billing_records",
+        "columns": (
+            "id,email,plan_id,plan_name,amount,currency,payment_status,starts_at,expires_at,created_at"
+        ),
+        "sort": {"created": "created_at", "expires": "expires_at", "amount": "amount"},
+        "default_sort": ("created_at", True),
+        "search": ["email", "plan_name"],
+        "filters": {"payment_status": ("payment_status", "eq", str), "plan_id": ("plan_id", "eq", str)},
+    },
+}
+
+
+def _clean_search_term(value: str) -> str:
+    # PostgREST or=() filters use , ( ) as separators and * as wildcard.
+    return re.sub(r"[,()*%\\:]", " ", value or "").strip()[:100]
+
+
+def _section_int(value: str, default: int, minimum: int, maximum: int) -> int:
+    try:
+        parsed = int(value)
+    except (TypeError, ValueError):
+        return default
+    return max(minimum, min(parsed, maximum))
+
+
+@router.get("/admin/api/outbound-stats")
+async def admin_outbound_stats(auth=Depends(check_auth)):
+    """Connection pool metrics for this worker's outbound HTTP clients."""
+    return {"success": True, "pid": os.getpid(), "pools": http_clients.pool_stats()}
+
+
+@router.get("/admin/api/sections/{section}")
+async def get_admin_section(section: str, request: Request, auth=Depends(check_auth)):
+    config = ADMIN_SECTIONS.get(section)
+    if not config:
+        return JSONResponse(status_code=404, content={"success": False, "error": "Unknown section"})
+
+    params = request.query_params
+    page = _section_int(params.get("page"), 1, 1, 100000)
+    per_page = _section_int(params.get("per_page"), SECTION_DEFAULT_PAGE_SIZE, 1, SECTION_MAX_PAGE_SIZE)
+    sort_column, descending = config["default_sort"]
+    if params.get("sort") in config["sort"]:
+        sort_column = config["sort"][params["sort"]]
+    if params.get("order") in {"asc", "desc"}:
+        descending = params["order"] == "desc"
+
+    try:
+        query = supabase.table(config["table"]).select(config["columns"], count="exact")
+
+        for name, (column, op, caster) in config.get("filters", {}).items():
+            raw = (params.get(name) or "").strip()
+            if not raw:
+                continue
+            try:
+                value = caster(raw)
+            except (TypeError, ValueError):
+                return JSONResponse(status_code=400, content={"success": False, "error": f"Invalid {name}"})
+            query = getattr(query, op)(column, value)
+
+        term = _clean_search_term(params.get("q"))
+        if term:
+            query = query.or_(",".join(f"{column}.ilike.*{term}*" for column in config["search"]))
+
+        start = (page - 1) * per_page
+        query = query.order(sort_column, desc=descending)
+        if sort_column != "id":
+            # Stable paging when the sort column has duplicates
+            query = query.order("id", desc=descending)
+        result = query.range(start, start + per_page - 1).execute()
+        items = result.data or []
+        if config.get("post"):
+            config["post"](items)
+        include = {name.strip() for name in (params.get("include") or "").split(",") if name.strip()}
+        for name, attach in config.get("extras", {}).items():
+            if name in include:
+                attach(items)
+
+        total = result.count if result.count is not None else start + len(items)
+        return {
+            "success": True,
+            "section": section,
+            "items": items,
+            "page": page,
+            "per_page": per_page,
+            "total": total,
+            "pages": max(1, -(-total // per_page)),
+        }
+    except Exception as e:
+        err_text = str(e)
+        if "PGRST205" in err_text:
+            return {"success": True, "section": section, "items": [], "page": 1, "per_page": per_page, "total": 0, "pages": 1}
+        print(f"❌ Error loading admin section {section}: {err_text}")
+        traceback.print_exc()
+        return JSONResponse(status_code=500, content={"success": False, "error": err_text})
+
+
+@router.get("/admin/api/sections/{section}/{item_id}")
+async def get_admin_section_item(section: str, item_id: str, auth=Depends(check_auth)):
+    config = ADMIN_SECTIONS.get(section)
+    if not config:
+        return JSONResponse(status_code=404, content={"success": False, "error": "Unknown section"})
+
+    try:
+        result = (
+            supabase
+            .table(config["table"])
+            .select(config.get("item_columns", config["columns"]))
+            .eq("id", item_id)
+            .limit(1)
+            .execute()
+        )
+        items = result.data or []
+        if items and config.get("post"):
+            config["post"](items)
+        return {"success": bool(items), "item": items[0] if items else None}
+    except Exception as e:
+        print(f"❌ Error loading admin {section} item {item_id}: {str(e)}")
+        traceback.print_exc()
+        return JSONResponse(status_code=500, content={"success": False, "error": str(e)})
+
+
 @router.get("/admin/workflows", response_class=HTMLResponse)
 async def admin_workflow_builder(request: Request):
     try:
@@ -301,7 +476,89 @@ async def admin_workflow_builder(request: Request):
     return RedirectResponse(url="/admin/dashboard", status_code=302)
 
 
+WORKFLOW_SAVE_RPC = "save_premium_workflow"
+
+
+def _save_workflow_legacy(payload: dict, tool: str, tab: str):
+    """Row-by-row save used only while the save_premium_workflow RPC is not deployed."""
+    workflow_row = {
+        "tool": tool,
+        "tab": tab,
+        "difficulty": payload.get("difficulty") or "Beginner",
+        "eyebrow_text": payload.get("eyebrow_text") or "",
+        "eyebrow_color": payload.get("eyebrow_color") or "#ef4444",
+        "panel_title": payload.get("panel_title") or "",
+        "description": payload.get("description") or "",
+        "stat_pills": payload.get("stat_pills") or [],
+        "tool_chips": payload.get("tool_chips") or [],
+        "result_summary": payload.get("result_summary") or [],
+        "updated_at": datetime.now().isoformat(),
+    }
+
+    existing = (
+        supabase
+        .table("premium_workflows")
+        .select("id")
+        .eq("tool", tool)
+        .eq("tab", tab)
+        .limit(1)
+        .execute()
+    )
+    existing_rows = existing.data or []
+
+    if existing_rows:
+        workflow_id = existing_rows[0]["id"]
+        supabase.table("premium_workflows").update(workflow_row).eq("id", workflow_id).execute()
+    else:
+        inserted = supabase.table("premium_workflows").insert(workflow_row).execute()
+        workflow_id = (inserted.data or [{}])[0].get("id")
+
+    if not workflow_id:
+        return None
+
+    supabase.table("premium_workflow_steps").delete().eq("workflow_id", workflow_id).execute()
+    supabase.table("premium_workflow_results").delete().eq("workflow_id", workflow_id).execute()
+
+    steps_to_insert = []
+    for phase_index, phase in enumerate(payload.get("phases") or [], start=1):
+        phase_name = phase.get("phase_name") or f"Phase {phase_index}"
+        for step_index, step in enumerate(phase.get("steps") or [], start=1):
+            steps_to_insert.append({
+                "workflow_id": workflow_id,
+                "phase_number": phase_index,
+                "phase_name": phase_name,
+                "step_number": step_index,
+                "title": step.get("title") or "",
+                "tools_used": step.get("tools_used") or "",
+                "badge_color": step.get("badge_color") or None,
+                "step_num_color": step.get("step_num_color") or None,
+                "time_estimate": step.get("time_estimate") or "",
+                "description": step.get("description") or "",
+                "prompt": step.get("prompt") or "",
+                "expected_output": step.get("expected_output") or "",
+                "pro_tip": step.get("pro_tip") or "",
+            })
+
+    if steps_to_insert:
+        supabase.table("premium_workflow_steps").insert(steps_to_insert).execute()
+
+    results_to_insert = []
+    for stat_number, stat in enumerate(payload.get("result_summary") or [], start=1):
+        results_to_insert.append({
+            "workflow_id": workflow_id,
+            "stat_number": stat_number,
+            "value": stat.get("value") or "",
+            "label": stat.get("label") or "",
+            "color": stat.get("color") or "#ffffff",
+        })
+    if results_to_insert:
+        supabase.table("premium_workflow_results").insert(results_to_insert).execute()
+
+    return workflow_id
+
+
 @router.post("/admin/workflow/save")
+@invalidates(cache_bus.WORKFLOWS)
 async def save_admin_workflow(request: Request, auth=Depends(check_auth)):
     try:
         payload = await request.json()
@@ -313,80 +570,47 @@ async def save_admin_workflow(request: Request, auth=Depends(check_auth)):
     if not tool or not tab:
         return JSONResponse(status_code=400, content={"success": False, "error": "tool and tab are required"})
 
+    # Single transactional round trip: the RPC diffs steps/results server-side,
+    # writes only changed rows and bumps premium_workflows.content_version.
+    # See premium_workflow_save.sql.
+    rpc_payload = {
+        "tool": tool,
+        "tab": tab,
+        "difficulty": payload.get("difficulty"),
+        "eyebrow_text": payload.get("eyebrow_text"),
+        "eyebrow_color": payload.get("eyebrow_color"),
+        "panel_title": payload.get("panel_title"),
+        "description": payload.get("description"),
+        "stat_pills": payload.get("stat_pills") or [],
+        "tool_chips": payload.get("tool_chips") or [],
+        "result_summary": payload.get("result_summary") or [],
+        "phases": payload.get("phases") or [],
+    }
+
     try:
-        workflow_row = {
-            "tool": tool,
-            "tab": tab,
-            "difficulty": payload.get("difficulty") or "Beginner",
-            "eyebrow_text": payload.get("eyebrow_text") or "",
-            "eyebrow_color": payload.get("eyebrow_color") or "#ef4444",
-            "panel_title": payload.get("panel_title") or "",
-            "description": payload.get("description") or "",
-            "stat_pills": payload.get("stat_pills") or [],
-            "tool_chips": payload.get("tool_chips") or [],
-            "result_summary": payload.get("result_summary") or [],
-            "updated_at": datetime.now().isoformat(),
+        result = supabase.rpc(WORKFLOW_SAVE_RPC, {"payload": rpc_payload}).execute()
+        saved = result.data if isinstance(result.data, dict) else {}
+        workflow_id = saved.get("workflow_id")
+        if not workflow_id:
+            return JSONResponse(status_code=500, content={"success": False, "error": "Unable to create workflow row"})
+        return {
+            "success": True,
+            "workflow_id": workflow_id,
+            "content_version": saved.get("content_version"),
+            "changed": bool(saved.get("changed")),
         }
+    except Exception as e:
+        err_text = str(e)
+        if not ("PGRST202" in err_text and WORKFLOW_SAVE_RPC in err_text):
+            print(f"❌ Error saving admin workflow: {err_text}")
+            traceback.print_exc()
+            return JSONResponse(status_code=500, content={"success": False, "error": err_text})
+        print(f"⚠️ {WORKFLOW_SAVE_RPC} RPC not deployed, using legacy workflow save. Run premium_workflow_save.sql.")
 
-        existing = (
-            supabase
-            .table("premium_workflows")
-            .select("id")
-            .eq("tool", tool)
-            .eq("tab", tab)
-            .limit(1)
-            .execute()
-        )
-        existing_rows = existing.data or []
-
-        if existing_rows:
-            workflow_id = existing_rows[0]["id"]
-            supabase.table("premium_workflows").update(workflow_row).eq("id", workflow_id).execute()
-        else:
-            inserted = supabase.table("premium_workflows").insert(workflow_row).execute()
-            workflow_id = (inserted.data or [{}])[0].get("id")
-
+    try:
+        workflow_id = _save_workflow_legacy(payload, tool, tab)
         if not workflow_id:
             return JSONResponse(status_code=500, content={"success": False, "error": "Unable to create workflow row"})
-
-        supabase.table("premium_workflow_steps").delete().eq("workflow_id", workflow_id).execute()
-        supabase.table("premium_workflow_results").delete().eq("workflow_id", workflow_id).execute()
-
-        steps_to_insert = []
-        for phase_index, phase in enumerate(payload.get("phases") or [], start=1):
-            phase_name = phase.get("phase_name") or f"Phase {phase_index}"
-            for step_index, step in enumerate(phase.get("steps") or [], start=1):
-                steps_to_insert.append({
-                    "workflow_id": workflow_id,
-                    "phase_number": phase_index,
-                    "phase_name": phase_name,
-                    "step_number": step_index,
-                    "title": step.get("title") or "",
-                    "tools_used": step.get("tools_used") or "",
-                    "badge_color": step.get("badge_color") or None,
-                    "step_num_color": step.get("step_num_color") or None,
-                    "time_estimate": step.get("time_estimate") or "",
-                    "description": step.get("description") or "",
-                    "prompt": step.get("prompt") or "",
-                    "expected_output": step.get("expected_output") or "",
-                    "pro_tip": step.get("pro_tip") or "",
-                })
-
-        if steps_to_insert:
-            supabase.table("premium_workflow_steps").insert(steps_to_insert).execute()
-
-        results_to_insert = []
-        for stat_number, stat in enumerate(payload.get("result_summary") or [], start=1):
-            results_to_insert.append({
-                "workflow_id": workflow_id,
-                "stat_number": stat_number,
-                "value": stat.get("value") or "",
-                "label": stat.get("label") or "",
-                "color": stat.get("color") or "#ffffff",
-            })
-        if results_to_insert:
-            supabase.table("premium_workflow_results").insert(results_to_insert).execute()
-
         return {"success": True, "workflow_id": workflow_id}
     except Exception as e:
         print(f"❌ Error saving admin workflow: {str(e)}")
@@ -402,87 +626,26 @@ async def load_admin_workflow(tool: str = "", tab: str = "", auth=Depends(check_
         return JSONResponse(status_code=400, content={"success": False, "error": "tool and tab are required"})
 
     try:
-        workflow_result = (
-            supabase
-            .table("premium_workflows")
-            .select("*")
-            .eq("tool", tool)
-            .eq("tab", tab)
-            .limit(1)
-            .execute()
-        )
-        workflow_rows = workflow_result.data or []
-        if not workflow_rows:
+        workflow = load_workflow(tool, tab)
+        if not workflow:
             return {"success": True, "workflow": None}
 
-        workflow = workflow_rows[0]
-        workflow_id = workflow["id"]
-
-        steps_result = (
-            supabase
-            .table("premium_workflow_steps")
-            .select("*")
-            .eq("workflow_id", workflow_id)
-            .order("phase_number")
-            .order("step_number")
-            .execute()
-        )
-        steps_rows = steps_result.data or []
-
-        phases_map = {}
-        for row in steps_rows:
-            phase_number = row.get("phase_number")
-            if phase_number not in phases_map:
-                phases_map[phase_number] = {
-                    "phase_name": row.get("phase_name") or "",
-                    "steps": [],
-                }
-            phases_map[phase_number]["steps"].append({
-                "title": row.get("title") or "",
-                "tools_used": row.get("tools_used") or "",
-                "badge_color": row.get("badge_color") or "",
-                "step_num_color": row.get("step_num_color") or "",
-                "time_estimate": row.get("time_estimate") or "",
-                "description": row.get("description") or "",
-                "prompt": row.get("prompt") or "",
-                "expected_output": row.get("expected_output") or "",
-                "pro_tip": row.get("pro_tip") or "",
-            })
-        phases = [phases_map[k] for k in sorted(phases_map.keys())]
-
-        results_result = (
-            supabase
-            .table("premium_workflow_results")
-            .select("*")
-            .eq("workflow_id", workflow_id)
-            .order("stat_number")
-            .execute()
-        )
-        results_rows = results_result.data or []
-        result_summary = [
-            {
-                "value": row.get("value") or "",
-                "label": row.get("label") or "",
-                "color": row.get("color") or "#ffffff",
-            }
-            for row in results_rows
-        ]
-
         return {
             "success": True,
             "workflow": {
-                "id": workflow_id,
-                "tool": workflow.get("tool") or "",
-                "tab": workflow.get("tab") or "",
-                "difficulty": workflow.get("difficulty") or "Beginner",
-                "eyebrow_text": workflow.get("eyebrow_text") or "",
-                "eyebrow_color": workflow.get("eyebrow_color") or "#ef4444",
-                "panel_title": workflow.get("panel_title") or "",
-                "description": workflow.get("description") or "",
-                "stat_pills": workflow.get("stat_pills") or [],
-                "tool_chips": workflow.get("tool_chips") or [],
-                "result_summary": result_summary if result_summary else (workflow.get("result_summary") or []),
-                "phases": phases,
+                "id": workflow["id"],
+                "tool": workflow["tool"],
+                "tab": workflow["tab"],
+                "difficulty": workflow["difficulty"],
+                "eyebrow_text": workflow["eyebrow_text"],
+                "eyebrow_color": workflow["eyebrow_color"] or "#ef4444",
+                "panel_title": workflow["panel_title"],
+                "description": workflow["description"],
+                "stat_pills": workflow["stat_pills"],
+                "tool_chips": workflow["tool_chips"],
+                "result_summary": workflow["result_summary"],
+                "phases": workflow["phases"],
+                "content_version": workflow["content_version"],
             },
         }
     except Exception as e:
@@ -494,16 +657,8 @@ async def load_admin_workflow(tool: str = "", tab: str = "", auth=Depends(check_
 @router.get("/admin/api/pricing-plan/{plan_id}")
 async def get_pricing_plan(plan_id: str, auth=Depends(check_auth)):
     try:
-        result = (
-            supabase
-            .table("pricing_plans")
-            .select("*")
-            .eq("id", plan_id)
-            .limit(1)
-            .execute()
-        )
-        rows = result.data or []
-        return {"success": len(rows) > 0, "plan": rows[0] if rows else None}
+        plan = (await asyncio.to_thread(plan_catalog.get_catalog)).get(plan_id)
+        return {"success": plan is not None, "plan": plan}
     except Exception as e:
         print(f"❌ Error loading pricing plan {plan_id}: {str(e)}")
         traceback.print_exc()
@@ -511,6 +666,7 @@ async def get_pricing_plan(plan_id: str, auth=Depends(check_auth)):
 
 
 @router.post("/admin/api/pricing-plan/update")
+@invalidates(cache_bus.PRICING_PLANS)
 async def update_pricing_plan(request: Request, auth=Depends(check_auth)):
     try:
         payload = await request.json()
@@ -673,6 +829,7 @@ def get_next_display_order() -> int:
 
 
 @router.post("/admin/aitool/create")
+@invalidates(cache_bus.AI_TOOLS)
 async def create_ai_tool(
     request: Request,
     name: str = Form(...),
@@ -727,6 +884,7 @@ async def create_ai_tool(
 
 
 @router.post("/admin/aitool/update")
+@invalidates(cache_bus.AI_TOOLS, key="id")
 async def update_ai_tool(
     request: Request,
     id: int = Form(...),
@@ -785,6 +943,7 @@ async def update_ai_tool(
 # ════════════════════════════════════════════════════════════════
 
 @router.post("/admin/aitool/details/save")
+@invalidates(cache_bus.AI_TOOLS, key="ai_tool_id")
 async def save_ai_tool_details(
     request: Request,
     ai_tool_id: int = Form(...),
@@ -861,6 +1020,7 @@ async def save_ai_tool_details(
 
 
 @router.post("/admin/aitool/usecase/create")
+@invalidates(cache_bus.AI_TOOLS, key="ai_tool_id")
 async def create_use_case(
     request: Request,
     ai_tool_id: int = Form(...),
@@ -909,6 +1069,7 @@ async def create_use_case(
 
 
 @router.post("/admin/aitool/usecase/delete")
+@invalidates(cache_bus.AI_TOOLS)
 async def delete_use_case(
     request: Request,
     id: int = Form(...),
@@ -927,6 +1088,7 @@ async def delete_use_case(
 
 
 @router.post("/admin/aitool/faq/create")
+@invalidates(cache_bus.AI_TOOLS, key="ai_tool_id")
 async def create_faq(
     request: Request,
     ai_tool_id: int = Form(...),
@@ -970,6 +1132,7 @@ async def create_faq(
 
 
 @router.post("/admin/aitool/faq/delete")
+@invalidates(cache_bus.AI_TOOLS)
 async def delete_faq(
     request: Request,
     id: int = Form(...),
@@ -988,6 +1151,7 @@ async def delete_faq(
 
 
 @router.post("/admin/aitool/details/update")
+@invalidates(cache_bus.AI_TOOLS, key="ai_tool_id")
 async def update_ai_tool_details(
     request: Request,
     ai_tool_id: int = Form(...),
@@ -1053,6 +1217,7 @@ async def update_ai_tool_details(
 
 
 @router.post("/admin/aitool/usecase/update")
+@invalidates(cache_bus.AI_TOOLS)
 async def update_use_case(
     request: Request,
     id: int = Form(...),
@@ -1082,6 +1247,7 @@ async def update_use_case(
 
 
 @router.post("/admin/aitool/faq/update")
+@invalidates(cache_bus.AI_TOOLS)
 async def update_faq(
     request: Request,
     id: int = Form(...),
@@ -1109,6 +1275,7 @@ async def update_faq(
 
 
 @router.post("/admin/blog/create")
+@invalidates(cache_bus.BLOGS)
 async def create_blog(
     request: Request,
     title: str = Form(...),
@@ -1159,6 +1326,7 @@ async def create_blog(
 
 
 @router.post("/admin/blog/update")
+@invalidates(cache_bus.BLOGS, key="id")
 async def update_blog(
     request: Request,
     id: int = Form(...),
@@ -1208,6 +1376,7 @@ async def update_blog(
 
 
 @router.post("/admin/pricing/create")
+@invalidates(cache_bus.PRICING_PLANS)
 async def create_pricing_plan(
     request: Request,
     plan_name: str = Form(...),
@@ -1276,6 +1445,7 @@ async def create_pricing_plan(
 
 
 @router.post("/admin/pricing/update")
+@invalidates(cache_bus.PRICING_PLANS)
 async def update_pricing_plan(
     request: Request,
     id: str = Form(...),
@@ -1346,6 +1516,7 @@ async def update_pricing_plan(
 
 
 @router.post("/admin/user/create")
+@invalidates(cache_bus.USER_PROFILES)
 async def create_user_profile(
     request: Request,
     email: str = Form(...),
@@ -1380,6 +1551,7 @@ async def create_user_profile(
 
 
 @router.post("/admin/user/update")
+@invalidates(cache_bus.USER_PROFILES)
 async def update_user_profile(
     request: Request,
     id: str = Form(...),
@@ -1428,6 +1600,7 @@ async def update_user_profile(
 
 
 @router.post("/admin/billing/create")
+@invalidates(cache_bus.BILLING)
 async def create_billing_record(
     request: Request,
     user_id: str = Form(...),
@@ -1470,17 +1643,9 @@ async def create_billing_record(
         return admin_json_response("error", "Unable to load selected user.")
 
     try:
-        plan_res = (
-            supabase
-            .table("pricing_plans")
-            .select("id,plan_name,plan_heading,price_inr")
-            .eq("id", plan_id)
-            .limit(1)
-            .execute()
-        )
-        if not plan_res.data:
+        plan_row = (await asyncio.to_thread(plan_catalog.get_catalog)).get(plan_id)
+        if not plan_row:
             return admin_json_response("error", "Selected plan not found.")
-        plan_row = plan_res.data[0]
     except Exception as e:
         print(f"❌ Error loading plan for billing: {str(e)}")
         return admin_json_response("error", "Unable to load selected plan.")
@@ -1544,6 +1709,7 @@ async def create_billing_record(
 
 
 @router.post("/admin/story/create")
+@invalidates(cache_bus.STORIES)
 async def create_story(
     request: Request,
     title: str = Form(...),
@@ -1615,6 +1781,7 @@ async def create_story(
 
 
 @router.post("/admin/story/update")
+@invalidates(cache_bus.STORIES)
 async def update_story(
     request: Request,
     id: int = Form(...),
@@ -1693,6 +1860,7 @@ async def admin_logout(request: Request):
 
 
 @router.post("/admin/settings/update")
+@invalidates(cache_bus.SITE_SETTINGS)
 async def update_site_settings(
     request: Request,
     free_pdf_filename: str = Form(...),
@@ -1,6 +1,7 @@
 import os
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from jose import jwt
-from passlib.context import CryptContext
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 import sys
@@ -18,13 +19,57 @@ if not SECRET_KEY:
 if not ADMIN_PASSWORD_HASH:
     print("⚠️ WARNING: ADMIN_PASSWORD_HASH not set. Admin login will not work.")
 
-pwd_context = CryptContext(
-    schemes=["bcrypt_sha256"],
-    deprecated="auto"
-)
+# bcrypt runs on a small dedicated pool (the bcrypt backend releases the GIL),
+# never on the event loop. Checks beyond PASSWORD_HASH_MAX_PENDING are refused
+# instead of queued, so a login burst cannot build up a backlog.
+PASSWORD_HASH_THREADS = int(os.getenv("PASSWORD_HASH_THREADS", "2"))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "8"))
+
+_pwd_context = None
+
+
+def get_pwd_context():
+    # passlib/bcrypt are only needed for admin login, so load them on first use.
+    global _pwd_context
+    if _pwd_context is None:
+        from passlib.context import CryptContext
+        _pwd_context = CryptContext(
+            schemes=["bcrypt_sha256"],
+            deprecated="auto"
+        )
+    return _pwd_context
 
 def verify_password(password):
-    return pwd_context.verify(password, ADMIN_PASSWORD_HASH)
+    if not ADMIN_PASSWORD_HASH:
+        return False
+    return get_pwd_context().verify(password, ADMIN_PASSWORD_HASH)
+
+
+class PasswordCheckBusy(Exception):
+    """Raised when the hashing pool already has PASSWORD_HASH_MAX_PENDING checks."""
+
+
+_hash_executor = None
+_pending_checks = 0
+
+
+async def verify_password_async(password):
+    """verify_password on the hashing pool, keeping the event loop free."""
+    global _hash_executor, _pending_checks
+    if _pending_checks >= PASSWORD_HASH_MAX_PENDING:
+        raise PasswordCheckBusy()
+    if _hash_executor is None:
+        _hash_executor = ThreadPoolExecutor(
+            max_workers=PASSWORD_HASH_THREADS,
+            thread_name_prefix="password-hash"
+        )
+
+    _pending_checks += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_hash_executor, verify_password, password)
+    finally:
+        _pending_checks -= 1
 
 def create_token():
     return jwt.encode(
@@ -1,5 +1,6 @@
-from supabase import create_client
 import os
+import re
+import threading
 from dotenv import load_dotenv
 
 # Load .env variables
@@ -19,16 +20,88 @@ if not SUPABASE_URL or not SUPABASE_KEY:
     print("Please set them in your Railway dashboard or .env file")
     raise RuntimeError(error_msg)
 
-print("✅ Supabase credentials loaded successfully")
-if os.getenv("SUPABASE_SERVICE_ROLE_KEY") or os.getenv("SUPABASE_SERVICE_KEY"):
-    print("✅ Using Supabase service-role key for server operations")
-else:
+if not (os.getenv("SUPABASE_SERVICE_ROLE_KEY") or os.getenv("SUPABASE_SERVICE_KEY")):
     print("⚠️ Using SUPABASE_KEY fallback. Set SUPABASE_SERVICE_ROLE_KEY for reliable server-side writes.")
 
-# Create client
-try:
-    supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
-    print("✅ Supabase client created successfully")
-except Exception as e:
-    print(f"❌ Failed to create Supabase client: {e}")
-    raise
\ No newline at end of file
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_supabase():
+    """
+    Return the shared Supabase client, creating it on first use.
+
+    Importing the supabase package (postgrest, auth, storage, realtime,
+    functions) is the slowest part of boot, so it is deferred until the first
+    query or until warm_supabase() runs it in the background.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from supabase import ClientOptions, create_client
+                from utils.http_clients import get_sync_client
+                try:
+                    # PostgREST, auth and storage all share the pooled
+                    # keep-alive HTTP/2 client from utils.http_clients.
+                    _client = create_client(
+                        SUPABASE_URL,
+                        SUPABASE_KEY,
+                        options=ClientOptions(httpx_client=get_sync_client()),
+                    )
+                except Exception as e:
+                    print(f"❌ Failed to create Supabase client: {e}")
+                    raise
+    return _client
+
+
+def reset_supabase() -> None:
+    """Drop the shared client; the next query builds it again on the current HTTP pool."""
+    global _client
+    with _client_lock:
+        _client = None
+
+
+def warm_supabase() -> threading.Thread:
+    """Build the client on a background thread so startup does not wait for it."""
+    def _warm():
+        try:
+            get_supabase()
+        except Exception:
+            pass  # already logged; the first query will retry
+
+    thread = threading.Thread(target=_warm, name="supabase-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+class _LazySupabase:
+    """Stand-in for the client: `from database import supabase` keeps working."""
+
+    def __getattr__(self, name):
+        return getattr(get_supabase(), name)
+
+
+supabase = _LazySupabase()
+
+
+_MISSING_COLUMN_RE = re.compile(r"column \w+\.(\w+) does not exist")
+_missing_columns: dict[str, set] = {}
+
+
+def select_existing(table: str, columns: list[str], apply=lambda query: query) -> list[dict]:
+    """
+    Select columns from table, dropping (and remembering) any the table does
+    not have. For optional columns that differ between older and newer
+    schemas, e.g. blogs.update_at.
+    """
+    while True:
+        wanted = [column for column in columns if column not in _missing_columns.get(table, ())]
+        try:
+            return apply(supabase.table(table).select(",".join(wanted))).execute().data or []
+        except Exception as e:
+            match = _MISSING_COLUMN_RE.search(str(e))
+            if not match or match.group(1) not in wanted or match.group(1) == "id":
+                raise
+            print(f"⚠️ [DATABASE] {table}.{match.group(1)} does not exist, selecting without it")
+            _missing_columns.setdefault(table, set()).add(match.group(1))
@@ -0,0 +1,420 @@
+"""
+Production launcher: one preloaded master process forking N uvicorn workers.
+
+    python launcher.py
+
+The app is imported once in the master. Then the GC heap is frozen and the
+workers are forked, so the imported modules, the compiled templates and the
+route tables stay shared copy-on-write pages instead of one copy per worker.
+Every worker accepts connections from the same listening socket.
+
+Signals sent to the master:
+    SIGHUP          graceful reload: re-exec the master with the listening
+                    socket inherited, start a new generation of workers,
+                    then drain the old ones (no dropped connections)
+    SIGTERM/SIGINT  graceful stop: workers finish in-flight requests, then exit
+    SIGTTIN/SIGTTOU add / remove one worker
+
+Settings (environment):
+    PORT, HOST                  listen address (defaults 8000, 0.0.0.0)
+    WEB_CONCURRENCY             fixed worker count (skips auto sizing)
+    WORKER_MEMORY_MB            expected memory per worker for auto sizing
+    MAX_WORKERS                 upper bound for auto sizing
+    GRACEFUL_TIMEOUT            seconds a worker gets to drain before SIGKILL
+    WORKER_STATS_INTERVAL       seconds between per-worker RSS/throughput logs
+    FORWARDED_ALLOW_IPS         comma-separated proxy IPs/CIDRs whose X-Forwarded-For
+                                is trusted (default 127.0.0.1); set it to the
+                                platform proxy's range, never "*"
+"""
+import gc
+import mmap
+import os
+import signal
+import socket
+import struct
+import subprocess
+import sys
+import time
+from dotenv import load_dotenv
+
+load_dotenv()
+
+HOST = os.getenv("HOST", "0.0.0.0")
+PORT = int(os.getenv("PORT", "8000"))
+WORKER_MEMORY_MB = int(os.getenv("WORKER_MEMORY_MB", "160"))
+MAX_WORKERS = int(os.getenv("MAX_WORKERS", "8"))
+GRACEFUL_TIMEOUT = int(os.getenv("GRACEFUL_TIMEOUT", "30"))
+WORKER_STATS_INTERVAL = int(os.getenv("WORKER_STATS_INTERVAL", "300"))
+LOG_LEVEL = os.getenv("UVICORN_LOG_LEVEL", "info")
+# request.client.host is the rightmost X-Forwarded-For address that is not one
+# of these proxies. Trusting "*" would hand clients the leftmost, forgeable one,
+# and every per-IP limit keys on it.
+FORWARDED_ALLOW_IPS = os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1").strip() or "127.0.0.1"
+
+# Memory kept for the master and the OS when sizing workers.
+MASTER_RESERVE_MB = 128
+
+# Handed from a master to its re-exec'd replacement on SIGHUP.
+_LISTEN_FD_ENV = "LAUNCHER_LISTEN_FD"
+_RETIRING_ENV = "LAUNCHER_RETIRING_PIDS"
+
+# Per-worker counters shared with the master: (ready, requests) per slot.
+_SLOT = struct.Struct("qq")
+_MAX_SLOTS = 64
+
+
+# ---------------------------------------------------------------------------
+# Sizing
+# ---------------------------------------------------------------------------
+
+def _read_first_line(path: str) -> str | None:
+    try:
+        with open(path) as f:
+            return f.readline().strip()
+    except OSError:
+        return None
+
+
+def available_cpus() -> int:
+    """CPUs usable by this process, honouring affinity and cgroup CPU quotas."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+
+    quota = _read_first_line("/sys/fs/cgroup/cpu.max")  # cgroup v2: "<quota> <period>"
+    if quota and not quota.startswith("max"):
+        limit, period = quota.split()
+        cpus = min(cpus, max(1, int(limit) // int(period)))
+    else:
+        limit = _read_first_line("/sys/fs/cgroup/cpu/cpu.cfs_quota_us")  # cgroup v1
+        period = _read_first_line("/sys/fs/cgroup/cpu/cpu.cfs_period_us")
+        if limit and period and int(limit) > 0:
+            cpus = min(cpus, max(1, int(limit) // int(period)))
+    return max(1, cpus)
+
+
+def available_memory_mb() -> int | None:
+    """Container memory limit, or MemAvailable when there is no limit."""
+    for path in ("/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory/memory.limit_in_bytes"):
+        value = _read_first_line(path)
+        if value and value.isdigit() and int(value) < 1 << 60:
+            return int(value) // (1024 * 1024)
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) // 1024
+    except OSError:
+        pass
+    return None
+
+
+def worker_count() -> int:
+    configured = os.getenv("WEB_CONCURRENCY", "").strip()
+    if configured:
+        return max(1, int(configured))
+
+    workers = available_cpus()
+    memory_mb = available_memory_mb()
+    if memory_mb is not None:
+        workers = min(workers, max(1, (memory_mb - MASTER_RESERVE_MB) // WORKER_MEMORY_MB))
+    return max(1, min(workers, MAX_WORKERS, _MAX_SLOTS))
+
+
+# ---------------------------------------------------------------------------
+# Worker side
+# ---------------------------------------------------------------------------
+
+class _CountingApp:
+    """ASGI wrapper that publishes readiness and request totals to the master."""
+
+    def __init__(self, app, stats: mmap.mmap, slot: int):
+        self.app = app
+        self.stats = stats
+        self.offset = slot * _SLOT.size
+
+    def _bump(self, ready: int | None = None, requests: int = 0) -> None:
+        current_ready, current_requests = _SLOT.unpack_from(self.stats, self.offset)
+        _SLOT.pack_into(
+            self.stats,
+            self.offset,
+            current_ready if ready is None else ready,
+            current_requests + requests,
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            self._bump(requests=1)
+            return await self.app(scope, receive, send)
+
+        if scope["type"] == "lifespan":
+            async def lifespan_send(message):
+                if message["type"] == "lifespan.startup.complete":
+                    self._bump(ready=1)
+                await send(message)
+
+            return await self.app(scope, receive, lifespan_send)
+
+        return await self.app(scope, receive, send)
+
+
+def _run_worker(app, sock: socket.socket, stats: mmap.mmap, slot: int) -> None:
+    import uvicorn
+
+    for sig in (signal.SIGHUP, signal.SIGTTIN, signal.SIGTTOU, signal.SIGCHLD):
+        signal.signal(sig, signal.SIG_DFL)
+
+    config = uvicorn.Config(
+        _CountingApp(app, stats, slot),
+        lifespan="on",
+        log_level=LOG_LEVEL,
+        proxy_headers=True,
+        forwarded_allow_ips=FORWARDED_ALLOW_IPS,
+        timeout_graceful_shutdown=GRACEFUL_TIMEOUT,
+    )
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+# ---------------------------------------------------------------------------
+# Master side
+# ---------------------------------------------------------------------------
+
+def _bind_socket() -> socket.socket:
+    inherited = os.environ.pop(_LISTEN_FD_ENV, "")
+    if inherited:
+        sock = socket.socket(fileno=int(inherited))
+        print(f"🔵 [LAUNCHER] Reusing inherited socket on {HOST}:{PORT}", flush=True)
+    else:
+        sock = socket.socket(socket.AF_INET6 if ":" in HOST else socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((HOST, PORT))
+        sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _memory_mb(pid: int) -> tuple[float, float]:
+    """(RSS, private) in MB. Private is what the worker does not share with the master."""
+    rss = private = 0
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                key, _, rest = line.partition(":")
+                if key == "Rss":
+                    rss = int(rest.split()[0])
+                elif key in ("Private_Clean", "Private_Dirty"):
+                    private += int(rest.split()[0])
+    except (OSError, ValueError):
+        pass
+    return rss / 1024, private / 1024
+
+
+def _app_imports_cleanly() -> bool:
+    """Check the new code imports before a reload replaces working workers."""
+    env = dict(os.environ, STARTUP_PROFILE="false")
+    result = subprocess.run(
+        [sys.executable, "-c", "import main"],
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        print(f"❌ [LAUNCHER] Reload aborted, app failed to import:\n{result.stderr[-2000:]}", flush=True)
+        return False
+    return True
+
+
+class Arbiter:
+    def __init__(self, app, sock: socket.socket, workers: int):
+        self.app = app
+        self.sock = sock
+        self.target = workers
+        self.stats = mmap.mmap(-1, _SLOT.size * _MAX_SLOTS)
+        self.workers: dict[int, tuple[int, float]] = {}  # pid -> (slot, started_at)
+        self.retiring: set[int] = set()
+        self.signals: list[int] = []
+        self.stopping = False
+        self.last_stats = time.monotonic()
+        self.last_requests: dict[int, int] = {}
+
+    # -- lifecycle ----------------------------------------------------------
+
+    def _free_slot(self) -> int:
+        used = {slot for slot, _ in self.workers.values()}
+        return next(slot for slot in range(_MAX_SLOTS) if slot not in used)
+
+    def spawn(self) -> None:
+        slot = self._free_slot()
+        _SLOT.pack_into(self.stats, slot * _SLOT.size, 0, 0)
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                _run_worker(self.app, self.sock, self.stats, slot)
+            except BaseException:
+                import traceback
+                traceback.print_exc()
+                code = 1
+            finally:
+                os._exit(code)
+        self.workers[pid] = (slot, time.monotonic())
+        self.last_requests[pid] = 0
+
+    def _reap(self) -> None:
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            self.retiring.discard(pid)
+            worker = self.workers.pop(pid, None)
+            self.last_requests.pop(pid, None)
+            if worker is None or self.stopping:
+                continue
+            code = os.waitstatus_to_exitcode(status)
+            print(f"⚠️ [LAUNCHER] Worker {pid} exited ({code}), replacing it", flush=True)
+            if time.monotonic() - worker[1] < 5:
+                time.sleep(1)  # avoid a tight crash loop when boot itself fails
+
+    def _ready_count(self) -> int:
+        return sum(_SLOT.unpack_from(self.stats, slot * _SLOT.size)[0] for slot, _ in self.workers.values())
+
+    def _drain(self, pids, timeout: float) -> None:
+        for pid in pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            self._reap()
+            if not any(pid in self.workers or pid in self.retiring for pid in pids):
+                return
+            time.sleep(0.1)
+        for pid in pids:
+            if pid in self.workers or pid in self.retiring:
+                print(f"⚠️ [LAUNCHER] Worker {pid} did not drain in {timeout}s, killing it", flush=True)
+                try:
+                    os.kill(pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+        self._reap()
+
+    # -- signals ------------------------------------------------------------
+
+    def _on_signal(self, sig, frame) -> None:
+        self.signals.append(sig)
+
+    def _install_signals(self) -> None:
+        for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP, signal.SIGTTIN, signal.SIGTTOU):
+            signal.signal(sig, self._on_signal)
+
+    def _reload(self) -> None:
+        if not _app_imports_cleanly():
+            return
+        print("🔄 [LAUNCHER] Reloading: re-executing master with the listening socket", flush=True)
+        os.environ[_LISTEN_FD_ENV] = str(self.sock.fileno())
+        os.environ[_RETIRING_ENV] = ",".join(str(pid) for pid in (*self.workers, *self.retiring))
+        os.execv(sys.executable, [sys.executable, *sys.argv])
+
+    def _handle_signals(self) -> None:
+        while self.signals:
+            sig = self.signals.pop(0)
+            if sig in (signal.SIGTERM, signal.SIGINT):
+                self.stopping = True
+            elif sig == signal.SIGHUP:
+                self._reload()
+            elif sig == signal.SIGTTIN:
+                self.target = min(self.target + 1, _MAX_SLOTS)
+                print(f"🔵 [LAUNCHER] Workers -> {self.target}", flush=True)
+            elif sig == signal.SIGTTOU and self.target > 1:
+                self.target -= 1
+                print(f"🔵 [LAUNCHER] Workers -> {self.target}", flush=True)
+
+    # -- reporting ----------------------------------------------------------
+
+    def log_stats(self) -> None:
+        now = time.monotonic()
+        elapsed = max(now - self.last_stats, 1e-6)
+        self.last_stats = now
+
+        master_rss, _ = _memory_mb(os.getpid())
+        lines = [f"📊 [LAUNCHER] {len(self.workers)} workers, master RSS {master_rss:.0f}MB"]
+        total_private = 0.0
+        for pid, (slot, _) in sorted(self.workers.items()):
+            ready, requests = _SLOT.unpack_from(self.stats, slot * _SLOT.size)
+            rate = (requests - self.last_requests.get(pid, 0)) / elapsed
+            self.last_requests[pid] = requests
+            rss, private = _memory_mb(pid)
+            total_private += private
+            lines.append(
+                f"   worker {pid}: RSS {rss:.0f}MB (private {private:.0f}MB), "
+                f"{requests} requests, {rate:.2f} req/s{'' if ready else ' [starting]'}"
+            )
+        lines.append(f"   total private worker memory {total_private:.0f}MB")
+        print("\n".join(lines), flush=True)
+
+    # -- main loop ----------------------------------------------------------
+
+    def run(self) -> None:
+        self._install_signals()
+        for _ in range(self.target):
+            self.spawn()
+        print(f"✅ [LAUNCHER] Master {os.getpid()} serving {HOST}:{PORT} with {self.target} workers", flush=True)
+
+        retiring = [int(pid) for pid in os.environ.pop(_RETIRING_ENV, "").split(",") if pid]
+        if retiring:
+            # Old workers keep serving until the new generation has started.
+            self.retiring.update(retiring)
+            deadline = time.monotonic() + GRACEFUL_TIMEOUT
+            while self._ready_count() < len(self.workers) and time.monotonic() < deadline:
+                time.sleep(0.1)
+            print(f"🔄 [LAUNCHER] New workers ready, draining {len(retiring)} old workers", flush=True)
+            self._drain(retiring, GRACEFUL_TIMEOUT)
+
+        while not self.stopping:
+            self._handle_signals()
+            if self.stopping:
+                break
+            self._reap()
+            while len(self.workers) < self.target and not self.stopping:
+                self.spawn()
+            if len(self.workers) > self.target:
+                newest = max(self.workers, key=lambda pid: self.workers[pid][1])
+                self._drain([newest], GRACEFUL_TIMEOUT)
+            if WORKER_STATS_INTERVAL > 0 and time.monotonic() - self.last_stats >= WORKER_STATS_INTERVAL:
+                self.log_stats()
+            time.sleep(0.5)
+
+        print(f"🛑 [LAUNCHER] Draining {len(self.workers)} workers (timeout {GRACEFUL_TIMEOUT}s)", flush=True)
+        self._drain(list(self.workers) + list(self.retiring), GRACEFUL_TIMEOUT)
+        self.sock.close()
+        print("🛑 [LAUNCHER] Stopped", flush=True)
+
+
+def serve(app) -> None:
+    """Fork workers for an already imported app and supervise them."""
+    from utils import startup
+
+    sock = _bind_socket()
+    workers = worker_count()
+    startup.uninstall_import_timer()
+
+    # Everything allocated so far (modules, templates, routes) is never freed;
+    # freezing it keeps the collector from touching, and so copying, those pages.
+    gc.collect()
+    gc.freeze()
+
+    Arbiter(app, sock, workers).run()
+
+
+def main() -> None:
+    from main import app  # preload before forking
+    serve(app)
+
+
+if __name__ == "__main__":
+    main()
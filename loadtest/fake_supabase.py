@@ -0,0 +1,339 @@
+"""
+In-memory stand-in for the Supabase endpoints the app uses:
+
+    /rest/v1/<table>       PostgREST reads and writes (filters, or=, order,
+                           limit/offset, Range, count=exact, embedded resources,
+                           single object responses, upsert)
+    /rest/v1/rpc/<fn>      RPCs (premium_workflow_save updates the workflow row)
+    /auth/v1/user          token -> user for the seeded test users
+    /auth/v1/token         refresh grant
+    /storage/v1/object/sign/<bucket>/<path>   signed URLs
+
+Every request sleeps FAKE_SUPABASE_LATENCY_MS (+/- FAKE_SUPABASE_JITTER_MS)
+before answering, to model the network distance to the real project.
+
+    python -m loadtest.fake_supabase --port 54321 --latency-ms 25
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from loadtest.seed import build_dataset
+
+# Embedded resources that do not follow the "<parent singular>_id" convention.
+# (parent, child) -> (column on child that points at parent.id)
+RELATIONS = {
+    ("premium_workflows", "premium_workflow_steps"): "workflow_id",
+    ("premium_workflows", "premium_workflow_results"): "workflow_id",
+}
+
+_EMBED_RE = re.compile(r"(\w+)\(([^()]*)\)")
+
+
+class FakeSupabase:
+    def __init__(self, seed: int = 42, scale: int = 1, latency_ms: float = 0.0, jitter_ms: float = 0.0):
+        self.data = build_dataset(seed, scale)
+        self.users = {user["token"]: user for user in self.data.pop("auth_users")}
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rng = random.Random(seed)
+        self.requests = 0
+
+    async def delay(self) -> None:
+        self.requests += 1
+        if self.latency_ms or self.jitter_ms:
+            ms = max(0.0, self.latency_ms + self.rng.uniform(-self.jitter_ms, self.jitter_ms))
+            await asyncio.sleep(ms / 1000)
+
+    # -- filtering ------------------------------------------------------------
+
+    @staticmethod
+    def _coerce(raw: str):
+        if raw == "null":
+            return None
+        if raw in ("true", "True"):
+            return True
+        if raw in ("false", "False"):
+            return False
+        return raw
+
+    @classmethod
+    def _compare(cls, value, op: str, raw: str) -> bool:
+        if op == "is":
+            return value is cls._coerce(raw) if raw in ("null", "true", "false") else False
+        if op == "in":
+            options = [option.strip().strip('"') for option in raw.strip("()").split(",")]
+            return str(value) in options
+        if op in ("like", "ilike"):
+            pattern = "^" + re.escape(raw).replace(r"\*", ".*").replace("%", ".*") + "$"
+            flags = re.IGNORECASE if op == "ilike" else 0
+            return value is not None and re.match(pattern, str(value), flags) is not None
+        if op == "cs":
+            wanted = json.loads(raw) if raw.startswith("[") else raw.strip("{}").split(",")
+            return isinstance(value, list) and all(item in value for item in wanted)
+
+        target = cls._coerce(raw)
+        if op in ("eq", "neq"):
+            if isinstance(value, bool) or isinstance(target, bool) or target is None:
+                equal = value == target
+            else:
+                equal = str(value) == str(target)
+            return equal if op == "eq" else not equal
+        try:
+            left, right = float(value), float(target)
+        except (TypeError, ValueError):
+            left, right = str(value), str(target)
+        return {
+            "gt": left > right,
+            "gte": left >= right,
+            "lt": left < right,
+            "lte": left <= right,
+        }.get(op, True)
+
+    @classmethod
+    def _matches(cls, row: dict, column: str, expression: str) -> bool:
+        negate = expression.startswith("not.")
+        if negate:
+            expression = expression[4:]
+        op, _, raw = expression.partition(".")
+        result = cls._compare(row.get(column), op, raw)
+        return not result if negate else result
+
+    @classmethod
+    def _matches_or(cls, row: dict, expression: str) -> bool:
+        parts = []
+        depth, current = 0, ""
+        for char in expression.strip("()"):
+            if char == "," and depth == 0:
+                parts.append(current)
+                current = ""
+                continue
+            depth += char == "("
+            depth -= char == ")"
+            current += char
+        parts.append(current)
+        for part in parts:
+            column, _, condition = part.partition(".")
+            if cls._matches(row, column, condition):
+                return True
+        return False
+
+    def _filter(self, rows: list[dict], params: list[tuple[str, str]]) -> list[dict]:
+        for key, value in params:
+            if key in ("select", "order", "limit", "offset", "on_conflict", "columns"):
+                continue
+            if key == "or":
+                rows = [row for row in rows if self._matches_or(row, value)]
+            elif "." not in key:
+                rows = [row for row in rows if self._matches(row, key, value)]
+        return rows
+
+    # -- shaping --------------------------------------------------------------
+
+    @staticmethod
+    def _order(rows: list[dict], order: str) -> list[dict]:
+        for term in reversed([term for term in order.split(",") if term]):
+            column, _, direction = term.partition(".")
+            descending = direction.startswith("desc")
+            present = [row for row in rows if row.get(column) is not None]
+            missing = [row for row in rows if row.get(column) is None]
+            present.sort(key=lambda row: (str(type(row.get(column))), row.get(column)), reverse=descending)
+            rows = present + missing
+        return rows
+
+    def _embed(self, table: str, row: dict, name: str, columns: str, params: list[tuple[str, str]]):
+        child_rows = self.data.get(name, [])
+        fk = RELATIONS.get((table, name)) or f"{table.rstrip('s')}_id"
+        if any(fk in child for child in child_rows[:1]):
+            related = [child for child in child_rows if child.get(fk) == row.get("id")]
+            order = ",".join(value for key, value in params if key == f"{name}.order")
+            if order:
+                related = self._order(related, order)
+            return [self._project(name, child, columns, params) for child in related]
+        # Many-to-one: this row points at the embedded table.
+        parent_fk = f"{name.rstrip('s')}_id"
+        parent = next((item for item in child_rows if item.get("id") == row.get(parent_fk)), None)
+        return self._project(name, parent, columns, params) if parent else None
+
+    def _project(self, table: str, row: dict, select: str, params: list[tuple[str, str]]) -> dict:
+        select = select or "*"
+        embeds = _EMBED_RE.findall(select)
+        plain = _EMBED_RE.sub("", select)
+        columns = [column.strip() for column in plain.split(",") if column.strip()]
+        projected = dict(row) if "*" in columns or not columns else {
+            column: row.get(column) for column in columns
+        }
+        for name, child_columns in embeds:
+            projected[name] = self._embed(table, row, name, child_columns, params)
+        return projected
+
+    # -- endpoints ------------------------------------------------------------
+
+    async def rest(self, request: Request) -> Response:
+        await self.delay()
+        table = request.path_params["table"]
+        params = list(request.query_params.multi_items())
+        prefer = request.headers.get("prefer", "")
+        single = "vnd.pgrst.object" in request.headers.get("accept", "")
+
+        if table not in self.data:
+            return JSONResponse(
+                {"code": "PGRST205", "message": f"Could not find the table 'public.{table}' in the schema cache"},
+                status_code=404,
+            )
+        rows = self.data[table]
+
+        if request.method in ("GET", "HEAD"):
+            matched = self._filter(rows, params)
+            order = next((value for key, value in params if key == "order"), "")
+            if order:
+                matched = self._order(matched, order)
+            total = len(matched)
+            offset = int(next((value for key, value in params if key == "offset"), 0) or 0)
+            limit = next((value for key, value in params if key == "limit"), None)
+            range_header = request.headers.get("range", "")
+            if range_header and "-" in range_header:
+                start, _, end = range_header.partition("-")
+                offset, limit = int(start), int(end) - int(start) + 1
+            window = matched[offset: offset + int(limit)] if limit is not None else matched[offset:]
+            select = next((value for key, value in params if key == "select"), "*")
+            body = [self._project(table, row, select, params) for row in window]
+            headers = {"content-range": f"{offset}-{offset + len(body) - 1}/{total if 'count=' in prefer else '*'}"
+                       if body else f"*/{total if 'count=' in prefer else '*'}"}
+            if single:
+                if len(body) != 1:
+                    return JSONResponse(
+                        {"code": "PGRST116", "message": "JSON object requested, multiple (or no) rows returned"},
+                        status_code=406,
+                    )
+                return JSONResponse(body[0], headers=headers)
+            if request.method == "HEAD":
+                return Response(headers=headers)
+            return JSONResponse(body, headers=headers)
+
+        if request.method == "POST":
+            payload = await request.json()
+            items = payload if isinstance(payload, list) else [payload]
+            conflict = next((value for key, value in params if key == "on_conflict"), "")
+            written = []
+            for item in items:
+                existing = None
+                if conflict and "resolution=" in prefer:
+                    existing = next((row for row in rows if str(row.get(conflict)) == str(item.get(conflict))), None)
+                if existing is not None:
+                    existing.update(item)
+                    written.append(existing)
+                    continue
+                row = dict(item)
+                row.setdefault("id", max((r.get("id") for r in rows if isinstance(r.get("id"), int)), default=0) + 1)
+                rows.append(row)
+                written.append(row)
+            return JSONResponse(written, status_code=201)
+
+        matched = self._filter(rows, params)
+        if request.method == "PATCH":
+            payload = await request.json()
+            for row in matched:
+                row.update(payload)
+            return JSONResponse(matched)
+        if request.method == "DELETE":
+            self.data[table] = [row for row in rows if row not in matched]
+            return JSONResponse(matched)
+        return Response(status_code=405)
+
+    async def rpc(self, request: Request) -> Response:
+        await self.delay()
+        name = request.path_params["name"]
+        if name == "premium_workflow_save":
+            payload = (await request.json()).get("payload") or {}
+            workflow = next(
+                (row for row in self.data["premium_workflows"]
+                 if row["tool"] == payload.get("tool") and row["tab"] == payload.get("tab")),
+                None,
+            )
+            if workflow is None:
+                workflow = {"id": len(self.data["premium_workflows"]) + 1, "content_version": 0,
+                            "tool": payload.get("tool"), "tab": payload.get("tab")}
+                self.data["premium_workflows"].append(workflow)
+            for field in ("difficulty", "eyebrow_text", "eyebrow_color", "panel_title", "description"):
+                if payload.get(field) is not None:
+                    workflow[field] = payload[field]
+            workflow["content_version"] = (workflow.get("content_version") or 0) + 1
+            return JSONResponse({"workflow_id": workflow["id"], "content_version": workflow["content_version"], "changed": True})
+        return JSONResponse({"code": "PGRST202", "message": f"Could not find the function public.{name}"}, status_code=404)
+
+    async def auth_user(self, request: Request) -> Response:
+        await self.delay()
+        token = request.headers.get("authorization", "").removeprefix("Bearer ").strip()
+        user = self.users.get(token)
+        if user is None:
+            return JSONResponse({"code": 401, "msg": "invalid JWT"}, status_code=401)
+        return JSONResponse({key: value for key, value in user.items() if key != "token"})
+
+    async def auth_token(self, request: Request) -> Response:
+        await self.delay()
+        body = await request.json()
+        token = body.get("refresh_token", "")
+        user = self.users.get(token)
+        if user is None:
+            return JSONResponse({"error": "invalid_grant"}, status_code=400)
+        return JSONResponse({
+            "access_token": token,
+            "refresh_token": token,
+            "token_type": "bearer",
+            "expires_in": 3600,
+            "user": {key: value for key, value in user.items() if key != "token"},
+        })
+
+    async def storage_sign(self, request: Request) -> Response:
+        await self.delay()
+        path = request.path_params["path"]
+        return JSONResponse({"signedURL": f"/object/sign/{path}?token=loadtest"})
+
+    async def stats(self, request: Request) -> Response:
+        return JSONResponse({"requests": self.requests})
+
+    def app(self) -> Starlette:
+        return Starlette(routes=[
+            Route("/rest/v1/rpc/{name}", self.rpc, methods=["POST"]),
+            Route("/rest/v1/{table}", self.rest, methods=["GET", "HEAD", "POST", "PATCH", "DELETE"]),
+            Route("/auth/v1/user", self.auth_user, methods=["GET"]),
+            Route("/auth/v1/token", self.auth_token, methods=["POST"]),
+            Route("/storage/v1/object/sign/{path:path}", self.storage_sign, methods=["POST"]),
+            Route("/_loadtest/stats", self.stats, methods=["GET"]),
+        ])
+
+
+def create_app() -> Starlette:
+    return FakeSupabase(
+        seed=int(os.getenv("FAKE_SUPABASE_SEED", "42")),
+        scale=int(os.getenv("FAKE_SUPABASE_SCALE", "1")),
+        latency_ms=float(os.getenv("FAKE_SUPABASE_LATENCY_MS", "0")),
+        jitter_ms=float(os.getenv("FAKE_SUPABASE_JITTER_MS", "0")),
+    ).app()
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Fake Supabase for load tests")
+    parser.add_argument("--port", type=int, default=54321)
+    parser.add_argument("--latency-ms", type=float, default=float(os.getenv("FAKE_SUPABASE_LATENCY_MS", "0")))
+    parser.add_argument("--jitter-ms", type=float, default=float(os.getenv("FAKE_SUPABASE_JITTER_MS", "0")))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--scale", type=int, default=1)
+    args = parser.parse_args()
+
+    fake = FakeSupabase(args.seed, args.scale, args.latency_ms, args.jitter_ms)
+    uvicorn.run(fake.app(), host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+"""
+End-to-end load test: the real app (through launcher.py) against the fake
+Supabase in loadtest/fake_supabase.py, driven by the journeys in
+loadtest/scenarios.py.
+
+    python -m loadtest.run                          # all scenarios, weighted mix
+    python -m loadtest.run --scenario anonymous --concurrency 32 --duration 30
+    python -m loadtest.run --latency-ms 40 --workers 2 --baseline loadtest/.cache/baseline.json
+
+Prints p50/p95/p99 latency, throughput, error counts and Supabase queries per
+request for every route, and writes the same numbers as JSON (--out). With
+--baseline, routes whose p95 or query count regressed by more than
+--max-regression are listed and the exit status is 1.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+
+import httpx
+from jose import jwt
+
+from loadtest.scenarios import SCENARIOS
+from loadtest.seed import build_dataset
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.path.join(ROOT, "loadtest", ".cache")
+SECRET_KEY = "loadtest-secret"
+ADMIN_EMAIL = "admin@loadtest.local"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+
+class Results:
+    def __init__(self):
+        self.samples: dict[str, list[float]] = {}
+        self.statuses: dict[str, dict[str, int]] = {}
+        self.queries: dict[str, list[int]] = {}
+        self.recording = False
+
+    def record(self, label: str, outcome, seconds: float) -> None:
+        if not self.recording:
+            return
+        self.samples.setdefault(label, []).append(seconds)
+        status = type(outcome).__name__ if isinstance(outcome, Exception) else str(outcome.status_code)
+        statuses = self.statuses.setdefault(label, {})
+        statuses[status] = statuses.get(status, 0) + 1
+        if not isinstance(outcome, Exception) and "x-query-count" in outcome.headers:
+            self.queries.setdefault(label, []).append(int(outcome.headers["x-query-count"]))
+
+    def summary(self, elapsed: float) -> dict:
+        routes = {}
+        for label, samples in sorted(self.samples.items()):
+            ordered = sorted(samples)
+            statuses = self.statuses.get(label, {})
+            queries = self.queries.get(label, [])
+            routes[label] = {
+                "requests": len(samples),
+                "rps": round(len(samples) / elapsed, 2),
+                "p50_ms": round(_percentile(ordered, 50) * 1000, 1),
+                "p95_ms": round(_percentile(ordered, 95) * 1000, 1),
+                "p99_ms": round(_percentile(ordered, 99) * 1000, 1),
+                "max_ms": round(ordered[-1] * 1000, 1),
+                "errors": sum(n for status, n in statuses.items() if not status.isdigit() or int(status) >= 500),
+                "statuses": statuses,
+                "queries_per_request": round(sum(queries) / len(queries), 2) if queries else None,
+                "max_queries": max(queries) if queries else None,
+            }
+        total = sum(route["requests"] for route in routes.values())
+        return {
+            "elapsed_s": round(elapsed, 2),
+            "requests": total,
+            "rps": round(total / elapsed, 2) if elapsed else 0.0,
+            "errors": sum(route["errors"] for route in routes.values()),
+            "routes": routes,
+        }
+
+
+def print_summary(summary: dict, config: dict) -> None:
+    print(
+        f"\n📊 [LOADTEST] {summary['requests']} requests in {summary['elapsed_s']}s "
+        f"({summary['rps']} req/s, {summary['errors']} errors) | "
+        f"scenario={config['scenario']} concurrency={config['concurrency']} "
+        f"workers={config['workers']} supabase latency={config['latency_ms']}ms"
+    )
+    header = f"{'route':<38} {'reqs':>6} {'rps':>7} {'p50':>8} {'p95':>8} {'p99':>8} {'err':>5} {'q/req':>6}  statuses"
+    print(header)
+    print("-" * len(header))
+    for label, route in summary["routes"].items():
+        queries = "-" if route["queries_per_request"] is None else f"{route['queries_per_request']:.1f}"
+        statuses = " ".join(f"{status}:{n}" for status, n in sorted(route["statuses"].items()))
+        print(
+            f"{label:<38} {route['requests']:>6} {route['rps']:>7.1f} {route['p50_ms']:>7.1f}m "
+            f"{route['p95_ms']:>7.1f}m {route['p99_ms']:>7.1f}m {route['errors']:>5} {queries:>6}  {statuses}"
+        )
+
+
+def compare(summary: dict, baseline: dict, max_regression: float) -> list[str]:
+    regressions = []
+    for label, route in summary["routes"].items():
+        before = baseline.get("routes", {}).get(label)
+        if not before:
+            continue
+        if before["p95_ms"] and route["p95_ms"] > before["p95_ms"] * (1 + max_regression):
+            regressions.append(f"{label}: p95 {before['p95_ms']}ms -> {route['p95_ms']}ms")
+        if (before.get("queries_per_request") is not None and route["queries_per_request"] is not None
+                and route["queries_per_request"] > before["queries_per_request"]):
+            regressions.append(
+                f"{label}: queries/request {before['queries_per_request']} -> {route['queries_per_request']}"
+            )
+    return regressions
+
+
+async def _wait_ready(url: str, process: subprocess.Popen, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError(f"{url} exited with {process.returncode} during startup")
+            try:
+                await client.get(url, timeout=1.0)
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.2)
+    raise RuntimeError(f"{url} not ready after {timeout}s")
+
+
+async def _virtual_user(base_url: str, scenarios, weights, results: Results, ctx: dict, stop_at: float, seed: int):
+    rng = random.Random(seed)
+    async with httpx.AsyncClient(base_url=base_url, follow_redirects=False, timeout=30.0) as client:
+        while time.monotonic() < stop_at:
+            client.cookies.clear()
+            scenario = rng.choices(scenarios, weights=weights)[0]
+            await scenario(client, results.record, rng, ctx)
+
+
+async def drive(base_url: str, args, ctx: dict) -> dict:
+    if args.scenario == "all":
+        chosen = list(SCENARIOS.values())
+    else:
+        chosen = [SCENARIOS[name] for name in args.scenario.split(",")]
+    scenarios = [scenario for scenario, _ in chosen]
+    weights = [weight for _, weight in chosen]
+
+    results = Results()
+    warm_stop = time.monotonic() + args.warmup
+    await asyncio.gather(*(
+        _virtual_user(base_url, scenarios, weights, results, ctx, warm_stop, args.seed + index)
+        for index in range(min(args.concurrency, 4))
+    ))
+
+    results.recording = True
+    started = time.monotonic()
+    stop_at = started + args.duration
+    await asyncio.gather(*(
+        _virtual_user(base_url, scenarios, weights, results, ctx, stop_at, args.seed + 1000 + index)
+        for index in range(args.concurrency)
+    ))
+    return results.summary(time.monotonic() - started)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="BudasAI end-to-end load test")
+    parser.add_argument("--scenario", default="all", help=f"all or a comma list of: {', '.join(SCENARIOS)}")
+    parser.add_argument("--duration", type=float, default=20.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=3.0, help="unmeasured seconds before measuring")
+    parser.add_argument("--concurrency", type=int, default=16, help="virtual users")
+    parser.add_argument("--workers", type=int, default=1, help="app workers (WEB_CONCURRENCY)")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="fake Supabase latency per call")
+    parser.add_argument("--jitter-ms", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--scale", type=int, default=1, help="seeded data multiplier")
+    parser.add_argument("--out", default=os.path.join(CACHE_DIR, "last.json"))
+    parser.add_argument("--baseline", help="earlier --out file to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="allowed p95 growth (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    supabase_port, app_port = _free_port(), _free_port()
+    supabase_url = f"http://127.0.0.1:{supabase_port}"
+    base_url = f"http://127.0.0.1:{app_port}"
+
+    fake_log = open(os.path.join(CACHE_DIR, "fake_supabase.log"), "w")
+    app_log = open(os.path.join(CACHE_DIR, "app.log"), "w")
+    fake = subprocess.Popen(
+        [sys.executable, "-m", "loadtest.fake_supabase", "--port", str(supabase_port),
+         "--latency-ms", str(args.latency_ms), "--jitter-ms", str(args.jitter_ms),
+         "--seed", str(args.seed), "--scale", str(args.scale)],
+        cwd=ROOT, stdout=fake_log, stderr=subprocess.STDOUT,
+    )
+    app_env = {
+        **os.environ,
+        "PORT": str(app_port),
+        "HOST": "127.0.0.1",
+        "WEB_CONCURRENCY": str(args.workers),
+        "SUPABASE_URL": supabase_url,
+        "SUPABASE_SERVICE_ROLE_KEY": "loadtest-service-key",
+        "SUPABASE_KEY": "loadtest-anon-key",
+        "SECRET_KEY": SECRET_KEY,
+        "ADMIN_EMAIL_ADDRESS": ADMIN_EMAIL,
+        "QUERY_TRACE_HEADERS": "true",
+        "RESEND_API_KEY": "",
+        "GOOGLE_SHEET_CSV_URL": "",
+        "UVICORN_LOG_LEVEL": "warning",
+        "WORKER_STATS_INTERVAL": "0",
+        "PYTHONUNBUFFERED": "1",
+    }
+    app = subprocess.Popen(
+        [sys.executable, "launcher.py"], cwd=ROOT, env=app_env, stdout=app_log, stderr=subprocess.STDOUT,
+    )
+
+    dataset = build_dataset(args.seed, args.scale)
+    ctx = {
+        "blog_count": len(dataset["blogs"]),
+        "user_count": len(dataset["auth_users"]),
+        "admin_token": jwt.encode(
+            {"exp": datetime.utcnow() + timedelta(hours=1)}, SECRET_KEY, algorithm="HS256"
+        ),
+    }
+    config = {
+        "scenario": args.scenario,
+        "concurrency": args.concurrency,
+        "workers": args.workers,
+        "latency_ms": args.latency_ms,
+        "duration_s": args.duration,
+        "seed": args.seed,
+        "scale": args.scale,
+    }
+
+    try:
+        asyncio.run(_wait_ready(f"{supabase_url}/_loadtest/stats", fake, 15))
+        asyncio.run(_wait_ready(f"{base_url}/favicon.ico", app, 60))
+        summary = asyncio.run(drive(base_url, args, ctx))
+    finally:
+        app.terminate()
+        fake.terminate()
+        for process in (app, fake):
+            try:
+                process.wait(timeout=40)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        fake_log.close()
+        app_log.close()
+
+    summary["config"] = config
+    print_summary(summary, config)
+    with open(args.out, "w") as f:
+        json.dump(summary, f, indent=2)
+    print(f"\n✅ [LOADTEST] Results written to {os.path.relpath(args.out, ROOT)} (app log: loadtest/.cache/app.log)")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(summary, json.load(f), args.max_regression)
+        if regressions:
+            print("❌ [LOADTEST] Regressions against baseline:")
+            for line in regressions:
+                print(f"   {line}")
+            return 1
+        print("✅ [LOADTEST] No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
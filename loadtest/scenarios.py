@@ -0,0 +1,95 @@
+import random
+import time
+from urllib.parse import urlencode
+
+from loadtest.seed import PREMIUM_PLAN_ID, TOOL_NAMES, user_token
+
+# Each scenario is a coroutine that plays one user journey with an httpx client
+# and reports every request through `record(label, response_or_exc, seconds)`.
+# Labels are route templates so results group like the metrics endpoint does.
+
+TOOL_SLUGS = ["chatgpt", "claude", "gemini", "copilot", "perplexity"]
+ADMIN_SECTIONS = ["blogs", "stories", "ai_tools", "pricing_plans", "user_profiles", "billing_records"]
+
+
+async def _get(client, record, label: str, url: str, **kwargs):
+    started = time.perf_counter()
+    try:
+        response = await client.get(url, **kwargs)
+    except Exception as e:
+        record(label, e, time.perf_counter() - started)
+        return None
+    record(label, response, time.perf_counter() - started)
+    return response
+
+
+async def _post(client, record, label: str, url: str, **kwargs):
+    started = time.perf_counter()
+    try:
+        response = await client.post(url, **kwargs)
+    except Exception as e:
+        record(label, e, time.perf_counter() - started)
+        return None
+    record(label, response, time.perf_counter() - started)
+    return response
+
+
+async def anonymous_browsing(client, record, rng: random.Random, ctx: dict) -> None:
+    await _get(client, record, "GET /", "/")
+    await _get(client, record, "GET /ai-tools", "/ai-tools")
+    await _get(client, record, "GET /ai-tool-{tool_slug}", f"/ai-tool-{rng.choice(TOOL_SLUGS)}")
+    await _get(client, record, "GET /blog", "/blog")
+    redirect = await _get(client, record, "GET /blog/{id}", f"/blog/{rng.randint(1, ctx['blog_count'])}")
+    if redirect is not None and redirect.status_code in (301, 302, 307, 308):
+        await _get(client, record, "GET /blog/{id}/{title}", redirect.headers["location"])
+    await _get(client, record, "GET /story", "/story")
+    await _get(client, record, "GET /products", "/products")
+    await _get(client, record, "GET /premium", "/premium")
+
+
+async def premium_user(client, record, rng: random.Random, ctx: dict) -> None:
+    client.cookies.set("sb-access-token", user_token(2 * rng.randint(1, ctx["user_count"] // 2)))
+    await _get(client, record, "GET / (user)", "/")
+    await _get(client, record, "GET /premium (user)", "/premium")
+    tab = rng.choice(["youtube", "instagram", "analyst"])
+    await _get(client, record, "GET /premium/workflow/{tool_slug}/{tab}", f"/premium/workflow/{rng.choice(TOOL_SLUGS)}/{tab}")
+    await _get(client, record, "GET /ai-tool-{tool_slug} (user)", f"/ai-tool-{rng.choice(TOOL_SLUGS)}")
+    await _get(client, record, "GET /get-user", "/get-user")
+
+
+async def profile_and_billing(client, record, rng: random.Random, ctx: dict) -> None:
+    client.cookies.set("sb-access-token", user_token(rng.randint(1, ctx["user_count"])))
+    await _get(client, record, "GET /profile", "/profile")
+    await _get(client, record, "GET /plan-action/{plan_id}", f"/plan-action/{PREMIUM_PLAN_ID}")
+
+
+async def contact_burst(client, record, rng: random.Random, ctx: dict) -> None:
+    # Bursts from one address: after the per-IP limit the app should answer 429
+    # quickly, without touching Supabase.
+    email = f"lead{rng.randint(1, 10_000)}@loadtest.local"
+    for _ in range(5):
+        await _post(client, record, "POST /contact", "/contact", data={
+            "name": "Load Test",
+            "email": email,
+            "business_type": "Agency",
+            "message": "Load test message",
+        })
+
+
+async def admin_dashboard(client, record, rng: random.Random, ctx: dict) -> None:
+    client.cookies.set("admin_token", ctx["admin_token"])
+    await _get(client, record, "GET /admin/dashboard", "/admin/dashboard")
+    section = rng.choice(ADMIN_SECTIONS)
+    query = urlencode({"page": 1, "per_page": 25, **({"include": "details"} if section == "ai_tools" else {})})
+    await _get(client, record, "GET /admin/api/sections/{section}", f"/admin/api/sections/{section}?{query}")
+    tool = rng.choice(TOOL_NAMES[:5]).lower()
+    await _get(client, record, "GET /admin/workflow/load", "/admin/workflow/load", params={"tool": tool, "tab": "youtube"})
+
+
+SCENARIOS = {
+    "anonymous": (anonymous_browsing, 60),
+    "premium": (premium_user, 20),
+    "profile": (profile_and_billing, 10),
+    "contact": (contact_burst, 5),
+    "admin": (admin_dashboard, 5),
+}
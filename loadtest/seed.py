@@ -0,0 +1,287 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+# Deterministic seeded data for the fake Supabase (loadtest/fake_supabase.py).
+# Same seed and scale -> same rows, so runs are comparable.
+
+PREMIUM_PLAN_ID = "bdb81597-0b54-4f0e-acea-b88fecf1cb14"
+
+TOOL_NAMES = [
+    "ChatGPT", "Claude", "Gemini", "Copilot", "Perplexity", "Midjourney", "Canva AI",
+    "Notion AI", "Jasper", "Grammarly", "Runway", "ElevenLabs", "Synthesia", "Descript",
+    "Otter", "Fireflies", "Cursor", "Replit", "Tabnine", "Writesonic",
+]
+CATEGORIES = ["Productivity", "Marketing", "Coding", "Design", "Business", "Education"]
+WORDS = (
+    "ai workflow prompt automation content research design marketing sales coding data "
+    "analysis writing video image audio productivity strategy growth customer team tool"
+).split()
+
+# Test users: token -> user. Tokens are sent as the sb-access-token cookie.
+def user_token(index: int) -> str:
+    return f"loadtest-token-{index}"
+
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def _html(rng: random.Random, paragraphs: int) -> str:
+    return "".join(f"<h2>{_text(rng, 4)}</h2><p>{_text(rng, 60)}</p>" for _ in range(paragraphs))
+
+
+def build_dataset(seed: int = 42, scale: int = 1) -> dict[str, list[dict]]:
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    iso = lambda dt: dt.isoformat()
+    data: dict[str, list[dict]] = {}
+
+    tools = []
+    for index, name in enumerate(TOOL_NAMES[: max(5, min(len(TOOL_NAMES), 10 * scale))], 1):
+        scores = {
+            f"{key}_score": round(rng.uniform(6, 10), 1)
+            for key in (
+                "quality", "ease", "accuracy", "speed", "value", "creativity",
+                "integration", "consistency", "support", "time_saved",
+            )
+        }
+        tools.append({
+            "id": index,
+            "name": name,
+            "image_url": f"/static/images/tools/{index}.png",
+            "best_for": _text(rng, 5),
+            "display_order": index,
+            "is_active": True,
+            **scores,
+        })
+    data["ai_tools"] = tools
+
+    data["ai_tool_details"] = [
+        {
+            "id": tool["id"],
+            "ai_tool_id": tool["id"],
+            "tagline": _text(rng, 6),
+            "company": f"{tool['name']} Inc.",
+            "founded": str(rng.randint(2010, 2023)),
+            "headquarters": "San Francisco, CA",
+            "website": f"https://example.com/{tool['id']}",
+            "founders": "Jane Doe, John Doe",
+            "about": _text(rng, 80),
+            "mmlu_score": rng.randint(60, 90),
+            "humaneval_score": rng.randint(40, 90),
+            "gsm8k_score": rng.randint(50, 95),
+            "hellaswag_score": rng.randint(70, 95),
+            "truthfulqa_score": rng.randint(40, 80),
+            "pros": [_text(rng, 6) for _ in range(4)],
+            "cons": [_text(rng, 6) for _ in range(3)],
+            "pricing": [{"plan": "Free", "price": "$0"}, {"plan": "Pro", "price": "$20"}],
+        }
+        for tool in tools
+    ]
+
+    use_cases, faqs = [], []
+    for tool in tools:
+        for _ in range(6):
+            use_cases.append({
+                "id": len(use_cases) + 1,
+                "ai_tool_id": tool["id"],
+                "title": _text(rng, 4),
+                "icon": "⚡",
+                "description": _text(rng, 25),
+                "is_active": True,
+            })
+        for _ in range(5):
+            faqs.append({
+                "id": len(faqs) + 1,
+                "ai_tool_id": tool["id"],
+                "question": _text(rng, 8).rstrip(".") + "?",
+                "answer": _text(rng, 30),
+                "is_active": True,
+            })
+    data["ai_tool_use_cases"] = use_cases
+    data["ai_tool_faqs"] = faqs
+
+    data["blogs"] = [
+        {
+            "id": index,
+            "title": _text(rng, 7).rstrip("."),
+            "slug": f"post-{index}",
+            "category": rng.choice(CATEGORIES),
+            "image_url": f"/static/images/blog/{index % 10}.jpg",
+            "excerpt": _text(rng, 30),
+            "html_content": _html(rng, 8),
+            "date": iso(now - timedelta(days=index * 3)),
+            "create_at": iso(now - timedelta(days=index * 3)),
+            "is_published": True,
+            # Legacy column still read by the full_blog page.
+            "is_publish": True,
+        }
+        for index in range(1, 40 * scale + 1)
+    ]
+
+    data["stories"] = [
+        {
+            "id": index,
+            "title": _text(rng, 6).rstrip("."),
+            "name": f"Customer {index}",
+            "role": rng.choice(["Founder", "Marketer", "Developer", "Designer"]),
+            "story": _text(rng, 60),
+            "image_url": f"/static/images/stories/{index % 5}.jpg",
+            "story_type": rng.choice(["text", "video"]),
+            "is_active": True,
+            "display_order": index,
+            "created_at": iso(now - timedelta(days=index)),
+        }
+        for index in range(1, 12 * scale + 1)
+    ]
+
+    data["pricing_plans"] = [
+        {
+            "id": PREMIUM_PLAN_ID if index == 2 else f"00000000-0000-0000-0000-00000000000{index}",
+            "plan_name": name,
+            "plan_heading": name,
+            "plan_subheading": _text(rng, 6),
+            "price_inr": price,
+            "discount_percent": 20 if price else 0,
+            "features_heading_1": "What you get",
+            "features_list_1": [_text(rng, 4) for _ in range(5)],
+            "features_heading_2": "Bonus",
+            "features_list_2": [_text(rng, 4) for _ in range(3)],
+            "button_text": "Get started",
+            "button_url": "/premium",
+            "price_note": "one-time",
+            "show_terms": True,
+            "is_popular": index == 2,
+            "is_active": True,
+            "display_order": index,
+            "card_bg_color": "#111827",
+            "badge_bg_color": "#ef4444",
+            "badge_text_color": "#ffffff",
+            "badge_text": "Popular" if index == 2 else "",
+        }
+        for index, (name, price) in enumerate([("Free", 0), ("Premium", 999), ("Advance", 2999)], 1)
+    ]
+
+    workflows, steps, results = [], [], []
+    for tool in tools[:5]:
+        for tab in ("youtube", "instagram", "analyst"):
+            workflow_id = len(workflows) + 1
+            workflows.append({
+                "id": workflow_id,
+                "tool": tool["name"].lower(),
+                "tab": tab,
+                "difficulty": "Beginner",
+                "eyebrow_text": "Workflow",
+                "eyebrow_color": "#ef4444",
+                "panel_title": _text(rng, 5),
+                "description": _text(rng, 20),
+                "stat_pills": ["3 phases", "9 steps"],
+                "tool_chips": [tool["name"]],
+                "result_summary": [],
+                "content_version": 1,
+                "updated_at": iso(now),
+            })
+            for phase in range(1, 4):
+                for step in range(1, 4):
+                    steps.append({
+                        "id": len(steps) + 1,
+                        "workflow_id": workflow_id,
+                        "phase_number": phase,
+                        "phase_name": f"Phase {phase}",
+                        "step_number": step,
+                        "title": _text(rng, 5),
+                        "tools_used": tool["name"],
+                        "badge_color": "#1f2937",
+                        "step_num_color": "#ef4444",
+                        "time_estimate": "10 min",
+                        "description": _text(rng, 25),
+                        "prompt": _text(rng, 40),
+                        "expected_output": _text(rng, 15),
+                        "pro_tip": _text(rng, 12),
+                    })
+            for stat in range(1, 4):
+                results.append({
+                    "id": len(results) + 1,
+                    "workflow_id": workflow_id,
+                    "stat_number": stat,
+                    "value": f"{rng.randint(2, 10)}x",
+                    "label": _text(rng, 3),
+                    "color": "#22c55e",
+                })
+    data["premium_workflows"] = workflows
+    data["premium_workflow_steps"] = steps
+    data["premium_workflow_results"] = results
+
+    users, profiles, billing = [], [], []
+    for index in range(1, 20 * scale + 1):
+        user_id = f"10000000-0000-0000-0000-{index:012d}"
+        email = f"user{index}@loadtest.local"
+        premium = index % 2 == 0
+        # Odd users are free; every other odd user had premium that has expired.
+        expired = index % 4 == 3
+        users.append({
+            "token": user_token(index),
+            "id": user_id,
+            "aud": "authenticated",
+            "role": "authenticated",
+            "email": email,
+            "app_metadata": {"provider": "email"},
+            "user_metadata": {"full_name": f"Load Test {index}"},
+            "created_at": iso(now - timedelta(days=index)),
+        })
+        profiles.append({
+            "id": index,
+            "auth_user_id": user_id,
+            "email": email,
+            "full_name": f"Load Test {index}",
+            "phone_number": "",
+            "dob": None,
+            "profession": "Tester",
+            "plan_ids": [],
+            "is_active": True,
+            "created_at": iso(now - timedelta(days=index)),
+        })
+        for record in range(3 if premium else 1):
+            paid = premium and record == 0
+            if expired:
+                billing.append({
+                    "id": len(billing) + 1,
+                    "user_id": user_id,
+                    "user_email": email,
+                    "plan_id": PREMIUM_PLAN_ID,
+                    "plan_name": "Premium",
+                    "amount": 999,
+                    "currency": "INR",
+                    "payment_method": "upi",
+                    "transaction_id": f"txn_{index}_{record}",
+                    "payment_status": "paid",
+                    "effective_status": "expired",
+                    "created_at": iso(now - timedelta(days=400)),
+                    "paid_at": iso(now - timedelta(days=400)),
+                    "expires_at": iso(now - timedelta(days=35)),
+                })
+                continue
+            billing.append({
+                "id": len(billing) + 1,
+                "user_id": user_id,
+                "user_email": email,
+                "plan_id": PREMIUM_PLAN_ID,
+                "plan_name": "Premium",
+                "amount": 999,
+                "currency": "INR",
+                "payment_method": "upi",
+                "transaction_id": f"txn_{index}_{record}",
+                "payment_status": "paid" if paid else "pending",
+                "effective_status": "active" if paid else "pending",
+                "created_at": iso(now - timedelta(days=record * 30)),
+                "paid_at": iso(now - timedelta(days=record * 30)) if paid else None,
+                "expires_at": iso(now + timedelta(days=335)) if paid else None,
+            })
+    data["auth_users"] = users
+    data["user_profiles"] = profiles
+    data["billing_records"] = billing
+    data["billing_records_effective"] = billing
+    data["orders"] = []
+    data["leads"] = []
+    data["site_settings"] = [{"key": "free_pdf_filename", "value": "guide.pdf"}]
+    return data
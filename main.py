@@ -1,62 +1,77 @@
+from utils import startup
+
+startup.install_import_timer()
+
 import time
 import os
 import sys
-import uvicorn
+import asyncio
+import hmac
+import ipaddress
 import traceback
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, Request, Response
-from fastapi.staticfiles import StaticFiles
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import FileResponse, JSONResponse
 
-print(f"🔵 [MAIN] Starting application initialization...")
-print(f"🔵 [MAIN] Python: {sys.version}")
-print(f"🔵 [MAIN] FastAPI: importing...")
+with startup.phase("import fastapi"):
+    from fastapi import FastAPI, Request, Response
+    from fastapi.staticfiles import StaticFiles
+    from fastapi.middleware.cors import CORSMiddleware
+    from fastapi.middleware.trustedhost import TrustedHostMiddleware
+    from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse
+
+print(f"🔵 [MAIN] Starting application initialization (Python {sys.version.split()[0]})")
+
+from utils import cache_bus, http_clients, metrics, query_trace
 
 # Import routers with error handling
 try:
-    print("🔵 [MAIN] Importing routes.pages...")
-    from routes.pages import router as pages_router
-    print("✅ [MAIN] routes.pages imported successfully")
+    with startup.phase("import routes.pages"):
+        from routes.pages import router as pages_router
 except Exception as e:
     print(f"❌ [MAIN] Failed to import routes.pages: {e}")
     traceback.print_exc()
     sys.exit(1)
 
 try:
-    print("🔵 [MAIN] Importing admin_routes...")
-    from admin_routes import router as admin_router
-    print("✅ [MAIN] admin_routes imported successfully")
+    with startup.phase("import admin_routes"):
+        from admin_routes import router as admin_router
 except Exception as e:
     print(f"❌ [MAIN] Failed to import admin_routes: {e}")
     traceback.print_exc()
     sys.exit(1)
 
-print("🔵 [MAIN] Creating FastAPI app...")
-
 # Startup and shutdown events
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    print("\n" + "="*60)
-    print("🚀 STARTUP: Starting BudasAI application...")
-    print("="*60)
-    
+    print(f"🚀 STARTUP: Starting BudasAI application ({'Railway' if os.getenv('RAILWAY_ENVIRONMENT') else 'Local'})")
+
     try:
-        print(f"📍 Environment: {'Railway' if os.getenv('RAILWAY_ENVIRONMENT') else 'Local'}")
-        
-        # Test currency loading
+        # The Supabase client is built off the event loop while the rest of
+        # startup continues; the first query waits for it if it is not ready.
+        # Outbound pools first: the Supabase warm-up below already uses them.
+        http_clients.open_clients()
+
+        from database import warm_supabase
+        warm_supabase()
+
+        # Builds the /search index in the background from the warm client.
+        from utils import search_index
+        search_index.refresh()
+
+        # Admin writes on any worker invalidate the caches of every worker.
+        cache_bus.start()
+        metrics.start()
+
         try:
-            print("🔵 Loading currency rates...")
-            from utils.currency import load_currency_rates
-            rates = await load_currency_rates()
+            with startup.phase("load currency rates"):
+                from utils.currency import load_currency_rates
+                rates = await load_currency_rates()
             print(f"✅ Currency rates loaded: {list(rates.keys())}")
         except Exception as e:
             print(f"⚠️ Currency loading failed (will use defaults): {e}")
-        
+
+        startup.report()
         print("✅ STARTUP: Application ready to accept requests!")
-        print("="*60 + "\n")
     except Exception as e:
         print(f"❌ STARTUP FAILED: {e}")
         traceback.print_exc()
@@ -65,11 +80,11 @@ async def lifespan(app: FastAPI):
     yield
     
     # Shutdown
-    print("\n" + "="*60)
+    metrics.stop()
+    cache_bus.stop()
+    await http_clients.close_clients()
     print("🛑 SHUTDOWN: Shutting down BudasAI application...")
-    print("="*60)
 
-print("✅ [MAIN] Creating app with lifespan...")
 app = FastAPI(lifespan=lifespan)
 REQUEST_LOG_ENABLED = os.getenv("ENABLE_REQUEST_LOGS", "false").strip().lower() == "true"
 EXPOSE_ERROR_DETAILS = os.getenv("EXPOSE_ERROR_DETAILS", "false").strip().lower() == "true"
@@ -154,8 +169,28 @@ async def ads():
 async def favicon():
     return Response(status_code=204)
 
+
+@app.get("/internal/metrics", include_in_schema=False)
+async def internal_metrics(request: Request):
+    # Scrapers authenticate with METRICS_TOKEN. Without a token the endpoint
+    # is closed, except to loopback clients in local development. The client
+    # address can come from X-Forwarded-For, so it is never trusted alone.
+    if metrics.METRICS_TOKEN:
+        if not hmac.compare_digest(request.headers.get("authorization", ""), f"Bearer {metrics.METRICS_TOKEN}"):
+            return Response(status_code=404)
+    else:
+        client_host = request.client.host if request.client else ""
+        try:
+            allowed = not os.getenv("RAILWAY_ENVIRONMENT") and ipaddress.ip_address(client_host).is_loopback
+        except ValueError:
+            allowed = False
+        if not allowed:
+            return Response(status_code=404)
+
+    body = await asyncio.to_thread(metrics.render_text)
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
+
 # CORS middleware
-print("🔵 [MAIN] Adding CORS middleware...")
 cors_origins = _parse_csv_env("CORS_ALLOW_ORIGINS", "http://localhost:8000,http://127.0.0.1:8000")
 app.add_middleware(
     CORSMiddleware,
@@ -166,7 +201,6 @@ app.add_middleware(
 )
 
 # Trusted hosts middleware
-print("🔵 [MAIN] Adding TrustedHost middleware...")
 enforce_trusted_hosts = os.getenv("ENFORCE_TRUSTED_HOSTS", "false").strip().lower() == "true"
 if enforce_trusted_hosts:
     railway_domain = (os.getenv("RAILWAY_PUBLIC_DOMAIN") or "").strip()
@@ -182,38 +216,43 @@ if enforce_trusted_hosts:
         TrustedHostMiddleware,
         allowed_hosts=trusted_hosts
     )
-else:
-    print("🔵 [MAIN] TrustedHost disabled (set ENFORCE_TRUSTED_HOSTS=true to enable)")
+
+# One Supabase query trace (and budget check) per request.
+app.add_middleware(query_trace.QueryTraceMiddleware)
+
+# Metrics wrap everything added above, so their latency includes all middleware.
+app.add_middleware(metrics.MetricsMiddleware)
 
 # Static files
-print("🔵 [MAIN] Mounting static files...")
 if os.path.isdir("static"):
     app.mount("/static", StaticFiles(directory="static"), name="static")
-    print("✅ [MAIN] Static files mounted")
 else:
     print("⚠️ [MAIN] static/ directory not found")
 
 # Routers
-print("🔵 [MAIN] Including routers...")
 try:
     app.include_router(pages_router)
-    print("✅ [MAIN] pages_router included")
 except Exception as e:
     print(f"❌ [MAIN] Failed to include pages_router: {e}")
     traceback.print_exc()
 
 try:
     app.include_router(admin_router)
-    print("✅ [MAIN] admin_router included")
 except Exception as e:
     print(f"❌ [MAIN] Failed to include admin_router: {e}")
     traceback.print_exc()
 
-print("\n✅ [MAIN] Application initialization complete!")
-print("🔵 [MAIN] Waiting for Uvicorn to start server...\n")
+# Templates are compiled before the server (or any forked worker) takes traffic.
+try:
+    from utils.templating import precompile_templates
+    with startup.phase("precompile templates"):
+        precompile_templates()
+except Exception as e:
+    print(f"⚠️ [MAIN] Template precompile failed (templates will compile on first use): {e}")
+
+print("✅ [MAIN] Application initialization complete")
 
 if __name__ == "__main__":
-    # Use PORT env variable if set by Railway, otherwise default to 8000
-    port = int(os.environ.get("PORT", 8000))
-    print(f"🚀 Starting Uvicorn server on http://0.0.0.0:{port}")
-    uvicorn.run("main:app", host="0.0.0.0", port=port, log_level="info")
\ No newline at end of file
+    # Same preforking launcher as production; WEB_CONCURRENCY=1 for a single worker.
+    from launcher import serve
+    serve(app)
\ No newline at end of file
@@ -0,0 +1,203 @@
+-- Transactional, diff-based save for premium workflows
+-- Run this in Supabase SQL Editor (or via migration runner with write access)
+-- Used by POST /admin/workflow/save through supabase.rpc("save_premium_workflow", ...)
+
+-- 1) Content version, bumped whenever a workflow or any of its steps/results change
+ALTER TABLE public.premium_workflows
+  ADD COLUMN IF NOT EXISTS content_version bigint NOT NULL DEFAULT 1;
+
+-- 2) Natural keys so steps/results can be upserted in place instead of delete + reinsert
+CREATE UNIQUE INDEX IF NOT EXISTS uq_premium_workflows_tool_tab
+  ON public.premium_workflows(tool, tab);
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_premium_workflow_steps_position
+  ON public.premium_workflow_steps(workflow_id, phase_number, step_number);
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_premium_workflow_results_position
+  ON public.premium_workflow_results(workflow_id, stat_number);
+
+-- 3) Save function: one round trip, one transaction, only changed rows are written
+CREATE OR REPLACE FUNCTION public.save_premium_workflow(payload jsonb)
+RETURNS jsonb
+LANGUAGE plpgsql
+SECURITY INVOKER
+SET search_path = public
+AS $$
+DECLARE
+  v_tool text := btrim(coalesce(payload->>'tool', ''));
+  v_tab text := btrim(coalesce(payload->>'tab', ''));
+  v_workflow_id public.premium_workflows.id%TYPE;
+  v_version bigint;
+  v_created boolean := false;
+  v_changed boolean := false;
+  v_rows integer;
+BEGIN
+  IF v_tool = '' OR v_tab = '' THEN
+    RAISE EXCEPTION 'tool and tab are required' USING ERRCODE = '22023';
+  END IF;
+
+  SELECT id, content_version
+    INTO v_workflow_id, v_version
+    FROM public.premium_workflows
+   WHERE tool = v_tool AND tab = v_tab
+   FOR UPDATE;
+
+  IF v_workflow_id IS NULL THEN
+    INSERT INTO public.premium_workflows (
+      tool, tab, difficulty, eyebrow_text, eyebrow_color, panel_title, description,
+      stat_pills, tool_chips, result_summary, content_version, updated_at
+    )
+    VALUES (
+      v_tool,
+      v_tab,
+      coalesce(nullif(payload->>'difficulty', ''), 'Beginner'),
+      coalesce(payload->>'eyebrow_text', ''),
+      coalesce(nullif(payload->>'eyebrow_color', ''), '#ef4444'),
+      coalesce(payload->>'panel_title', ''),
+      coalesce(payload->>'description', ''),
+      coalesce(payload->'stat_pills', '[]'::jsonb),
+      coalesce(payload->'tool_chips', '[]'::jsonb),
+      coalesce(payload->'result_summary', '[]'::jsonb),
+      1,
+      now()
+    )
+    RETURNING id, content_version INTO v_workflow_id, v_version;
+    v_created := true;
+    v_changed := true;
+  ELSE
+    UPDATE public.premium_workflows w
+       SET difficulty = n.difficulty,
+           eyebrow_text = n.eyebrow_text,
+           eyebrow_color = n.eyebrow_color,
+           panel_title = n.panel_title,
+           description = n.description,
+           stat_pills = n.stat_pills,
+           tool_chips = n.tool_chips,
+           result_summary = n.result_summary
+      FROM (
+        SELECT
+          coalesce(nullif(payload->>'difficulty', ''), 'Beginner') AS difficulty,
+          coalesce(payload->>'eyebrow_text', '') AS eyebrow_text,
+          coalesce(nullif(payload->>'eyebrow_color', ''), '#ef4444') AS eyebrow_color,
+          coalesce(payload->>'panel_title', '') AS panel_title,
+          coalesce(payload->>'description', '') AS description,
+          coalesce(payload->'stat_pills', '[]'::jsonb) AS stat_pills,
+          coalesce(payload->'tool_chips', '[]'::jsonb) AS tool_chips,
+          coalesce(payload->'result_summary', '[]'::jsonb) AS result_summary
+      ) n
+     WHERE w.id = v_workflow_id
+       AND (w.difficulty, w.eyebrow_text, w.eyebrow_color, w.panel_title, w.description,
+            w.stat_pills, w.tool_chips, w.result_summary)
+           IS DISTINCT FROM
+           (n.difficulty, n.eyebrow_text, n.eyebrow_color, n.panel_title, n.description,
+            n.stat_pills, n.tool_chips, n.result_summary);
+    GET DIAGNOSTICS v_rows = ROW_COUNT;
+    v_changed := v_rows > 0;
+  END IF;
+
+  -- Steps: upsert changed positions, delete positions no longer present
+  WITH incoming AS (
+    SELECT
+      p.ordinality::int AS phase_number,
+      coalesce(nullif(p.value->>'phase_name', ''), 'Phase ' || p.ordinality) AS phase_name,
+      s.ordinality::int AS step_number,
+      coalesce(s.value->>'title', '') AS title,
+      coalesce(s.value->>'tools_used', '') AS tools_used,
+      nullif(s.value->>'badge_color', '') AS badge_color,
+      nullif(s.value->>'step_num_color', '') AS step_num_color,
+      coalesce(s.value->>'time_estimate', '') AS time_estimate,
+      coalesce(s.value->>'description', '') AS description,
+      coalesce(s.value->>'prompt', '') AS prompt,
+      coalesce(s.value->>'expected_output', '') AS expected_output,
+      coalesce(s.value->>'pro_tip', '') AS pro_tip
+    FROM jsonb_array_elements(coalesce(payload->'phases', '[]'::jsonb)) WITH ORDINALITY AS p(value, ordinality)
+    CROSS JOIN LATERAL jsonb_array_elements(coalesce(p.value->'steps', '[]'::jsonb)) WITH ORDINALITY AS s(value, ordinality)
+  ),
+  upserted AS (
+    INSERT INTO public.premium_workflow_steps AS st (
+      workflow_id, phase_number, phase_name, step_number, title, tools_used, badge_color,
+      step_num_color, time_estimate, description, prompt, expected_output, pro_tip
+    )
+    SELECT
+      v_workflow_id, phase_number, phase_name, step_number, title, tools_used, badge_color,
+      step_num_color, time_estimate, description, prompt, expected_output, pro_tip
+    FROM incoming
+    ON CONFLICT (workflow_id, phase_number, step_number) DO UPDATE
+       SET phase_name = EXCLUDED.phase_name,
+           title = EXCLUDED.title,
+           tools_used = EXCLUDED.tools_used,
+           badge_color = EXCLUDED.badge_color,
+           step_num_color = EXCLUDED.step_num_color,
+           time_estimate = EXCLUDED.time_estimate,
+           description = EXCLUDED.description,
+           prompt = EXCLUDED.prompt,
+           expected_output = EXCLUDED.expected_output,
+           pro_tip = EXCLUDED.pro_tip
+     WHERE (st.phase_name, st.title, st.tools_used, st.badge_color, st.step_num_color,
+            st.time_estimate, st.description, st.prompt, st.expected_output, st.pro_tip)
+           IS DISTINCT FROM
+           (EXCLUDED.phase_name, EXCLUDED.title, EXCLUDED.tools_used, EXCLUDED.badge_color,
+            EXCLUDED.step_num_color, EXCLUDED.time_estimate, EXCLUDED.description,
+            EXCLUDED.prompt, EXCLUDED.expected_output, EXCLUDED.pro_tip)
+    RETURNING 1
+  ),
+  removed AS (
+    DELETE FROM public.premium_workflow_steps st
+     WHERE st.workflow_id = v_workflow_id
+       AND NOT EXISTS (
+         SELECT 1 FROM incoming i
+          WHERE i.phase_number = st.phase_number AND i.step_number = st.step_number
+       )
+    RETURNING 1
+  )
+  SELECT (SELECT count(*) FROM upserted) + (SELECT count(*) FROM removed) INTO v_rows;
+  v_changed := v_changed OR v_rows > 0;
+
+  -- Results: same diffing keyed by stat_number
+  WITH incoming AS (
+    SELECT
+      r.ordinality::int AS stat_number,
+      coalesce(r.value->>'value', '') AS value,
+      coalesce(r.value->>'label', '') AS label,
+      coalesce(nullif(r.value->>'color', ''), '#ffffff') AS color
+    FROM jsonb_array_elements(coalesce(payload->'result_summary', '[]'::jsonb)) WITH ORDINALITY AS r(value, ordinality)
+  ),
+  upserted AS (
+    INSERT INTO public.premium_workflow_results AS rs (workflow_id, stat_number, value, label, color)
+    SELECT v_workflow_id, stat_number, value, label, color
+    FROM incoming
+    ON CONFLICT (workflow_id, stat_number) DO UPDATE
+       SET value = EXCLUDED.value,
+           label = EXCLUDED.label,
+           color = EXCLUDED.color
+     WHERE (rs.value, rs.label, rs.color) IS DISTINCT FROM (EXCLUDED.value, EXCLUDED.label, EXCLUDED.color)
+    RETURNING 1
+  ),
+  removed AS (
+    DELETE FROM public.premium_workflow_results rs
+     WHERE rs.workflow_id = v_workflow_id
+       AND NOT EXISTS (SELECT 1 FROM incoming i WHERE i.stat_number = rs.stat_number)
+    RETURNING 1
+  )
+  SELECT (SELECT count(*) FROM upserted) + (SELECT count(*) FROM removed) INTO v_rows;
+  v_changed := v_changed OR v_rows > 0;
+
+  IF v_changed AND NOT v_created THEN
+    UPDATE public.premium_workflows
+       SET content_version = content_version + 1,
+           updated_at = now()
+     WHERE id = v_workflow_id
+    RETURNING content_version INTO v_version;
+  END IF;
+
+  RETURN jsonb_build_object(
+    'workflow_id', v_workflow_id,
+    'content_version', v_version,
+    'changed', v_changed
+  );
+END;
+$$;
+
+-- 4) Only the backend (service role) may call the save function
+REVOKE ALL ON FUNCTION public.save_premium_workflow(jsonb) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.save_premium_workflow(jsonb) TO service_role;
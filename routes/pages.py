@@ -1,27 +1,28 @@
 from datetime import datetime
+import asyncio
+import hashlib
 import json
 import re
+import time
 # import traceback
 # import httpx
 from fastapi import APIRouter, HTTPException, Request
-from fastapi.responses import  FileResponse, HTMLResponse, JSONResponse, RedirectResponse, Response
-from fastapi.templating import Jinja2Templates
+from fastapi.responses import  FileResponse, HTMLResponse, JSONResponse, RedirectResponse, Response, StreamingResponse
 from database import supabase
 import os
-import math
-try:
-    import resend
-except ImportError:
-    resend = None
 # from jose import JWTError, jwt
 # from auth import SECRET_KEY, ALGORITHM
 
 
 # pricing utilities
 from utils.currency import get_price_context, calculate_price
+from utils.rate_limit import contact_email_limiter, contact_ip_limiter, get_client_ip
+from utils import (
+    blog_facets, blog_feed, compare_catalog, plan_catalog, search_index, signed_urls, site_settings, sitemap, workflows,
+)
+from utils.templating import templates
 
 router = APIRouter()
-templates = Jinja2Templates(directory="templates")
 
 
 # Add this near the top of pages.py
@@ -37,6 +38,7 @@ templates.env.globals["supabase_public_url"] = SUPABASE_PUBLIC_URL
 templates.env.globals["supabase_anon_key"] = SUPABASE_ANON_KEY
 
 ONE_MONTH_SECONDS = 60 * 60 * 24 * 30
+BILLING_HISTORY_LIMIT = 25
 COOKIE_SECURE = BASE_URL.startswith("https://")
 
 
@@ -169,8 +171,22 @@ def _parse_plan_ids(raw_value) -> list:
     return []
 
 
-async def get_entitlement_state(token: str | None) -> dict:
-    """Unified premium entitlement check used across profile, premium page and navbar state."""
+async def _execute(query):
+    """Run a blocking PostgREST query in a worker thread so independent reads can overlap."""
+    return await asyncio.to_thread(query.execute)
+
+
+def _billing_status(row: dict) -> str:
+    return str(row.get("effective_status") or row.get("payment_status") or "pending").lower()
+
+
+async def get_entitlement_state(token: str | None, user=None, include_billing_history: bool = False) -> dict:
+    """Unified premium entitlement check used across profile, premium page and navbar state.
+
+    Pass `user` when the caller already resolved it from the cookies to skip a second
+    auth lookup. With `include_billing_history`, the user's recent billing rows are
+    fetched once, used for the premium check and returned as `billing_rows`.
+    """
     state = {
         "user": None,
         "user_id": None,
@@ -179,17 +195,19 @@ async def get_entitlement_state(token: str | None) -> dict:
         "has_premium": False,
         "premium_expired": False,
         "subscription_state": "free",
+        "billing_rows": None,
     }
     if not token:
         return state
 
     premium_plan_id = "bdb81597-0b54-4f0e-acea-b88fecf1cb14"
 
-    try:
-        auth_user = supabase.auth.get_user(token)
-        user = auth_user.user if auth_user and auth_user.user else None
-    except Exception:
-        user = None
+    if user is None:
+        try:
+            auth_user = await asyncio.to_thread(supabase.auth.get_user, token)
+            user = auth_user.user if auth_user and auth_user.user else None
+        except Exception:
+            user = None
 
     if not user:
         return state
@@ -201,50 +219,82 @@ async def get_entitlement_state(token: str | None) -> dict:
     state["user_id"] = user_id
     state["email"] = email
 
-    # Admin-granted or manually assigned access via user_profiles.plan_ids.
-    if email:
+    async def _load_plan_ids() -> list:
+        # Admin-granted or manually assigned access via user_profiles.plan_ids.
+        if not email:
+            return []
         try:
-            plan_res = (
+            plan_res = await _execute(
                 supabase
                 .table("user_profiles")
                 .select("plan_ids")
                 .eq("email", email)
                 .limit(1)
-                .execute()
             )
             if plan_res.data:
-                state["plan_ids"] = _parse_plan_ids((plan_res.data[0] or {}).get("plan_ids"))
+                return _parse_plan_ids((plan_res.data[0] or {}).get("plan_ids"))
         except Exception:
-            state["plan_ids"] = []
-
-    has_admin_premium = premium_plan_id in state["plan_ids"]
-    has_paid_premium = False
-    premium_expired = False
+            pass
+        return []
 
-    # Preferred source: expiry-aware billing view.
-    if user_id:
+    async def _load_billing_history():
+        if not (include_billing_history and user_id):
+            return None
         try:
-            billing_res = (
+            history_res = await _execute(
                 supabase
                 .table("billing_records_effective")
-                .select("effective_status,payment_status,expires_at,created_at")
+                .select("id,plan_id,plan_name,amount,currency,payment_method,transaction_id,created_at,paid_at,expires_at,payment_status,effective_status")
                 .eq("user_id", user_id)
-                .eq("plan_id", premium_plan_id)
                 .order("created_at", desc=True)
-                .limit(1)
-                .execute()
+                .limit(BILLING_HISTORY_LIMIT)
             )
-            if billing_res.data:
-                row = billing_res.data[0]
-                status = str(row.get("effective_status") or row.get("payment_status") or "pending").lower()
-                has_paid_premium = status in {"paid", "success", "active"}
-                premium_expired = status == "expired"
+            return history_res.data or []
         except Exception:
-            pass
+            return []
+
+    state["plan_ids"], billing_rows = await asyncio.gather(_load_plan_ids(), _load_billing_history())
+    state["billing_rows"] = billing_rows
+
+    has_admin_premium = premium_plan_id in state["plan_ids"]
+    has_paid_premium = False
+    premium_expired = False
+
+    # Preferred source: expiry-aware billing view.
+    if user_id:
+        latest_premium_row = None
+        history_is_complete = False
+        if billing_rows is not None:
+            latest_premium_row = next(
+                (row for row in billing_rows if str(row.get("plan_id") or "") == premium_plan_id),
+                None,
+            )
+            history_is_complete = len(billing_rows) < BILLING_HISTORY_LIMIT
+
+        if latest_premium_row is None and not history_is_complete:
+            try:
+                billing_res = await _execute(
+                    supabase
+                    .table("billing_records_effective")
+                    .select("effective_status,payment_status,expires_at,created_at")
+                    .eq("user_id", user_id)
+                    .eq("plan_id", premium_plan_id)
+                    .order("created_at", desc=True)
+                    .limit(1)
+                )
+                if billing_res.data:
+                    latest_premium_row = billing_res.data[0]
+            except Exception:
+                pass
+
+        if latest_premium_row:
+            status = _billing_status(latest_premium_row)
+            has_paid_premium = status in {"paid", "success", "active"}
+            premium_expired = status == "expired"
 
         if not has_paid_premium and not premium_expired and email:
             try:
-                billing_res = (
+                billing_res = await _execute(
                     supabase
                     .table("billing_records_effective")
                     .select("effective_status,payment_status,expires_at,created_at")
@@ -252,11 +302,9 @@ async def get_entitlement_state(token: str | None) -> dict:
                     .eq("plan_id", premium_plan_id)
                     .order("created_at", desc=True)
                     .limit(1)
-                    .execute()
                 )
                 if billing_res.data:
-                    row = billing_res.data[0]
-                    status = str(row.get("effective_status") or row.get("payment_status") or "pending").lower()
+                    status = _billing_status(billing_res.data[0])
                     has_paid_premium = status in {"paid", "success", "active"}
                     premium_expired = status == "expired"
             except Exception:
@@ -265,7 +313,7 @@ async def get_entitlement_state(token: str | None) -> dict:
     # Legacy fallback: active orders table check.
     if not has_paid_premium and not premium_expired and user_id:
         try:
-            order_res = (
+            order_res = await _execute(
                 supabase
                 .table("orders")
                 .select("id")
@@ -273,7 +321,6 @@ async def get_entitlement_state(token: str | None) -> dict:
                 .eq("plan_id", premium_plan_id)
                 .eq("status", "active")
                 .limit(1)
-                .execute()
             )
             has_paid_premium = bool(order_res.data)
         except Exception:
@@ -471,23 +518,14 @@ async def products(request: Request):
         ctx = await get_price_context(request)
         currency = ctx.get('currency', 'INR')
         
-        # Fetch all pricing plans so inactive ones can be shown as Coming Soon.
-        plans_response = (
-            supabase
-            .table("pricing_plans")
-            .select(
-                "id,plan_heading,plan_subheading,price_inr,discount_percent,price_note,"
-                "features_heading_1,features_list_1,features_heading_2,features_list_2,"
-                "is_active,is_popular,badge_text,button_text,show_terms,"
-                "card_bg_color,badge_bg_color,badge_text_color,display_order"
-            )
-            .order("display_order")
-            .execute()
-        )
+        # All pricing plans (copies from the plan catalog), so inactive ones can
+        # be shown as Coming Soon.
+        catalog = await asyncio.to_thread(plan_catalog.get_catalog)
+        plans_data = catalog.plans()
         
-        if plans_response.data:
+        if plans_data:
             plans = []
-            for plan in plans_response.data:
+            for plan in plans_data:
                 # Convert price based on currency
                 price_inr = plan.get('price_inr')
                 plan_discount = plan.get('discount_percent', 0)
@@ -529,6 +567,35 @@ async def product_detail(request: Request):
     return RedirectResponse(url="/products#plans", status_code=302)
 
 
+PREMIUM_TABS = [
+    {"key": "youtube", "label": "YouTube Creator", "icon": "🎬", "color": "#ef4444"},
+    {"key": "instagram", "label": "Instagram Content", "icon": "📸", "color": "#ec4899"},
+    {"key": "analyst", "label": "Data Analyst", "icon": "📊", "color": "#6366f1"},
+]
+
+# (tool slug, tab) -> (workflow version, catalog version, ETag, JSON body) of
+# /premium/workflow responses.
+_workflow_panels: dict = {}
+
+
+def _premium_tools(catalog_tools: list[dict], snapshot: workflows.WorkflowSnapshot) -> list[dict]:
+    """Dropdown tools in display order, then tools that only have workflows."""
+    names = snapshot.tool_names
+    existing = {tool["slug"] for tool in catalog_tools}
+    return list(catalog_tools) + [
+        {
+            "id": None,
+            "name": names[slug],
+            "slug": slug,
+            "icon": infer_tool_icon(names[slug]),
+            "image_url": "",
+            "best_for": "",
+            "overall": 0,
+        }
+        for slug in sorted(set(names) - existing)
+    ]
+
+
 @router.get("/premium", response_class=HTMLResponse)
 async def premium_page(request: Request):
     ctx = await get_price_context(request)
@@ -541,258 +608,48 @@ async def premium_page(request: Request):
     premium_plan_name = "Premium Workflow Vault"
 
     auth_state = resolve_auth_from_cookies(request)
-    entitlement = await get_entitlement_state(auth_state.get("access_token"))
+    entitlement = await get_entitlement_state(auth_state.get("access_token"), user=auth_state.get("user"))
     has_premium = entitlement.get("has_premium", False)
 
     # ── If premium user, fetch AI tools for dropdown and show content page ──
     if has_premium:
-        ai_tools_dropdown = []
-        compare_tools_data = {}
-        premium_tabs = [
-            {"key": "youtube", "label": "YouTube Creator", "icon": "🎬", "color": "#ef4444"},
-            {"key": "instagram", "label": "Instagram Content", "icon": "📸", "color": "#ec4899"},
-            {"key": "analyst", "label": "Data Analyst", "icon": "📊", "color": "#6366f1"},
-        ]
         premium_tools = []
         try:
-            tools_res = (
-                supabase.table("ai_tools")
-                .select("id, name, image_url, best_for, quality_score, ease_score, accuracy_score, speed_score, value_score, creativity_score, integration_score, consistency_score, support_score, time_saved_score")
-                .order("display_order", desc=False)
-                .execute()
-            )
-            def _safe_float(v):
-                try: return float(v)
-                except: return 0.0
-
-            for t in (tools_res.data or []):
-                tool_name = t.get("name") or "Untitled"
-                tool_slug = slugify_tool_name(tool_name)
-                scores = [
-                    _safe_float(t.get("quality_score")), _safe_float(t.get("ease_score")),
-                    _safe_float(t.get("accuracy_score")), _safe_float(t.get("speed_score")),
-                    _safe_float(t.get("value_score")), _safe_float(t.get("creativity_score")),
-                    _safe_float(t.get("integration_score")), _safe_float(t.get("consistency_score")),
-                    _safe_float(t.get("support_score")), _safe_float(t.get("time_saved_score")),
-                ]
-                overall = round(sum(scores) / len(scores), 1) if scores else 0.0
-                ai_tools_dropdown.append({
-                    "id": t.get("id"),
-                    "name": tool_name,
-                    "slug": tool_slug,
-                    "icon": infer_tool_icon(tool_name),
-                    "image_url": t.get("image_url") or "",
-                    "best_for": t.get("best_for") or "",
-                    "overall": overall,
-                })
-                compare_tools_data[tool_slug] = {
-                    "name": tool_name,
-                    "slug": tool_slug,
-                    "icon": infer_tool_icon(tool_name),
-                    "image_url": t.get("image_url") or "",
-                    "tagline": (t.get("best_for") or "Data not updated yet"),
-                    "overall": overall,
-                    "scores": {
-                        "Output Quality": _safe_float(t.get("quality_score")),
-                        "Ease of Use": _safe_float(t.get("ease_score")),
-                        "Accuracy": _safe_float(t.get("accuracy_score")),
-                        "Speed": _safe_float(t.get("speed_score")),
-                        "Value for Money": _safe_float(t.get("value_score")),
-                        "Creativity": _safe_float(t.get("creativity_score")),
-                        "Integration": _safe_float(t.get("integration_score")),
-                        "Consistency": _safe_float(t.get("consistency_score")),
-                        "Support & Updates": _safe_float(t.get("support_score")),
-                        "Time Saved": _safe_float(t.get("time_saved_score")),
-                    },
-                    "benchmarks": {
-                        "MMLU": None,
-                        "HumanEval": None,
-                        "GSM8K": None,
-                        "HellaSwag": None,
-                        "TruthfulQA": None,
-                    },
-                    "details": {
-                        "Company": "Data not updated yet",
-                        "Founded": "Data not updated yet",
-                        "Headquarters": "Data not updated yet",
-                        "Website": "Data not updated yet",
-                        "Best For": (t.get("best_for") or "Data not updated yet"),
-                    },
-                    "pros": ["Data not updated yet"],
-                    "cons": ["Data not updated yet"],
-                    "pricing": [{"name": "Plan", "price": "Data not updated yet", "desc": "Data not updated yet"}],
-                    "usecases": [{"icon": "📌", "title": "Use Case", "desc": "Data not updated yet"}],
-                }
+            catalog = await asyncio.to_thread(compare_catalog.get_catalog)
         except Exception as e:
             print(f"Error loading AI tools for premium content: {e}")
+            catalog = compare_catalog.from_rows([])
+        ai_tools_dropdown = catalog.tools
 
+        # Only the initial tool's workflows are rendered; the page loads the
+        # others from /premium/workflow/<tool>/<tab> when they are selected.
         try:
-            workflows_res = (
-                supabase.table("premium_workflows")
-                .select("id, tool, tab, difficulty, eyebrow_text, eyebrow_color, panel_title, description, stat_pills, tool_chips, result_summary")
-                .order("tool")
-                .order("tab")
-                .execute()
-            )
-            workflow_rows = workflows_res.data or []
-            workflow_ids = [row.get("id") for row in workflow_rows if row.get("id")]
-
-            steps_by_workflow = {}
-            results_by_workflow = {}
-
-            if workflow_ids:
-                steps_res = (
-                    supabase.table("premium_workflow_steps")
-                    .select("workflow_id, phase_number, phase_name, step_number, title, tools_used, badge_color, step_num_color, time_estimate, description, prompt, expected_output, pro_tip")
-                    .in_("workflow_id", workflow_ids)
-                    .order("workflow_id")
-                    .order("phase_number")
-                    .order("step_number")
-                    .execute()
-                )
-                for row in (steps_res.data or []):
-                    steps_by_workflow.setdefault(row.get("workflow_id"), []).append(row)
-
-                results_res = (
-                    supabase.table("premium_workflow_results")
-                    .select("workflow_id, stat_number, value, label, color")
-                    .in_("workflow_id", workflow_ids)
-                    .order("workflow_id")
-                    .order("stat_number")
-                    .execute()
-                )
-                for row in (results_res.data or []):
-                    results_by_workflow.setdefault(row.get("workflow_id"), []).append({
-                        "value": row.get("value") or "",
-                        "label": row.get("label") or "",
-                        "color": row.get("color") or "#ffffff",
-                    })
-
-            workflow_lookup = {}
-            workflow_name_lookup = {}
-            for row in workflow_rows:
-                workflow_id = row.get("id")
-                tool_name = (row.get("tool") or "Untitled Tool").strip() or "Untitled Tool"
-                tool_slug = slugify_tool_name(tool_name)
-                tab_key = (row.get("tab") or "").strip().lower()
-                phases_map = {}
-                for step in steps_by_workflow.get(workflow_id, []):
-                    phase_number = step.get("phase_number") or 0
-                    if phase_number not in phases_map:
-                        phases_map[phase_number] = {
-                            "phase_name": step.get("phase_name") or f"Phase {phase_number}",
-                            "steps": [],
-                        }
-                    phases_map[phase_number]["steps"].append({
-                        "title": step.get("title") or "",
-                        "tools_used": step.get("tools_used") or "",
-                        "badge_color": step.get("badge_color") or "",
-                        "step_num_color": step.get("step_num_color") or "",
-                        "time_estimate": step.get("time_estimate") or "",
-                        "description": step.get("description") or "",
-                        "prompt": step.get("prompt") or "",
-                        "expected_output": step.get("expected_output") or "",
-                        "pro_tip": step.get("pro_tip") or "",
-                    })
-
-                phases = [phases_map[k] for k in sorted(phases_map.keys())]
-                result_summary = results_by_workflow.get(workflow_id) or (row.get("result_summary") or [])
-                tool_chips = row.get("tool_chips") or []
-                step_count = sum(len(phase.get("steps") or []) for phase in phases)
-                workflow_lookup[(tool_slug, tab_key)] = {
-                    "id": workflow_id,
-                    "tool": tool_name,
-                    "tab": tab_key,
-                    "difficulty": row.get("difficulty") or "Beginner",
-                    "eyebrow_text": row.get("eyebrow_text") or "",
-                    "eyebrow_color": row.get("eyebrow_color") or "",
-                    "panel_title": row.get("panel_title") or "",
-                    "description": row.get("description") or "",
-                    "tool_chips": tool_chips,
-                    "result_summary": result_summary,
-                    "phases": phases,
-                    "phase_count": len(phases),
-                    "step_count": step_count,
-                    "tools_count": len(tool_chips),
-                    "estimated_time": (result_summary[0].get("value") if result_summary else ""),
-                }
-                workflow_name_lookup[tool_slug] = tool_name
-
-            for tool in ai_tools_dropdown:
-                tool_tabs = {tab["key"]: workflow_lookup.get((tool["slug"], tab["key"])) for tab in premium_tabs}
-                premium_tools.append({
-                    **tool,
-                    "tabs": tool_tabs,
-                })
-
-            existing_slugs = {tool["slug"] for tool in premium_tools}
-            extra_slugs = {slug for (slug, _tab) in workflow_lookup.keys() if slug not in existing_slugs}
-            for slug in sorted(extra_slugs):
-                premium_tools.append({
-                    "id": None,
-                    "name": workflow_name_lookup.get(slug, slug.replace("-", " ").title()),
-                    "slug": slug,
-                    "icon": infer_tool_icon(workflow_name_lookup.get(slug, slug)),
-                    "image_url": "",
-                    "best_for": "",
-                    "overall": 0,
-                    "tabs": {tab["key"]: workflow_lookup.get((slug, tab["key"])) for tab in premium_tabs},
-                })
-
+            snapshot = await asyncio.to_thread(workflows.get_snapshot)
+            premium_tools = _premium_tools(ai_tools_dropdown, snapshot)
+            if premium_tools:
+                premium_tools[0] = {**premium_tools[0], "tabs": snapshot.tabs(premium_tools[0]["slug"])}
         except Exception as e:
             print(f"Error loading premium workflow content: {e}")
+            premium_tools = []
 
         initial_premium_tool = premium_tools[0] if premium_tools else {
             "slug": "claude",
             "name": "Claude",
             "icon": "🤖",
         }
-        compare_tools = [compare_tools_data[tool["slug"]] for tool in premium_tools if tool.get("slug") in compare_tools_data]
-        if not compare_tools:
-            compare_tools = [{
-                "name": "Claude",
-                "slug": "claude",
-                "icon": "🤖",
-                "image_url": "",
-                "tagline": "Data not updated yet",
-                "overall": 0,
-                "scores": {
-                    "Output Quality": 0,
-                    "Ease of Use": 0,
-                    "Accuracy": 0,
-                    "Speed": 0,
-                    "Value for Money": 0,
-                    "Creativity": 0,
-                    "Integration": 0,
-                    "Consistency": 0,
-                    "Support & Updates": 0,
-                    "Time Saved": 0,
-                },
-                "benchmarks": {"MMLU": None, "HumanEval": None, "GSM8K": None, "HellaSwag": None, "TruthfulQA": None},
-                "details": {"Company": "Data not updated yet", "Founded": "Data not updated yet", "Headquarters": "Data not updated yet", "Website": "Data not updated yet", "Best For": "Data not updated yet"},
-                "pros": ["Data not updated yet"],
-                "cons": ["Data not updated yet"],
-                "pricing": [{"name": "Plan", "price": "Data not updated yet", "desc": "Data not updated yet"}],
-                "usecases": [{"icon": "📌", "title": "Use Case", "desc": "Data not updated yet"}],
-            }]
-        compare_default_slugs = [tool.get("slug") for tool in compare_tools[:3] if tool.get("slug")]
-        if not compare_default_slugs and compare_tools:
-            compare_default_slugs = [compare_tools[0].get("slug")]
-        compare_tools_json = {tool.get("slug"): tool for tool in compare_tools if tool.get("slug")}
-
         response = templates.TemplateResponse(
             "premium_content.html",
             {
                 "request": request,
                 "ai_tools": ai_tools_dropdown,
                 "premium_tools": premium_tools,
-                "premium_tabs": premium_tabs,
+                "premium_tabs": PREMIUM_TABS,
                 "initial_premium_tool_slug": initial_premium_tool.get("slug", "claude"),
                 "initial_premium_tool_name": initial_premium_tool.get("name", "Claude"),
                 "initial_premium_tool_icon": initial_premium_tool.get("icon", "🤖"),
-                "compare_tools": compare_tools,
-                "compare_default_slugs": compare_default_slugs,
-                "compare_tools_json": json.dumps(compare_tools_json),
+                "compare_tools": catalog.compare_tools,
+                "compare_default_slugs": catalog.default_slugs,
+                "compare_version": catalog.version,
                 **ctx,
             },
         )
@@ -802,17 +659,10 @@ async def premium_page(request: Request):
 
     # ── Non-premium: show pricing/sales page ──
     try:
-        plan_res = (
-            supabase
-            .table("pricing_plans")
-            .select("id, plan_name, price_inr, discount_percent")
-            .eq("id", premium_plan_id)
-            .limit(1)
-            .execute()
-        )
+        catalog = await asyncio.to_thread(plan_catalog.get_catalog)
+        plan = catalog.get(premium_plan_id)
 
-        if plan_res.data:
-            plan = plan_res.data[0]
+        if plan:
             base_price_inr = float(plan.get("price_inr") or 99)
             premium_discount_percent = float(plan.get("discount_percent") or 0)
             premium_plan_name = (plan.get("plan_name") or premium_plan_name).strip()
@@ -862,6 +712,80 @@ async def premium_page(request: Request):
     return response
 
 
+@router.get("/premium/workflow/{tool_slug}/{tab}", include_in_schema=False)
+async def premium_workflow_json(request: Request, tool_slug: str, tab: str):
+    # The rendered panel for one tool/tab, for tools the /premium page did
+    # not render. Bodies are cached until the workflow or the tool
+    # catalog changes.
+    auth_state = resolve_auth_from_cookies(request)
+    entitlement = await get_entitlement_state(auth_state.get("access_token"), user=auth_state.get("user"))
+    if not entitlement.get("has_premium"):
+        raise HTTPException(status_code=403)
+    tab_info = next((item for item in PREMIUM_TABS if item["key"] == tab), None)
+    if tab_info is None:
+        raise HTTPException(status_code=404)
+
+    try:
+        catalog = await asyncio.to_thread(compare_catalog.get_catalog)
+        snapshot = await asyncio.to_thread(workflows.get_snapshot)
+        version = (snapshot.versions.get((tool_slug, tab)), catalog.version)
+        cached = _workflow_panels.get((tool_slug, tab))
+        if cached is None or cached[:2] != version:
+            tool = next((item for item in _premium_tools(catalog.tools, snapshot) if item["slug"] == tool_slug), None)
+            if tool is None:
+                raise HTTPException(status_code=404)
+            workflow = snapshot.get(tool_slug, tab)
+            html = templates.get_template("premium_workflow_panel.html").render(
+                tool=tool, tab=tab_info, workflow=workflow, active=False
+            )
+            body = compare_catalog.dumps({"tool": tool_slug, "tab": tab, "html": html})
+            cached = (*version, '"' + hashlib.sha1(body).hexdigest()[:20] + '"', body)
+            _workflow_panels[(tool_slug, tab)] = cached
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"❌ Error loading premium workflow {tool_slug}/{tab}: {str(e)}")
+        raise HTTPException(status_code=503)
+
+    etag, body = cached[2], cached[3]
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag in [tag.strip() for tag in request.headers.get("if-none-match", "").split(",")]:
+        response = Response(status_code=304, headers=headers)
+    else:
+        response = Response(body, media_type="application/json", headers=headers)
+    if auth_state.get("refreshed") and auth_state.get("access_token"):
+        _set_auth_cookies(response, auth_state.get("access_token"), auth_state.get("refresh_token"))
+    return response
+
+
+@router.get("/premium/compare.json", include_in_schema=False)
+async def premium_compare_json(request: Request, v: str = ""):
+    # The compare tab's data, fetched by /premium when the tab is opened.
+    # ?v=<catalog version> URLs never change content, so they may be cached for good.
+    auth_state = resolve_auth_from_cookies(request)
+    entitlement = await get_entitlement_state(auth_state.get("access_token"), user=auth_state.get("user"))
+    if not entitlement.get("has_premium"):
+        raise HTTPException(status_code=403)
+
+    try:
+        catalog = await asyncio.to_thread(compare_catalog.get_catalog)
+    except Exception as e:
+        print(f"❌ Error building compare catalog: {str(e)}")
+        raise HTTPException(status_code=503)
+
+    headers = {
+        "ETag": catalog.etag,
+        "Cache-Control": "private, max-age=31536000, immutable" if v == catalog.version else "private, max-age=300",
+    }
+    if catalog.not_modified(request.headers.get("if-none-match")):
+        response = Response(status_code=304, headers=headers)
+    else:
+        response = Response(catalog.payload, media_type="application/json", headers=headers)
+    if auth_state.get("refreshed") and auth_state.get("access_token"):
+        _set_auth_cookies(response, auth_state.get("access_token"), auth_state.get("refresh_token"))
+    return response
+
+
 @router.get("/profile", response_class=HTMLResponse)
 async def profile_page(request: Request):
     ctx = await get_price_context(request)
@@ -891,80 +815,77 @@ async def profile_page(request: Request):
     first_name = name_parts[0] if name_parts else ""
     last_name = " ".join(name_parts[1:]) if len(name_parts) > 1 else ""
 
-    profile_row = {}
-
-    entitlement = await get_entitlement_state(token)
-    plan_ids = entitlement.get("plan_ids") or []
-    has_premium = bool(entitlement.get("has_premium"))
-    premium_expired = bool(entitlement.get("premium_expired"))
-
-    # Read profile info from current user_profiles schema first.
-    if email:
+    async def _load_profile_details() -> dict:
+        # Read profile info from current user_profiles schema first.
+        if not email:
+            return {}
         try:
-            details_res = (
+            details_res = await _execute(
                 supabase
                 .table("user_profiles")
                 .select("full_name,phone_number,dob,profession,created_at")
                 .eq("email", email)
                 .limit(1)
-                .execute()
             )
-            if details_res.data:
-                profile_row = details_res.data[0] or {}
-                db_full_name = str(profile_row.get("full_name") or "").strip()
-                if db_full_name:
-                    full_name = db_full_name
-                    parts = full_name.split()
-                    first_name = parts[0] if parts else first_name
-                    last_name = " ".join(parts[1:]) if len(parts) > 1 else ""
+            return (details_res.data[0] or {}) if details_res.data else {}
+        except Exception:
+            return {}
+
+    async def _load_plan_snapshot() -> list:
+        # The plan catalog serves both the plan name lookup and available upgrades.
+        try:
+            catalog = await asyncio.to_thread(plan_catalog.get_catalog)
+            return catalog.plans()
         except Exception:
-            profile_row = {}
+            return []
+
+    entitlement, profile_row, plan_rows = await asyncio.gather(
+        get_entitlement_state(token, user=user, include_billing_history=True),
+        _load_profile_details(),
+        _load_plan_snapshot(),
+    )
+    plan_ids = entitlement.get("plan_ids") or []
+    has_premium = bool(entitlement.get("has_premium"))
+    premium_expired = bool(entitlement.get("premium_expired"))
+
+    db_full_name = str(profile_row.get("full_name") or "").strip()
+    if db_full_name:
+        full_name = db_full_name
+        parts = full_name.split()
+        first_name = parts[0] if parts else first_name
+        last_name = " ".join(parts[1:]) if len(parts) > 1 else ""
 
     payment_rows = []
 
-    # Preferred source: billing_records_effective (supports computed expiry and stable history).
-    try:
-        billing_res = (
-            supabase
-            .table("billing_records_effective")
-            .select("id,plan_id,plan_name,amount,currency,payment_method,transaction_id,created_at,paid_at,expires_at,payment_status,effective_status")
-            .eq("user_id", user.id)
-            .order("created_at", desc=True)
-            .limit(25)
-            .execute()
+    # Preferred source: billing_records_effective rows already fetched by the entitlement check.
+    for row in (entitlement.get("billing_rows") or []):
+        status = _billing_status(row)
+        payment_rows.append(
+            {
+                "id": row.get("id"),
+                "plan_id": row.get("plan_id"),
+                "plan_name": row.get("plan_name"),
+                "status": status,
+                "amount": row.get("amount"),
+                "currency": row.get("currency"),
+                "payment_method": row.get("payment_method"),
+                "created_at": row.get("created_at"),
+                "paid_at": row.get("paid_at") or row.get("created_at"),
+                "expires_at": row.get("expires_at"),
+                "transaction_id": row.get("transaction_id"),
+            }
         )
 
-        for row in (billing_res.data or []):
-            status = str(row.get("effective_status") or row.get("payment_status") or "pending").lower()
-            payment_rows.append(
-                {
-                    "id": row.get("id"),
-                    "plan_id": row.get("plan_id"),
-                    "plan_name": row.get("plan_name"),
-                    "status": status,
-                    "amount": row.get("amount"),
-                    "currency": row.get("currency"),
-                    "payment_method": row.get("payment_method"),
-                    "created_at": row.get("created_at"),
-                    "paid_at": row.get("paid_at") or row.get("created_at"),
-                    "expires_at": row.get("expires_at"),
-                    "transaction_id": row.get("transaction_id"),
-                }
-            )
-    except Exception:
-        payment_rows = []
-
     # Fallback source: orders table (legacy flow).
     if not payment_rows:
         try:
-            orders_res = (
+            orders_res = await _execute(
                 supabase
                 .table("orders")
                 .select("id,plan_id,status,amount,currency,payment_method,created_at,transaction_id,user_id")
                 .eq("user_id", user.id)
                 .order("created_at", desc=True)
-                .limit(25)
-                .execute()
+                .limit(BILLING_HISTORY_LIMIT)
             )
             for row in (orders_res.data or []):
                 payment_rows.append(
@@ -1030,35 +951,15 @@ async def profile_page(request: Request):
         has_premium = True
 
     plan_name_map = {}
-    all_plan_ids = list({str(p.get("plan_id")) for p in payment_rows if p.get("plan_id")})
-    if premium_plan_id not in all_plan_ids:
-        all_plan_ids.append(premium_plan_id)
-    if free_plan_id not in all_plan_ids:
-        all_plan_ids.append(free_plan_id)
-    for pid in plan_ids:
-        if pid and pid not in all_plan_ids:
-            all_plan_ids.append(pid)
-
-    try:
-        if all_plan_ids:
-            plans_res = (
-                supabase
-                .table("pricing_plans")
-                .select("id,plan_name,plan_heading,price_inr")
-                .in_("id", all_plan_ids)
-                .execute()
-            )
-            for p in plans_res.data or []:
-                pid = str(p.get("id") or "")
-                if pid:
-                    heading = (p.get("plan_heading") or "").strip()
-                    plan_name = (p.get("plan_name") or "").strip()
-                    plan_name_map[pid] = {
-                        "name": heading or plan_name or "BudasAI Plan",
-                        "price_inr": p.get("price_inr"),
-                    }
-    except Exception:
-        plan_name_map = {}
+    for p in plan_rows:
+        pid = str(p.get("id") or "")
+        if pid:
+            heading = (p.get("plan_heading") or "").strip()
+            plan_name = (p.get("plan_name") or "").strip()
+            plan_name_map[pid] = {
+                "name": heading or plan_name or "BudasAI Plan",
+                "price_inr": p.get("price_inr"),
+            }
 
     def _format_date(value):
         if not value:
@@ -1111,56 +1012,51 @@ async def profile_page(request: Request):
 
     available_upgrades = []
     owned_plan_ids = {str(pid) for pid in plan_ids if pid}
+    currency = ctx.get("currency", "INR")
 
-    try:
-        upgrades_res = (
-            supabase
-            .table("pricing_plans")
-            .select("id,plan_name,plan_heading,plan_subheading,price_inr,discount_percent,button_text,is_active,display_order")
-            .eq("is_active", True)
-            .order("display_order")
-            .execute()
-        )
-
-        for plan in (upgrades_res.data or []):
-            plan_id = str(plan.get("id") or "")
-            if not plan_id or plan_id in owned_plan_ids:
-                continue
+    async def _build_upgrade(plan: dict) -> dict:
+        plan_id = str(plan.get("id") or "")
+        price_inr = plan.get("price_inr")
+        plan_discount = plan.get("discount_percent") or 0
+        plan_heading = (plan.get("plan_heading") or plan.get("plan_name") or "BudasAI Plan").strip()
+        plan_subheading = (plan.get("plan_subheading") or "Unlock more workflows and premium support.").strip()
 
-            price_inr = plan.get("price_inr")
-            plan_discount = plan.get("discount_percent") or 0
-            plan_heading = (plan.get("plan_heading") or plan.get("plan_name") or "BudasAI Plan").strip()
-            plan_subheading = (plan.get("plan_subheading") or "Unlock more workflows and premium support.").strip()
+        original_price_display = None
+        price_display = None
+        price_label = "Custom"
 
-            original_price_display = None
-            price_display = None
-            price_label = "Custom"
+        if price_inr is not None:
+            try:
+                numeric_price = float(price_inr)
+                if numeric_price == 0:
+                    price_label = "Free"
+                elif numeric_price > 0:
+                    price_display = await calculate_price(currency, int(numeric_price), int(plan_discount))
+                    price_label = f"{ctx.get('symbol', '₹')}{price_display}"
+                    if plan_discount and 0 < float(plan_discount) < 100:
+                        base_original = int(round(numeric_price / (1 - (float(plan_discount) / 100))))
+                        original_price_display = await calculate_price(currency, base_original, 0)
+            except Exception:
+                price_label = "Custom"
 
-            if price_inr is not None:
-                try:
-                    numeric_price = float(price_inr)
-                    if numeric_price == 0:
-                        price_label = "Free"
-                    elif numeric_price > 0:
-                        price_display = await calculate_price(ctx.get("currency", "INR"), int(numeric_price), int(plan_discount))
-                        price_label = f"{ctx.get('symbol', '₹')}{price_display}"
-                        if plan_discount and 0 < float(plan_discount) < 100:
-                            base_original = int(round(numeric_price / (1 - (float(plan_discount) / 100))))
-                            original_price_display = await calculate_price(ctx.get("currency", "INR"), base_original, 0)
-                except Exception:
-                    price_label = "Custom"
+        return {
+            "id": plan_id,
+            "name": plan_heading,
+            "subheading": plan_subheading,
+            "price_label": price_label,
+            "original_price_display": original_price_display,
+            "button_text": (plan.get("button_text") or "Upgrade Now").strip(),
+            "href": f"/plan-action/{plan_id}",
+        }
 
-            available_upgrades.append(
-                {
-                    "id": plan_id,
-                    "name": plan_heading,
-                    "subheading": plan_subheading,
-                    "price_label": price_label,
-                    "original_price_display": original_price_display,
-                    "button_text": (plan.get("button_text") or "Upgrade Now").strip(),
-                    "href": f"/plan-action/{plan_id}",
-                }
-            )
+    try:
+        upgrade_plans = [
+            plan for plan in plan_rows
+            if plan.get("is_active")
+            and str(plan.get("id") or "")
+            and str(plan.get("id") or "") not in owned_plan_ids
+        ]
+        available_upgrades = list(await asyncio.gather(*(_build_upgrade(plan) for plan in upgrade_plans)))
     except Exception:
         available_upgrades = []
 
@@ -1361,16 +1257,8 @@ async def plan_action(request: Request, plan_id: str):
         return RedirectResponse(url="/products?login=required", status_code=303)
 
     try:
-        plan_res = (
-            supabase
-            .table("pricing_plans")
-            .select("id, price_inr, button_url, is_active")
-            .eq("id", plan_id)
-            .eq("is_active", True)
-            .limit(1)
-            .execute()
-        )
-        plan = plan_res.data[0] if plan_res.data else None
+        catalog = await asyncio.to_thread(plan_catalog.get_catalog)
+        plan = catalog.get(plan_id, active_only=True)
         if not plan:
             return RedirectResponse(url="/products", status_code=303)
 
@@ -1437,17 +1325,18 @@ async def download_guide(request: Request):
         return RedirectResponse(url="/products?login=required", status_code=303)
 
     try:
-        # Read filename from site_settings so admin can change it without redeploy
-        pdf_filename = "BudasAI Insight Feb 2026.pdf"  # fallback
+        # Filename comes from site_settings so admin can change it without redeploy;
+        # both the setting and the signed URL are cached (utils.site_settings,
+        # utils.signed_urls).
         try:
-            settings_res = supabase.table("site_settings").select("value").eq("key", "free_pdf_filename").limit(1).execute()
-            if settings_res.data:
-                pdf_filename = settings_res.data[0]["value"]
+            pdf_filename = await asyncio.to_thread(
+                site_settings.get, "free_pdf_filename", site_settings.DEFAULT_PDF_FILENAME
+            )
         except Exception:
-            pass  # use fallback filename
+            pdf_filename = site_settings.DEFAULT_PDF_FILENAME
 
-        res = supabase.storage.from_("PDFs").create_signed_url(pdf_filename, 60)
-        response = RedirectResponse(url=res["signedURL"], status_code=303)
+        signed_url = await asyncio.to_thread(signed_urls.get_signed_url, "PDFs", pdf_filename)
+        response = RedirectResponse(url=signed_url, status_code=303)
         if auth_state.get("refreshed") and auth_state.get("access_token"):
             _set_auth_cookies(response, auth_state.get("access_token"), auth_state.get("refresh_token"))
         return response
@@ -1801,44 +1690,26 @@ async def blog(request: Request, page: int = 1, category: str = "all"):
     try:
         PER_PAGE = 4
 
+        # ===== FACETS =====
+        # Category -> ordered post ids with counts, maintained by utils.blog_facets.
+        facets = await asyncio.to_thread(blog_facets.get_facets)
+        page_ids, page, total_pages = facets.page(category, page, PER_PAGE)
+
         # ===== DATABASE QUERY =====
-        # Build base query with ordering
-        query = supabase.table("blogs").select("*").order("date", desc=True)
+        # Only the posts on this page.
+        blogs_data = []
+        if page_ids:
+            response = await _execute(
+                supabase.table("blogs")
+                .select("id,title,slug,category,image_url,excerpt,date")
+                .in_("id", page_ids)
+            )
+            by_id = {row.get("id"): row for row in response.data or []}
+            blogs_data = [by_id[blog_id] for blog_id in page_ids if blog_id in by_id]
 
-        # Execute database query
-        response = query.execute()
-        blogs_data = response.data or []
-        
-        print(f"[DEBUG] Total blogs fetched: {len(blogs_data)}")
-        if blogs_data:
-            print(f"[DEBUG] First blog keys: {blogs_data[0].keys()}")
-            print(f"[DEBUG] First blog is_published: {blogs_data[0].get('is_published')}")
-
-        # ===== DATA PROCESSING & FILTERING =====
-        # Process blog data and filter by published status and category
-        processed_blogs = []
-        category_lower = category.lower() if category != "all" else "all"
-        
+        # ===== DATA PROCESSING =====
+        paginated_blogs = []
         for blog in blogs_data:
-            if not isinstance(blog, dict):
-                print(f"[DEBUG] Skipping non-dict: {type(blog)}")
-                continue
-
-            # Check if blog is published (handles both field name variations)
-            is_pub = blog.get("is_published") or blog.get("is_publish")
-            
-            if not is_pub:
-                print(f"[DEBUG] Skipping unpublished blog: {blog.get('title')} (is_published={blog.get('is_published')}, is_publish={blog.get('is_publish')})")
-                continue
-
-            # Filter by category if specified (case-insensitive)
-            blog_category = str(blog.get("category", "")).lower()
-            if category_lower != "all" and blog_category != category_lower:
-                print(f"[DEBUG] Skipping category mismatch: {blog.get('title')} ({blog_category} != {category_lower})")
-                continue
-
-            print(f"[DEBUG] Including blog: {blog.get('title')}")
-
             # Ensure all required fields exist
             blog.setdefault("image_url", "")
             blog.setdefault("excerpt", "")
@@ -1856,27 +1727,7 @@ async def blog(request: Request, page: int = 1, category: str = "all"):
             # Generate URL-friendly title
             blog["clean_title"] = clean_title_for_url(blog.get("title", ""))
 
-            processed_blogs.append(blog)
-
-        print(f"[DEBUG] Processed blogs after filtering: {len(processed_blogs)}")
-
-        # ===== PAGINATION =====
-        # Calculate pagination parameters
-        total_blogs = len(processed_blogs)
-        total_pages = math.ceil(total_blogs / PER_PAGE) if total_blogs > 0 else 1
-
-        # Validate and constrain page number
-        if page < 1:
-            page = 1
-        elif page > total_pages:
-            page = total_pages
-
-        # Slice blogs for current page
-        start_idx = (page - 1) * PER_PAGE
-        end_idx = start_idx + PER_PAGE
-        paginated_blogs = processed_blogs[start_idx:end_idx]
-
-        print(f"[DEBUG] Final paginated blogs: {len(paginated_blogs)}")
+            paginated_blogs.append(blog)
 
         # ===== TEMPLATE RENDERING =====
         # Get price context for display
@@ -1890,6 +1741,8 @@ async def blog(request: Request, page: int = 1, category: str = "all"):
                 "page": page,
                 "total_pages": total_pages,
                 "category": category,
+                "facets": facets.counts(),
+                "total_posts": facets.total(),
                 **ctx
             }
         )
@@ -1909,12 +1762,13 @@ async def blog(request: Request, page: int = 1, category: str = "all"):
                 "page": 1,
                 "total_pages": 1,
                 "category": "all",
+                "facets": [],
+                "total_posts": 0,
                 **ctx
             }
         )
 
 
-
 def clean_title_for_url(title: str) -> str:
     title = title.lower()
     title = re.sub(r'[^a-z0-9\s-]', '', title)   # remove special characters
@@ -1923,6 +1777,34 @@ def clean_title_for_url(title: str) -> str:
     return title.strip('-')
 
 
+async def _blog_feed_response(request: Request, kind: str, media_type: str) -> Response:
+    try:
+        feed = await asyncio.to_thread(blog_feed.get_feed, str(request.base_url), kind)
+    except Exception as e:
+        print(f"❌ Error building blog feed: {str(e)}")
+        raise HTTPException(status_code=503)
+
+    headers = {
+        "ETag": feed.etag,
+        "Last-Modified": feed.last_modified_http,
+        "Cache-Control": "public, max-age=300",
+    }
+    if feed.not_modified(request.headers.get("if-none-match"), request.headers.get("if-modified-since")):
+        return Response(status_code=304, headers=headers)
+    return Response(feed.body, media_type=media_type, headers=headers)
+
+
+# Registered before /blog/{id} so the feed paths are not read as post ids.
+@router.get("/blog/feed.xml", include_in_schema=False)
+async def blog_rss_feed(request: Request):
+    return await _blog_feed_response(request, blog_feed.RSS, "application/rss+xml")
+
+
+@router.get("/blog/atom.xml", include_in_schema=False)
+async def blog_atom_feed(request: Request):
+    return await _blog_feed_response(request, blog_feed.ATOM, "application/atom+xml")
+
+
 @router.get("/blog/{id}", response_class=HTMLResponse)
 async def full_blog_redirect(request: Request, id: int):
     try:
@@ -2000,6 +1882,71 @@ async def full_blog(request: Request, id: int, title: str):
         raise HTTPException(status_code=500)
 
 
+SEARCH_QUERY_MAX_LENGTH = 200
+
+
+def _search_results(q: str, type: str, limit: int) -> dict:
+    query = (q or "").strip()[:SEARCH_QUERY_MAX_LENGTH]
+    kind = type if type in search_index.KINDS else None
+    limit = max(1, min(limit, search_index.SEARCH_MAX_RESULTS))
+
+    started = time.perf_counter()
+    results = search_index.search(query, kind=kind, limit=limit) if query else []
+    took_ms = (time.perf_counter() - started) * 1000
+
+    for result in results:
+        if result["kind"] == search_index.BLOG:
+            result["url"] = f"/blog/{result['id']}/{clean_title_for_url(result['title'])}"
+        else:
+            result["url"] = f"/ai-tool-{slugify_tool_name(result['title'])}"
+    return {
+        "query": query,
+        "type": kind or "all",
+        "results": results,
+        "took_ms": round(took_ms, 2),
+        "ready": search_index.is_ready(),
+    }
+
+
+@router.get("/search", response_class=HTMLResponse)
+async def search_page(request: Request, q: str = "", type: str = "all"):
+    ctx = await get_price_context(request)
+    return templates.TemplateResponse(
+        "search.html",
+        {"request": request, **_search_results(q, type, search_index.SEARCH_MAX_RESULTS), **ctx}
+    )
+
+
+@router.get("/api/search")
+async def search_api(q: str = "", type: str = "all", limit: int = 10):
+    return JSONResponse(_search_results(q, type, limit))
+
+
+async def _sitemap_response(request: Request, shard: int | None) -> Response:
+    try:
+        xml = await asyncio.to_thread(sitemap.render, str(request.base_url), shard)
+    except Exception as e:
+        print(f"❌ Error building sitemap: {str(e)}")
+        raise HTTPException(status_code=503)
+
+    if xml is None:
+        raise HTTPException(status_code=404)
+    headers = {"Cache-Control": "public, max-age=3600"}
+    if isinstance(xml, bytes):
+        return Response(xml, media_type="application/xml", headers=headers)
+    return StreamingResponse(xml, media_type="application/xml", headers=headers)
+
+
+@router.get("/sitemap.xml", include_in_schema=False)
+async def sitemap_xml(request: Request):
+    return await _sitemap_response(request, None)
+
+
+@router.get("/sitemap-{shard:int}.xml", include_in_schema=False)
+async def sitemap_shard_xml(request: Request, shard: int):
+    return await _sitemap_response(request, shard)
+
+
 @router.get("/auth/callback")
 async def auth_callback():
     return HTMLResponse("""
@@ -2029,7 +1976,7 @@ async def get_user(request: Request):
         token = auth_state.get("access_token")
         if not token:
             return JSONResponse({"user": None, "has_premium": False})
-        entitlement = await get_entitlement_state(token)
+        entitlement = await get_entitlement_state(token, user=auth_state.get("user"))
         user = entitlement.get("user")
         if not user:
             return JSONResponse({"user": None, "has_premium": False})
@@ -2078,6 +2025,18 @@ ADMIN_EMAIL = os.getenv("ADMIN_EMAIL")
 SENDER_EMAIL = "bishaldas@budasai.com"
 
 
+def _load_resend():
+    """Import resend on first use; only the contact form sends email."""
+    try:
+        import resend
+    except ImportError:
+        return None
+    from utils.http_clients import ResendHTTPClient
+    resend.api_key = RESEND_API_KEY
+    resend.default_http_client = ResendHTTPClient()
+    return resend
+
+
 @router.post("/contact")
 async def contact(request: Request):
     try:
@@ -2101,27 +2060,44 @@ async def contact(request: Request):
                 status_code=400
             )
 
-        # Rate limiting: Check if this email has submitted in the last 12 hours (twice per day)
+        client_ip = get_client_ip(request)
+
+        # Rate limiting (in-memory sliding window, runs before any database work):
+        # per-IP to stop floods from many addresses, per-email for the 12-hour rule.
+        if not contact_ip_limiter.hit(client_ip):
+            return JSONResponse(
+                {"success": False, "message": "Too many messages from your network. Please try again later."},
+                status_code=429,
+                headers={"Retry-After": str(contact_ip_limiter.retry_after(client_ip))}
+            )
+
+        if not contact_email_limiter.test(email):
+            return JSONResponse(
+                {"success": False, "message": "You've already submitted a message recently. Please wait 12 hours."},
+                status_code=429,
+                headers={"Retry-After": str(contact_email_limiter.retry_after(email))}
+            )
+
+        # Durable 12-hour check (survives restarts); existence only, no row payload.
         from datetime import timedelta
         cutoff_time = (datetime.now() - timedelta(hours=12)).isoformat()
-        
+
         recent_submission = (
             supabase.table("leads")
-            .select("*")
+            .select("id")
             .eq("email", email)
             .gte("created_at", cutoff_time)
+            .limit(1)
             .execute()
         )
 
         if recent_submission.data:
+            contact_email_limiter.hit(email)
             return JSONResponse(
                 {"success": False, "message": "You've already submitted a message recently. Please wait 12 hours."},
                 status_code=429
             )
 
-        # Get client IP for logging
-        client_ip = request.client.host if request.client else "unknown"
-
         # Save to database
         contact_data = {
             "name": name,
@@ -2134,12 +2110,13 @@ async def contact(request: Request):
         result = supabase.table("leads").insert(contact_data).execute()
 
         if result.data:
+            contact_email_limiter.hit(email)
             print(f"✅ Contact form saved: {name} ({email})")
             
             # Send email notification to admin
             try:
-                if RESEND_API_KEY and ADMIN_EMAIL:
-                    resend.api_key = RESEND_API_KEY
+                resend = _load_resend() if RESEND_API_KEY and ADMIN_EMAIL else None
+                if resend:
                     
                     email_params = {
                         "from": SENDER_EMAIL,
@@ -2218,7 +2195,7 @@ async def contact(request: Request):
                     print(f"📧 Confirmation email sent to client: {email}")
                     
                 else:
-                    print("⚠️  Email notification skipped: RESEND_API_KEY or ADMIN_EMAIL not configured")
+                    print("⚠️  Email notification skipped: resend, RESEND_API_KEY or ADMIN_EMAIL not available")
             except Exception as email_error:
                 # Don't fail the request if email fails
                 print(f"❌ Email notification failed: {email_error}")
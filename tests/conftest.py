@@ -0,0 +1,110 @@
+import os
+
+# The app reads its settings at import time, so they are set before `main` is
+# imported. Supabase points at a host that only the in-memory fake answers.
+os.environ.update({
+    "SUPABASE_URL": "http://supabase.test",
+    "SUPABASE_SERVICE_ROLE_KEY": "test-service-key",
+    "SECRET_KEY": "test-secret",
+    "ADMIN_EMAIL_ADDRESS": "admin@test.local",
+    "GOOGLE_SHEET_CSV_URL": "",
+    "RESEND_API_KEY": "",
+    "QUERY_TRACE_ENABLED": "true",
+    "QUERY_TRACE_HEADERS": "true",
+})
+
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from jose import jwt
+
+from loadtest.fake_supabase import FakeSupabase
+from loadtest.seed import user_token
+
+# Seeded users (loadtest/seed.py): even = paid premium, 4k+3 = expired premium,
+# 4k+1 = free.
+USERS = {
+    "anonymous": None,
+    "free": user_token(1),
+    "premium": user_token(2),
+    "expired": user_token(3),
+}
+
+
+class FakeSupabaseTransport(httpx.BaseTransport):
+    """Sync httpx transport that answers Supabase calls from a FakeSupabase app."""
+
+    def __init__(self, fake: FakeSupabase):
+        self.client = TestClient(fake.app(), base_url="http://supabase.test")
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        response = self.client.request(
+            request.method, str(request.url), headers=request.headers, content=request.read(),
+        )
+        return httpx.Response(response.status_code, headers=response.headers, content=response.content)
+
+    def close(self) -> None:
+        self.client.close()
+
+
+@pytest.fixture
+def fake_supabase(monkeypatch):
+    from utils import http_clients
+    from utils.query_trace import TracingTransport
+
+    fake = FakeSupabase(latency_ms=0)
+    client = httpx.Client(transport=TracingTransport(FakeSupabaseTransport(fake)))
+    monkeypatch.setattr(http_clients, "_sync_client", client)
+
+    import database
+    monkeypatch.setattr(database, "_client", None)
+    yield fake
+    client.close()
+
+
+@pytest.fixture
+def traces(monkeypatch):
+    """Every finished request's QueryTrace, in order."""
+    from utils import query_trace
+
+    finished = []
+    end_trace = query_trace.end_trace
+
+    def _keep(token):
+        trace = end_trace(token)
+        finished.append(trace)
+        return trace
+
+    monkeypatch.setattr(query_trace, "end_trace", _keep)
+    return finished
+
+
+@pytest.fixture
+def app_client(fake_supabase, traces):
+    from main import app
+    from routes import pages
+    from utils import (
+        blog_facets, blog_feed, compare_catalog, plan_catalog, signed_urls, site_settings, sitemap, workflows,
+    )
+
+    # Start every test with cold in-process caches.
+    blog_facets.invalidate()
+    blog_feed.invalidate()
+    compare_catalog.invalidate()
+    workflows.invalidate()
+    site_settings.invalidate()
+    plan_catalog.invalidate()
+    signed_urls.clear()
+    pages._workflow_panels.clear()
+    sitemap.invalidate("blogs", "tools", "stories")
+    # No lifespan: warm-up, cache bus and metrics flushing are not under test.
+    return TestClient(app, base_url="http://testserver", follow_redirects=False)
+
+
+@pytest.fixture
+def admin_token():
+    return jwt.encode(
+        {"exp": datetime.utcnow() + timedelta(hours=1)}, os.environ["SECRET_KEY"], algorithm="HS256"
+    )
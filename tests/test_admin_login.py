@@ -0,0 +1,66 @@
+import asyncio
+
+import httpx
+import pytest
+
+import admin_routes
+from utils import rate_limit
+
+ADMIN_EMAIL = "admin@test.local"
+
+
+@pytest.fixture
+def password_check(monkeypatch):
+    rate_limit._storage.reset()
+    result = {"ok": True}
+
+    async def verify(password):
+        return result["ok"]
+
+    monkeypatch.setattr(admin_routes, "verify_password_async", verify)
+    yield result
+    rate_limit._storage.reset()
+
+
+def _login(client):
+    return client.post("/admin/login", data={"email": ADMIN_EMAIL, "password": "secret"})
+
+
+def test_successful_logins_do_not_lock_the_account(app_client, password_check):
+    responses = [_login(app_client) for _ in range(rate_limit.admin_login_account_limiter.limit.amount + 1)]
+
+    assert [response.status_code for response in responses] == [302] * len(responses)
+
+
+def test_failed_logins_lock_the_account(app_client, password_check):
+    password_check["ok"] = False
+    for _ in range(rate_limit.admin_login_account_limiter.limit.amount):
+        assert _login(app_client).status_code == 200
+
+    password_check["ok"] = True
+    locked = _login(app_client)
+
+    assert locked.status_code == 429
+    assert int(locked.headers["retry-after"]) > 0
+
+
+def test_concurrent_wrong_guesses_cannot_pass_the_account_limit(app_client, password_check, monkeypatch):
+    from main import app
+
+    async def slow_wrong(password):
+        await asyncio.sleep(0.05)
+        return False
+
+    monkeypatch.setattr(admin_routes, "verify_password_async", slow_wrong)
+    limit = rate_limit.admin_login_account_limiter.limit.amount
+
+    async def burst():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+            return await asyncio.gather(*[
+                client.post("/admin/login", data={"email": ADMIN_EMAIL, "password": "guess"}) for _ in range(limit + 3)
+            ])
+
+    statuses = sorted(response.status_code for response in asyncio.run(burst()))
+
+    assert statuses == [200] * limit + [429] * 3
@@ -0,0 +1,49 @@
+import xml.etree.ElementTree as ET
+
+from utils import blog_feed
+
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+
+
+def test_rss_lists_newest_published_posts(app_client, fake_supabase):
+    response = app_client.get("/blog/feed.xml")
+
+    assert response.headers["content-type"].startswith("application/rss+xml")
+    items = ET.fromstring(response.content).findall("./channel/item")
+    assert len(items) == min(blog_feed.BLOG_FEED_SIZE, len(fake_supabase.data["blogs"]))
+    newest = max(fake_supabase.data["blogs"], key=lambda blog: blog["date"])
+    assert items[0].findtext("title") == newest["title"]
+
+
+def test_atom_feed_parses(app_client):
+    response = app_client.get("/blog/atom.xml")
+
+    root = ET.fromstring(response.content)
+    assert root.tag == f"{ATOM_NS}feed"
+    assert root.findall(f"{ATOM_NS}entry")
+
+
+def test_conditional_polls_are_free(app_client, traces):
+    first = app_client.get("/blog/feed.xml")
+
+    by_etag = app_client.get("/blog/feed.xml", headers={"If-None-Match": first.headers["etag"]})
+    assert by_etag.status_code == 304
+    assert traces[-1].count == 0
+
+    by_date = app_client.get("/blog/feed.xml", headers={"If-Modified-Since": first.headers["last-modified"]})
+    assert by_date.status_code == 304
+
+
+def test_admin_blog_update_rebuilds_the_feed(app_client, admin_token):
+    first = app_client.get("/blog/feed.xml")
+    app_client.cookies.set("admin_token", admin_token)
+    app_client.post("/admin/blog/update", data={
+        "id": "1", "title": "Fresh feed entry", "slug": "fresh", "category": "Coding",
+        "image_url": "/static/images/blog/1.jpg", "excerpt": "x", "date": "2030-01-01",
+        "html_content": "<p>x</p>", "is_published": "true",
+    })
+
+    second = app_client.get("/blog/feed.xml", headers={"If-None-Match": first.headers["etag"]})
+
+    assert second.status_code == 200
+    assert ET.fromstring(second.content).findtext("./channel/item/title") == "Fresh feed entry"
@@ -0,0 +1,136 @@
+import httpx
+import pytest
+
+from utils import circuit_breaker
+from utils.circuit_breaker import BreakerTransport, CircuitOpenError
+
+BLOGS_URL = f"http://{circuit_breaker.SUPABASE_HOST}/rest/v1/blogs?select=id"
+
+
+class Upstream:
+    """A Supabase stand-in that can be switched between healthy and failing."""
+
+    def __init__(self):
+        self.healthy = True
+        self.calls = 0
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        if not self.healthy:
+            return httpx.Response(503, json={"message": "upstream down"})
+        return httpx.Response(200, json=[{"id": self.calls}])
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    monkeypatch.setattr(circuit_breaker, "BREAKER_ENABLED", True)
+    monkeypatch.setattr(circuit_breaker, "breaker", circuit_breaker.CircuitBreaker("test"))
+    monkeypatch.setattr(circuit_breaker, "last_good", circuit_breaker._LastGoodStore())
+    return Upstream()
+
+
+@pytest.fixture
+def client(upstream):
+    with httpx.Client(transport=BreakerTransport(httpx.MockTransport(upstream))) as client:
+        yield client
+
+
+def _trip(client, upstream):
+    upstream.healthy = False
+    while circuit_breaker.breaker.state != circuit_breaker.OPEN:
+        client.get(f"http://{circuit_breaker.SUPABASE_HOST}/rest/v1/failing")
+
+
+def test_opens_after_min_calls_failures(client, upstream):
+    upstream.healthy = False
+    for _ in range(circuit_breaker.BREAKER_MIN_CALLS - 1):
+        assert client.get(BLOGS_URL).status_code == 503
+    assert circuit_breaker.breaker.state == circuit_breaker.CLOSED
+
+    client.get(BLOGS_URL)
+
+    assert circuit_breaker.breaker.state == circuit_breaker.OPEN
+    assert upstream.calls == circuit_breaker.BREAKER_MIN_CALLS
+
+
+def test_open_circuit_replays_the_last_good_read(client, upstream):
+    good = client.get(BLOGS_URL)
+    _trip(client, upstream)
+    calls = upstream.calls
+
+    stale = client.get(BLOGS_URL)
+
+    assert stale.status_code == 200
+    assert stale.json() == good.json()
+    assert stale.headers["X-Served-Stale"].endswith("s")
+    assert upstream.calls == calls
+
+
+def test_open_circuit_refuses_uncached_reads_and_writes(client, upstream):
+    client.get(BLOGS_URL)
+    _trip(client, upstream)
+    calls = upstream.calls
+
+    with pytest.raises(CircuitOpenError):
+        client.get(f"http://{circuit_breaker.SUPABASE_HOST}/rest/v1/blogs?select=title")
+    with pytest.raises(CircuitOpenError):
+        client.post(BLOGS_URL, json={"title": "new"})
+    assert upstream.calls == calls
+
+
+def test_one_half_open_probe_closes_the_circuit(client, upstream, monkeypatch):
+    _trip(client, upstream)
+    monkeypatch.setattr(circuit_breaker, "BREAKER_OPEN_SECONDS", 0)
+    upstream.healthy = True
+    calls = upstream.calls
+
+    assert client.get(BLOGS_URL).status_code == 200
+
+    assert upstream.calls == calls + 1
+    assert circuit_breaker.breaker.state == circuit_breaker.CLOSED
+
+
+def test_half_open_lets_only_one_probe_through(upstream, monkeypatch):
+    breaker = circuit_breaker.breaker
+    monkeypatch.setattr(circuit_breaker, "BREAKER_OPEN_SECONDS", 0)
+    breaker._open("test")
+
+    assert breaker.allow()
+    assert not breaker.allow()
+    assert breaker.state == circuit_breaker.HALF_OPEN
+
+
+def test_failed_probe_opens_the_circuit_again(client, upstream, monkeypatch):
+    _trip(client, upstream)
+    monkeypatch.setattr(circuit_breaker, "BREAKER_OPEN_SECONDS", 0)
+    calls = upstream.calls
+
+    assert client.get(BLOGS_URL).status_code == 503
+
+    assert upstream.calls == calls + 1
+    assert circuit_breaker.breaker.state == circuit_breaker.OPEN
+
+
+def test_other_hosts_are_not_guarded(client, upstream):
+    _trip(client, upstream)
+    upstream.healthy = True
+
+    assert client.get("http://resend.test/emails").status_code == 200
+
+
+def test_last_good_store_keeps_under_the_total_byte_budget(upstream, monkeypatch):
+    monkeypatch.setattr(circuit_breaker, "LAST_GOOD_MAX_BYTES", 100)
+    monkeypatch.setattr(circuit_breaker, "LAST_GOOD_MAX_TOTAL_BYTES", 200)
+    store = circuit_breaker.last_good
+    request = httpx.Request("GET", BLOGS_URL)
+
+    store.save("big", httpx.Response(200, content=b"x" * 101))
+    for key in ("a", "b", "c"):
+        store.save(key, httpx.Response(200, content=b"x" * 80))
+    store.replay("b", request)  # b is now the most recently used
+    store.save("d", httpx.Response(200, content=b"x" * 80))
+
+    assert store.replay("big", request) is None
+    assert store.replay("a", request) is None and store.replay("c", request) is None
+    assert store.replay("b", request) is not None and store.replay("d", request) is not None
+    assert store.total_bytes == 160
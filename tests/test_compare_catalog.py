@@ -0,0 +1,68 @@
+import json
+import re
+
+from conftest import USERS
+from utils import compare_catalog
+
+LINK_RE = re.compile(r'data-src="/premium/compare\.json\?v=(\w+)"')
+
+
+def _linked_version(html: str) -> str:
+    return LINK_RE.search(html).group(1)
+
+
+def test_warm_premium_render_reuses_the_catalog(app_client, traces):
+    app_client.cookies.set("sb-access-token", USERS["premium"])
+    first = app_client.get("/premium")
+    second = app_client.get("/premium")
+
+    assert _linked_version(first.text) == _linked_version(second.text)
+    assert "compare-tools-json" not in first.text
+    assert "ai_tools" in [call["table"] for call in traces[-2].calls]
+    assert "ai_tools" not in [call["table"] for call in traces[-1].calls]
+
+
+def test_premium_links_the_versioned_compare_json(app_client):
+    app_client.cookies.set("sb-access-token", USERS["premium"])
+    version = _linked_version(app_client.get("/premium").text)
+
+    response = app_client.get(f"/premium/compare.json?v={version}")
+
+    assert response.json() == json.loads(compare_catalog.get_catalog().payload)
+    assert response.headers["etag"] == f'"{version}"'
+    assert "immutable" in response.headers["cache-control"]
+    revalidated = app_client.get("/premium/compare.json", headers={"If-None-Match": response.headers["etag"]})
+    assert revalidated.status_code == 304
+
+
+def test_compare_json_is_premium_only(app_client):
+    app_client.cookies.set("sb-access-token", USERS["free"])
+    assert app_client.get("/premium/compare.json").status_code == 403
+
+
+def test_admin_tool_update_changes_the_version(app_client, admin_token, fake_supabase):
+    app_client.cookies.set("sb-access-token", USERS["premium"])
+    before = app_client.get("/premium/compare.json")
+    tool = fake_supabase.data["ai_tools"][0]
+
+    app_client.cookies.set("admin_token", admin_token)
+    app_client.post("/admin/aitool/update", data={"id": str(tool["id"]), "name": "Renamed Tool", "is_active": "true"})
+    after = app_client.get("/premium/compare.json", headers={"If-None-Match": before.headers["etag"]})
+
+    assert after.status_code == 200
+    assert after.headers["etag"] != before.headers["etag"]
+    assert "renamed-tool" in after.json()
+
+
+def test_payload_is_safe_to_embed_in_a_script_tag():
+    catalog = compare_catalog.from_rows([{"id": 1, "name": "Evil", "best_for": "</script><script>alert(1)"}])
+
+    assert b"</script" not in catalog.payload
+    assert json.loads(catalog.payload)["evil"]["tagline"] == "</script><script>alert(1)"
+
+
+def test_no_tools_falls_back_to_a_placeholder_column():
+    catalog = compare_catalog.from_rows([])
+
+    assert catalog.tools == []
+    assert catalog.default_slugs == ["claude"]
@@ -0,0 +1,66 @@
+import threading
+
+from conftest import USERS
+from utils import signed_urls
+
+
+def _tables(trace) -> list[str]:
+    return [call["table"] for call in trace.calls]
+
+
+def test_signed_url_is_shared_across_users(app_client, traces):
+    app_client.cookies.set("sb-access-token", USERS["free"])
+    first = app_client.get("/download-guide")
+    app_client.cookies.set("sb-access-token", USERS["premium"])
+    second = app_client.get("/download-guide")
+
+    assert first.status_code == second.status_code == 303
+    assert first.headers["location"] == second.headers["location"]
+    assert "storage:object/sign/PDFs/guide.pdf" in _tables(traces[-2])
+    assert _tables(traces[-1]) == ["auth:user"]
+
+
+def test_signed_url_is_renewed_before_it_expires(app_client, traces, monkeypatch):
+    app_client.cookies.set("sb-access-token", USERS["free"])
+    app_client.get("/download-guide")
+
+    now = signed_urls.time.monotonic()
+    reuse_for = signed_urls.SIGNED_URL_TTL - signed_urls.SIGNED_URL_REFRESH_MARGIN
+    monkeypatch.setattr(signed_urls.time, "monotonic", lambda: now + reuse_for + 1)
+    app_client.get("/download-guide")
+
+    assert "storage:object/sign/PDFs/guide.pdf" in _tables(traces[-1])
+
+
+def test_settings_update_switches_the_guide(app_client, admin_token, traces):
+    app_client.cookies.set("sb-access-token", USERS["free"])
+    app_client.get("/download-guide")
+
+    app_client.cookies.set("admin_token", admin_token)
+    app_client.post("/admin/settings/update", data={"free_pdf_filename": "new-guide.pdf"})
+    response = app_client.get("/download-guide")
+
+    assert "new-guide.pdf" in response.headers["location"]
+    assert "site_settings" in _tables(traces[-1])
+
+
+def test_slow_signing_does_not_block_other_objects(monkeypatch):
+    release = threading.Event()
+
+    class Bucket:
+        def create_signed_url(self, path, ttl):
+            if path == "slow.pdf":
+                release.wait(5)
+            return {"signedURL": f"https://signed.test/{path}"}
+
+    monkeypatch.setattr(signed_urls.supabase.storage, "from_", lambda bucket: Bucket())
+    signed_urls.clear()
+    slow = threading.Thread(target=signed_urls.get_signed_url, args=("PDFs", "slow.pdf"))
+    slow.start()
+    try:
+        assert signed_urls.get_signed_url("PDFs", "fast.pdf") == "https://signed.test/fast.pdf"
+        assert slow.is_alive()
+    finally:
+        release.set()
+        slow.join()
+        signed_urls.clear()
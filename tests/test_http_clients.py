@@ -0,0 +1,19 @@
+import asyncio
+
+import httpx
+
+import database
+from conftest import FakeSupabaseTransport
+from utils import http_clients
+
+
+def test_supabase_client_survives_a_pool_restart(fake_supabase, monkeypatch):
+    before = database.get_supabase()
+
+    asyncio.run(http_clients.close_clients())
+    reopened = httpx.Client(transport=FakeSupabaseTransport(fake_supabase))
+    monkeypatch.setattr(http_clients, "_sync_client", reopened)
+
+    assert database.get_supabase() is not before
+    assert database.supabase.table("blogs").select("id").execute().data
+    reopened.close()
@@ -0,0 +1,45 @@
+import pytest
+from fastapi.testclient import TestClient
+from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
+
+import launcher
+from utils import metrics
+
+
+def _client(peer: str) -> TestClient:
+    # The same proxy header handling launcher.py gives uvicorn.
+    from main import app
+
+    proxied = ProxyHeadersMiddleware(app, trusted_hosts=launcher.FORWARDED_ALLOW_IPS)
+    return TestClient(proxied, base_url="http://testserver", client=(peer, 50000))
+
+
+@pytest.fixture
+def no_token(monkeypatch):
+    monkeypatch.setattr(metrics, "METRICS_TOKEN", "")
+    monkeypatch.delenv("RAILWAY_ENVIRONMENT", raising=False)
+
+
+def test_loopback_clients_are_allowed_only_in_local_development(no_token, monkeypatch):
+    client = _client("127.0.0.1")
+    assert client.get("/internal/metrics").status_code == 200
+
+    monkeypatch.setenv("RAILWAY_ENVIRONMENT", "production")
+    assert client.get("/internal/metrics").status_code == 404
+
+
+def test_spoofed_forwarded_for_is_refused(no_token):
+    client = _client("203.0.113.7")
+
+    response = client.get("/internal/metrics", headers={"X-Forwarded-For": "127.0.0.1"})
+
+    assert response.status_code == 404
+
+
+def test_metrics_need_the_bearer_token(monkeypatch):
+    monkeypatch.setattr(metrics, "METRICS_TOKEN", "scrape-me")
+    client = _client("203.0.113.7")
+
+    assert client.get("/internal/metrics").status_code == 404
+    assert client.get("/internal/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 404
+    assert client.get("/internal/metrics", headers={"Authorization": "Bearer scrape-me"}).status_code == 200
@@ -0,0 +1,49 @@
+from conftest import USERS
+from loadtest.seed import PREMIUM_PLAN_ID
+from utils import plan_catalog
+
+
+def _tables(trace) -> list[str]:
+    return [call["table"] for call in trace.calls]
+
+
+def test_pages_share_one_catalog_load(app_client, traces):
+    app_client.get("/products")
+    app_client.cookies.set("sb-access-token", USERS["free"])
+    app_client.get("/premium")
+    app_client.get("/profile")
+    app_client.get(f"/plan-action/{PREMIUM_PLAN_ID}")
+
+    loads = [trace for trace in traces if "pricing_plans" in _tables(trace)]
+    assert [trace.label for trace in loads] == ["GET /products"]
+
+
+def test_checkout_click_reads_no_plans(app_client, fake_supabase, traces):
+    app_client.cookies.set("sb-access-token", USERS["free"])
+    app_client.get(f"/plan-action/{PREMIUM_PLAN_ID}")
+    response = app_client.get(f"/plan-action/{PREMIUM_PLAN_ID}")
+
+    plan = next(row for row in fake_supabase.data["pricing_plans"] if row["id"] == PREMIUM_PLAN_ID)
+    assert response.headers["location"] == (plan.get("button_url") or "/products")
+    assert "pricing_plans" not in _tables(traces[-1])
+
+
+def test_admin_pricing_update_reaches_the_pages(app_client, admin_token, fake_supabase):
+    app_client.get("/products")
+    plan = next(row for row in fake_supabase.data["pricing_plans"] if row["id"] == PREMIUM_PLAN_ID)
+
+    app_client.cookies.set("admin_token", admin_token)
+    app_client.post("/admin/api/pricing-plan/update", json={
+        **plan, "plan_heading": "Workflow Vault Pro", "is_active": True,
+    })
+
+    assert "Workflow Vault Pro" in app_client.get("/products").text
+
+
+def test_callers_get_copies():
+    catalog = plan_catalog.PlanCatalog([{"id": "a", "plan_heading": "Free", "features_list_1": ["x"], "is_active": True}])
+
+    catalog.plans()[0]["price_display"] = "₹0"
+    catalog.get("a")["features_list_1"].append("y")
+
+    assert catalog.get("a") == {"id": "a", "plan_heading": "Free", "features_list_1": ["x"], "is_active": True}
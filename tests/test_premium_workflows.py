@@ -0,0 +1,104 @@
+from conftest import USERS
+
+
+def _tables(trace) -> list[str]:
+    return [call["table"] for call in trace.calls]
+
+
+def test_premium_page_renders_only_the_initial_tool(app_client, fake_supabase):
+    app_client.cookies.set("sb-access-token", USERS["premium"])
+    html = app_client.get("/premium").text
+
+    first, second = fake_supabase.data["premium_workflows"][0], fake_supabase.data["premium_workflows"][3]
+    assert first["tool"] != second["tool"]
+    assert html.count('class="tool-data') == 1
+    assert first["panel_title"] in html
+    assert second["panel_title"] not in html
+
+
+def test_workflow_api_returns_one_tool_tab(app_client, fake_supabase, traces):
+    workflow = next(row for row in fake_supabase.data["premium_workflows"] if row["tab"] == "instagram")
+    app_client.cookies.set("sb-access-token", USERS["premium"])
+
+    response = app_client.get(f"/premium/workflow/{workflow['tool']}/instagram")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert set(body) == {"tool", "tab", "html"}
+    assert 'data-tab="instagram"' in body["html"] and workflow["panel_title"] in body["html"]
+    assert "9 steps" in body["html"]
+
+    again = app_client.get(
+        f"/premium/workflow/{workflow['tool']}/instagram", headers={"If-None-Match": response.headers["etag"]}
+    )
+    assert again.status_code == 304
+    assert "premium_workflows" not in _tables(traces[-1])
+
+
+def test_tool_without_workflows_gets_the_empty_panel(app_client, fake_supabase):
+    with_workflows = {row["tool"] for row in fake_supabase.data["premium_workflows"]}
+    tool = next(row for row in fake_supabase.data["ai_tools"] if row["name"].lower() not in with_workflows)
+    app_client.cookies.set("sb-access-token", USERS["premium"])
+
+    body = app_client.get(f"/premium/workflow/{tool['name'].lower()}/youtube").json()
+
+    assert "Data Not Updated Yet" in body["html"]
+
+
+def test_workflow_api_rejects_non_premium_and_unknown_paths(app_client, fake_supabase):
+    tool = fake_supabase.data["premium_workflows"][0]["tool"]
+    app_client.cookies.set("sb-access-token", USERS["expired"])
+    assert app_client.get(f"/premium/workflow/{tool}/youtube").status_code == 403
+
+    app_client.cookies.set("sb-access-token", USERS["premium"])
+    assert app_client.get(f"/premium/workflow/{tool}/tiktok").status_code == 404
+    assert app_client.get("/premium/workflow/no-such-tool/youtube").status_code == 404
+
+
+def test_admin_workflow_save_serves_the_new_version(app_client, admin_token, fake_supabase):
+    workflow = fake_supabase.data["premium_workflows"][1]
+    path = f"/premium/workflow/{workflow['tool']}/{workflow['tab']}"
+    app_client.cookies.set("sb-access-token", USERS["premium"])
+    before = app_client.get(path)
+
+    app_client.cookies.set("admin_token", admin_token)
+    saved = app_client.post("/admin/workflow/save", json={
+        "tool": workflow["tool"], "tab": workflow["tab"], "panel_title": "Rewritten workflow",
+    })
+    after = app_client.get(path, headers={"If-None-Match": before.headers["etag"]})
+
+    assert saved.json()["success"]
+    assert after.status_code == 200
+    assert "Rewritten workflow" in after.json()["html"]
+
+
+def test_warm_requests_read_the_snapshot(app_client, fake_supabase, traces):
+    app_client.cookies.set("sb-access-token", USERS["premium"])
+    app_client.get("/premium")
+    workflow = fake_supabase.data["premium_workflows"][4]
+
+    app_client.get("/premium")
+    assert "premium_workflows" not in _tables(traces[-1])
+    app_client.get(f"/premium/workflow/{workflow['tool']}/{workflow['tab']}")
+    assert "premium_workflows" not in _tables(traces[-1])
+
+
+def test_save_reassembles_only_the_changed_workflow(app_client, admin_token, fake_supabase, traces):
+    app_client.cookies.set("sb-access-token", USERS["premium"])
+    app_client.get("/premium")
+    workflow = fake_supabase.data["premium_workflows"][2]
+
+    app_client.cookies.set("admin_token", admin_token)
+    app_client.post("/admin/workflow/save", json={"tool": workflow["tool"], "tab": workflow["tab"]})
+    app_client.get("/premium")
+
+    refetch = [call for call in traces[-1].calls if call["table"] == "premium_workflows"][-1]
+    assert refetch["rows"] == 1
+
+
+def test_cold_build_reads_workflows_without_an_id_filter(app_client, traces):
+    app_client.cookies.set("sb-access-token", USERS["premium"])
+    app_client.get("/premium")
+
+    embedded = [call for call in traces[-1].calls if call["table"] == "premium_workflows"][-1]
+    assert not any(f.startswith("id=") for f in embedded["filters"])
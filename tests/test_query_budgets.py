@@ -0,0 +1,238 @@
+"""
+Query budgets for every route in routes/pages.py and admin_routes.py.
+
+Each route is rendered against the in-memory fake Supabase (loadtest/seed.py
+data) as a logged-out, free, premium and expired-premium user, and the
+request's QueryTrace must stay within its budget:
+
+    queries   Supabase calls (PostgREST, auth and storage) per request
+    rows      rows returned by PostgREST, summed over the request
+
+Budgets are today's numbers. A change that adds a query or widens a read fails
+here; a change that removes one should lower the budget in the same commit.
+"""
+import time
+
+import pytest
+
+from conftest import USERS
+from loadtest.seed import PREMIUM_PLAN_ID
+
+# Wall time per request against the zero-latency fake: template rendering and
+# Python work only. Loose on purpose so slow CI machines do not flake.
+RENDER_BUDGET_MS = 1500
+
+ALL_USERS = tuple(USERS)
+
+
+def budget(queries: int, rows: int = 0, users=ALL_USERS) -> dict:
+    return {user: (queries, rows) for user in users}
+
+
+# path -> {user: (max queries, max rows)}
+PAGE_BUDGETS = {
+    "/": budget(1, 10),
+    "/products": budget(1, 3),
+    "/product-detail": budget(0),
+    "/premium": {
+        # A cold plan catalog reads every plan (3 rows), not just the premium one.
+        "anonymous": (2, 13),
+        "free": (7, 15),
+        # Cold caches: the tool catalog, then the workflow snapshot (versions, then every workflow).
+        "premium": (6, 42),
+        "expired": (5, 15),
+    },
+    "/profile": {
+        "anonymous": (0, 0),
+        "free": (7, 6),
+        "premium": (5, 8),
+        "expired": (5, 6),
+    },
+    f"/plan-action/{PREMIUM_PLAN_ID}": {
+        "anonymous": (0, 0),
+        **budget(2, 3, users=("free", "premium", "expired")),
+    },
+    "/admin": budget(0),
+    "/about": budget(1, 10),
+    "/download-guide": {
+        "anonymous": (0, 0),
+        **budget(3, 1, users=("free", "premium", "expired")),
+    },
+    "/story": budget(1, 12),
+    "/ai-tools": budget(1, 10),
+    "/ai-tool-chatgpt": budget(4, 22),
+    # Cold: facet index (id, category, date of every post) plus the page's posts.
+    "/blog": budget(2, 44),
+    "/blog?category=coding&page=2": budget(2, 44),
+    "/blog/1": budget(1, 1),
+    "/blog/1/prompt-workflow-research-sales-strategy-prompt-growth": budget(1, 1),
+    "/search?q=workflow+autom": budget(0),
+    "/api/search?q=chat&type=tool": budget(0),
+    # Cold: facet index plus the newest BLOG_FEED_SIZE posts; then served from cache.
+    "/blog/feed.xml": budget(2, 60),
+    "/blog/atom.xml": budget(2, 60),
+    # Cold: blogs, ai_tools and stories once; then served from cache.
+    "/sitemap.xml": budget(3, 62),
+    "/auth/callback": budget(0),
+    "/get-user": {
+        "anonymous": (0, 0),
+        "free": (5, 2),
+        "premium": (3, 2),
+        "expired": (3, 2),
+    },
+    "/logout": budget(0),
+    "/term-condition": budget(0),
+    "/ads.txt": budget(0),
+}
+
+ADMIN_SECTIONS = {
+    "blogs": 25,
+    "stories": 12,
+    "ai_tools": 10,
+    "use_cases": 25,
+    "faqs": 25,
+    "pricing_plans": 3,
+    "user_profiles": 20,
+    "billing_records": 25,
+}
+
+# path -> (max queries, max rows), requested with a valid admin_token cookie
+ADMIN_BUDGETS = {
+    "/admin/login": (0, 0),
+    "/admin/dashboard": (1, 1),
+    "/admin/api/outbound-stats": (0, 0),
+    "/admin/workflows": (0, 0),
+    "/admin/workflow/load?tool=chatgpt&tab=youtube": (1, 1),
+    f"/admin/api/pricing-plan/{PREMIUM_PLAN_ID}": (1, 3),
+    "/admin/api/sections/blogs/1": (1, 1),
+    "/admin/logout": (0, 0),
+    **{f"/admin/api/sections/{section}": (1, rows) for section, rows in ADMIN_SECTIONS.items()},
+}
+
+
+def _check(trace, elapsed_ms: float, max_queries: int, max_rows: int) -> None:
+    rows = sum(call["rows"] or 0 for call in trace.calls)
+    assert trace.count <= max_queries, f"{trace.count} queries > {max_queries}\n{trace.report()}"
+    assert rows <= max_rows, f"{rows} rows > {max_rows}\n{trace.report()}"
+    assert not trace.n_plus_one(), trace.report()
+    assert elapsed_ms <= RENDER_BUDGET_MS, f"{elapsed_ms:.0f}ms > {RENDER_BUDGET_MS}ms"
+
+
+PAGE_CASES = [
+    pytest.param(path, user, limits, id=f"{path} [{user}]")
+    for path, by_user in PAGE_BUDGETS.items()
+    for user, limits in by_user.items()
+]
+
+
+@pytest.mark.parametrize("path,user,limits", PAGE_CASES)
+def test_page_query_budget(app_client, traces, path, user, limits):
+    if USERS[user]:
+        app_client.cookies.set("sb-access-token", USERS[user])
+
+    started = time.perf_counter()
+    response = app_client.get(path)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    assert response.status_code < 500
+    _check(traces[-1], elapsed_ms, *limits)
+
+
+@pytest.mark.parametrize("path,limits", list(ADMIN_BUDGETS.items()), ids=list(ADMIN_BUDGETS))
+def test_admin_query_budget(app_client, traces, admin_token, path, limits):
+    app_client.cookies.set("admin_token", admin_token)
+
+    started = time.perf_counter()
+    response = app_client.get(path)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    assert response.status_code < 500
+    _check(traces[-1], elapsed_ms, *limits)
+
+
+def test_blog_reads_only_the_page_once_facets_are_loaded(app_client, traces, fake_supabase):
+    app_client.get("/blog")
+    response = app_client.get("/blog?category=Coding&page=2")
+
+    coding = [blog for blog in fake_supabase.data["blogs"] if blog["category"] == "Coding"]
+    assert f"Coding ({len(coding)})" in response.text
+    _check(traces[-1], 0, 1, 4)
+
+
+def test_contact_query_budget(app_client, traces):
+    response = app_client.post("/contact", data={
+        "name": "Budget Test",
+        "email": "budget@test.local",
+        "business_type": "Agency",
+        "message": "Hello",
+    })
+
+    assert response.status_code < 500
+    _check(traces[-1], 0, 2, 0)
+
+
+@pytest.mark.parametrize("user", ["free", "premium"])
+def test_set_auth_token_query_budget(app_client, traces, user):
+    response = app_client.post("/set-auth-token", json={"accessToken": USERS[user], "refreshToken": USERS[user]})
+
+    assert response.status_code == 200
+    _check(traces[-1], 0, 3, 1)
+
+
+def test_profile_update_query_budget(app_client, traces):
+    app_client.cookies.set("sb-access-token", USERS["free"])
+    response = app_client.post("/profile/update", json={
+        "first_name": "Budget",
+        "last_name": "Test",
+        "phone": "",
+        "date_of_birth": "",
+        "role": "Tester",
+    })
+
+    assert response.status_code < 500
+    _check(traces[-1], 0, 3, 1)
+
+
+def test_admin_blog_update_query_budget(app_client, traces, admin_token):
+    app_client.cookies.set("admin_token", admin_token)
+    response = app_client.post("/admin/blog/update", data={
+        "id": "1",
+        "title": "Updated",
+        "slug": "updated",
+        "category": "Coding",
+        "image_url": "/static/images/blog/1.jpg",
+        "excerpt": "Updated excerpt",
+        "date": "2026-01-01",
+        "html_content": "<p>Updated</p>",
+        "is_published": "true",
+    })
+
+    assert response.status_code < 500
+    _check(traces[-1], 0, 1, 1)
+
+
+def test_admin_settings_update_query_budget(app_client, traces, admin_token):
+    app_client.cookies.set("admin_token", admin_token)
+    response = app_client.post("/admin/settings/update", data={"free_pdf_filename": "guide-v2.pdf"})
+
+    assert response.status_code < 500
+    _check(traces[-1], 0, 1, 1)
+
+
+def test_budget_catches_an_extra_auth_lookup(app_client, traces, monkeypatch):
+    """The tier's point: one more get_user on /get-user must fail the budget."""
+    from routes import pages
+
+    get_entitlement_state = pages.get_entitlement_state
+
+    async def _with_extra_lookup(token, *args, **kwargs):
+        await pages.asyncio.to_thread(pages.supabase.auth.get_user, token)
+        return await get_entitlement_state(token, *args, **kwargs)
+
+    monkeypatch.setattr(pages, "get_entitlement_state", _with_extra_lookup)
+    app_client.cookies.set("sb-access-token", USERS["premium"])
+    app_client.get("/get-user")
+
+    max_queries, max_rows = PAGE_BUDGETS["/get-user"]["premium"]
+    with pytest.raises(AssertionError):
+        _check(traces[-1], 0, max_queries, max_rows)
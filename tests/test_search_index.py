@@ -0,0 +1,110 @@
+import time
+
+import pytest
+
+from utils import cache_bus, search_index
+from utils.search_index import BLOG, TOOL, SearchIndex
+
+
+def _built_index() -> SearchIndex:
+    index = SearchIndex()
+    index.replace_kind(BLOG, search_index._load_blogs())
+    index.replace_kind(TOOL, search_index._load_tools())
+    return index
+
+
+def test_title_match_ranks_first(fake_supabase):
+    blog = fake_supabase.data["blogs"][4]
+    blog["title"] = "Midjourney prompt cookbook for product photos"
+    index = _built_index()
+
+    results = index.search("product photos midjourney", kind=BLOG)
+
+    assert results[0]["id"] == blog["id"]
+
+
+def test_prefix_matching(fake_supabase):
+    index = _built_index()
+
+    assert [result["title"] for result in index.search("perplex", kind=TOOL)][:1] == ["Perplexity"]
+    assert index.search("autom", kind=BLOG)
+
+
+def test_reindex_only_touches_changed_documents(fake_supabase):
+    index = _built_index()
+    documents = search_index._load_blogs()
+
+    assert index.replace_kind(BLOG, documents) == (0, 0)
+
+    documents[0] = {**documents[0], "title": "Zebra onboarding checklist"}
+    assert index.replace_kind(BLOG, documents[:-1]) == (1, 1)
+    assert index.search("zebra")[0]["id"] == documents[0]["fields"]["id"]
+
+
+def test_queries_stay_under_ten_ms(fake_supabase):
+    index = _built_index()
+
+    started = time.perf_counter()
+    for query in ("ai workflow", "prompt research", "auto", "chatgpt pricing", "design tool"):
+        index.search(query)
+    assert (time.perf_counter() - started) * 1000 / 5 < 10
+
+
+@pytest.fixture
+def live_index(fake_supabase, monkeypatch):
+    monkeypatch.setattr(search_index, "_index", SearchIndex())
+    monkeypatch.setattr(search_index, "_loaded", set())
+    loads = []
+    for kind, loader in list(search_index._LOADERS.items()):
+        def recording(ids=None, kind=kind, loader=loader):
+            loads.append((kind, ids))
+            return loader(ids)
+        monkeypatch.setitem(search_index._LOADERS, kind, recording)
+    search_index.refresh()
+    _drain()
+    loads.clear()
+    return loads
+
+
+def _drain():
+    worker = search_index._worker
+    if worker is not None:
+        worker.join(5)
+
+
+def test_keyed_blog_event_refetches_only_that_blog(live_index, fake_supabase):
+    blog, other = fake_supabase.data["blogs"][3], fake_supabase.data["blogs"][5]
+    blog["title"] = "Zebra onboarding checklist"
+    other["is_published"] = other["is_publish"] = False
+
+    cache_bus._apply(cache_bus.BLOGS, blog["id"])
+    _drain()
+
+    assert live_index == [(BLOG, {blog["id"]})]
+    assert search_index.search("zebra")[0]["id"] == blog["id"]
+    assert f"{BLOG}:{other['id']}" in search_index._index.docs
+
+    cache_bus._apply(cache_bus.BLOGS, other["id"])
+    _drain()
+    assert f"{BLOG}:{other['id']}" not in search_index._index.docs
+
+
+def test_unkeyed_event_reloads_the_whole_kind(live_index):
+    cache_bus._apply(cache_bus.AI_TOOLS, None)
+    _drain()
+
+    assert live_index == [(TOOL, None)]
+
+
+def test_blog_update_publishes_the_blog_id(app_client, admin_token, fake_supabase, monkeypatch):
+    published = []
+    monkeypatch.setattr(cache_bus, "publish", lambda kind, key=None: published.append((kind, key)))
+    blog = fake_supabase.data["blogs"][0]
+
+    app_client.cookies.set("admin_token", admin_token)
+    app_client.post("/admin/blog/update", data={
+        "id": str(blog["id"]), "title": "New title", "slug": blog["slug"], "category": blog["category"],
+        "image_url": blog["image_url"], "excerpt": blog["excerpt"], "date": blog["date"],
+    })
+
+    assert published == [(cache_bus.BLOGS, blog["id"])]
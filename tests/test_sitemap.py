@@ -0,0 +1,48 @@
+import re
+
+from utils import sitemap
+
+
+def _locs(xml: str) -> list[str]:
+    return re.findall(r"<loc>([^<]+)</loc>", xml)
+
+
+def test_sitemap_lists_pages_blogs_and_tools(app_client, traces, fake_supabase):
+    response = app_client.get("/sitemap.xml")
+
+    assert response.headers["content-type"] == "application/xml"
+    locs = _locs(response.text)
+    assert "http://testserver/ai-tool-chatgpt" in locs
+    assert "http://testserver/blog" in locs
+    assert sum("/blog/" in loc for loc in locs) == len(fake_supabase.data["blogs"])
+    assert "<lastmod>" in response.text
+
+    app_client.get("/sitemap.xml")
+    assert traces[-1].count == 0
+
+
+def test_admin_write_reloads_only_that_source(app_client, traces, admin_token):
+    app_client.get("/sitemap.xml")
+    app_client.cookies.set("admin_token", admin_token)
+    app_client.post("/admin/blog/update", data={
+        "id": "1", "title": "Renamed post", "slug": "renamed", "category": "Coding",
+        "image_url": "/static/images/blog/1.jpg", "excerpt": "x", "date": "2026-01-01",
+        "html_content": "<p>x</p>", "is_published": "true",
+    })
+
+    response = app_client.get("/sitemap.xml")
+
+    assert "http://testserver/blog/1/renamed-post" in _locs(response.text)
+    assert [call["table"] for call in traces[-1].calls] == ["blogs"]
+
+
+def test_sitemap_index_past_the_url_limit(app_client, monkeypatch):
+    monkeypatch.setattr(sitemap, "SITEMAP_MAX_URLS", 20)
+
+    index = app_client.get("/sitemap.xml").text
+    shards = _locs(index)
+
+    assert "<sitemapindex" in index
+    assert shards == [f"http://testserver/sitemap-{n}.xml" for n in range(1, len(shards) + 1)]
+    assert len(_locs(app_client.get("/sitemap-1.xml").text)) == 20
+    assert app_client.get(f"/sitemap-{len(shards) + 1}.xml").status_code == 404
@@ -0,0 +1,101 @@
+import math
+import os
+import threading
+import time
+from dotenv import load_dotenv
+
+from database import supabase
+from utils import cache_bus
+
+load_dotenv()
+
+# Category facets for /blog: category -> published post ids (newest first) and
+# counts. Built from a narrow projection of the blogs table (no html_content)
+# and rebuilt when an admin blog write lands on any worker (utils.cache_bus),
+# so /blog only fetches the rows of the page it shows.
+BLOG_FACETS_TTL = float(os.getenv("BLOG_FACETS_TTL", "300"))
+
+ALL = "all"
+
+# Older tables have is_publish instead of is_published (see admin blog create).
+# The first projection that the table accepts is remembered.
+_PUBLISHED_COLUMNS = ("is_published,is_publish", "is_published", "is_publish")
+_published_choice = 0
+
+_lock = threading.Lock()
+_facets = None
+
+
+class BlogFacets:
+    def __init__(self, rows: list[dict]):
+        published = [row for row in rows if row.get("is_published") or row.get("is_publish")]
+        # Same order as the /blog query (date desc); id breaks ties.
+        published.sort(key=lambda row: (str(row.get("date") or ""), row.get("id") or 0), reverse=True)
+
+        self.ids: dict[str, list] = {ALL: []}
+        self.labels: dict[str, str] = {}
+        for row in published:
+            label = str(row.get("category") or "").strip()
+            key = label.lower()
+            self.ids[ALL].append(row["id"])
+            if key:
+                self.ids.setdefault(key, []).append(row["id"])
+                self.labels.setdefault(key, label)
+        self.loaded_at = time.monotonic()
+
+    def expired(self) -> bool:
+        return time.monotonic() - self.loaded_at >= BLOG_FACETS_TTL
+
+    def counts(self) -> list[dict]:
+        """Facets for blog.html, largest category first."""
+        facets = [
+            {"key": key, "label": label, "count": len(self.ids[key])}
+            for key, label in self.labels.items()
+        ]
+        facets.sort(key=lambda facet: (-facet["count"], facet["label"].lower()))
+        return facets
+
+    def total(self, category: str = ALL) -> int:
+        return len(self.ids.get(category.lower(), ()))
+
+    def page(self, category: str, page: int, per_page: int) -> tuple[list, int, int]:
+        """Return (post ids on the page, clamped page, total pages)."""
+        ids = self.ids.get(category.lower(), [])
+        total_pages = math.ceil(len(ids) / per_page) if ids else 1
+        page = min(max(page, 1), total_pages)
+        start = (page - 1) * per_page
+        return ids[start:start + per_page], page, total_pages
+
+
+def _load_rows() -> list[dict]:
+    global _published_choice
+    while True:
+        columns = f"id,category,date,{_PUBLISHED_COLUMNS[_published_choice]}"
+        try:
+            return supabase.table("blogs").select(columns).execute().data or []
+        except Exception as e:
+            if _published_choice + 1 >= len(_PUBLISHED_COLUMNS) or "is_publish" not in str(e):
+                raise
+            _published_choice += 1
+            print(f"⚠️ [BLOG_FACETS] Retrying with {_PUBLISHED_COLUMNS[_published_choice]}: {e}")
+
+
+def get_facets() -> BlogFacets:
+    """Return the current facets, loading them if missing or past BLOG_FACETS_TTL."""
+    global _facets
+    facets = _facets
+    if facets is not None and not facets.expired():
+        return facets
+    with _lock:
+        if _facets is None or _facets.expired():
+            _facets = BlogFacets(_load_rows())
+            print(f"✅ [BLOG_FACETS] Loaded {_facets.total()} posts in {len(_facets.labels)} categories")
+        return _facets
+
+
+def invalidate(key=None) -> None:
+    global _facets
+    _facets = None
+
+
+cache_bus.subscribe(cache_bus.BLOGS, invalidate)
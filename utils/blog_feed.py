@@ -0,0 +1,179 @@
+import hashlib
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from xml.sax.saxutils import escape
+from dotenv import load_dotenv
+
+from database import select_existing
+from utils import blog_facets, cache_bus
+
+load_dotenv()
+
+# RSS 2.0 (/blog/feed.xml) and Atom (/blog/atom.xml) feeds of the newest
+# published posts. Both are rendered once and served from memory, with an
+# ETag and Last-Modified for conditional polling, until a cache_bus BLOGS
+# event (an admin blog create/update on any worker) or BLOG_FEED_TTL.
+BLOG_FEED_SIZE = int(os.getenv("BLOG_FEED_SIZE", "20"))
+BLOG_FEED_TTL = float(os.getenv("BLOG_FEED_TTL", "3600"))
+FEED_BASE_URL = os.getenv("BASE_URL", "").strip().rstrip("/")
+
+FEED_TITLE = "BudasAI Blog"
+FEED_DESCRIPTION = "AI tools, productivity and real insights from BudasAI."
+
+RSS = "rss"
+ATOM = "atom"
+
+_lock = threading.Lock()
+_feeds: dict = {}  # (base url, format) -> Feed
+_generation = 0
+
+
+class Feed:
+    def __init__(self, body: bytes, last_modified: datetime):
+        self.body = body
+        self.etag = '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+        self.last_modified = last_modified
+        self.last_modified_http = format_datetime(last_modified, usegmt=True)
+        self.built_at = time.monotonic()
+
+    def expired(self) -> bool:
+        return time.monotonic() - self.built_at >= BLOG_FEED_TTL
+
+    def not_modified(self, if_none_match: str | None, if_modified_since: str | None) -> bool:
+        if if_none_match is not None:
+            return self.etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*"
+        if if_modified_since:
+            try:
+                return self.last_modified.replace(microsecond=0) <= parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+        return False
+
+
+def _parse(value) -> datetime | None:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _posts() -> list[dict]:
+    """Newest published posts, newest first: ids from the facet index, rows by id."""
+    ids = blog_facets.get_facets().ids[blog_facets.ALL][:BLOG_FEED_SIZE]
+    if not ids:
+        return []
+    rows = select_existing(
+        "blogs",
+        ["id", "title", "category", "excerpt", "html_content", "date", "update_at", "create_at"],
+        lambda query: query.in_("id", ids),
+    )
+    by_id = {row.get("id"): row for row in rows}
+    return [by_id[post_id] for post_id in ids if post_id in by_id]
+
+
+def _render_rss(base_url: str, posts: list[dict], updated: datetime) -> str:
+    from routes.pages import clean_title_for_url
+
+    items = []
+    for post in posts:
+        link = f"{base_url}/blog/{post['id']}/{clean_title_for_url(post.get('title') or '')}"
+        published = _parse(post.get("date")) or _parse(post.get("create_at")) or updated
+        items.append(
+            "<item>"
+            f"<title>{escape(post.get('title') or '')}</title>"
+            f"<link>{escape(link)}</link>"
+            f'<guid isPermaLink="true">{escape(link)}</guid>'
+            f"<pubDate>{format_datetime(published, usegmt=True)}</pubDate>"
+            + (f"<category>{escape(post['category'])}</category>" if post.get("category") else "")
+            + f"<description>{escape(post.get('excerpt') or '')}</description>"
+            f"<content:encoded>{escape(post.get('html_content') or '')}</content:encoded>"
+            "</item>\n"
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom" '
+        'xmlns:content="http://purl.org/rss/1.0/modules/content/">\n<channel>\n'
+        f"<title>{escape(FEED_TITLE)}</title>\n"
+        f"<link>{escape(base_url)}/blog</link>\n"
+        f"<description>{escape(FEED_DESCRIPTION)}</description>\n"
+        f'<atom:link href="{escape(base_url)}/blog/feed.xml" rel="self" type="application/rss+xml"/>\n'
+        f"<lastBuildDate>{format_datetime(updated, usegmt=True)}</lastBuildDate>\n"
+        + "".join(items)
+        + "</channel>\n</rss>\n"
+    )
+
+
+def _render_atom(base_url: str, posts: list[dict], updated: datetime) -> str:
+    from routes.pages import clean_title_for_url
+
+    entries = []
+    for post in posts:
+        link = f"{base_url}/blog/{post['id']}/{clean_title_for_url(post.get('title') or '')}"
+        published = _parse(post.get("date")) or _parse(post.get("create_at")) or updated
+        modified = _parse(post.get("update_at")) or published
+        entries.append(
+            "<entry>"
+            f"<title>{escape(post.get('title') or '')}</title>"
+            f'<link href="{escape(link)}"/>'
+            f"<id>{escape(link)}</id>"
+            f"<published>{published.isoformat()}</published>"
+            f"<updated>{modified.isoformat()}</updated>"
+            + (f'<category term="{escape(post["category"])}"/>' if post.get("category") else "")
+            + f"<summary>{escape(post.get('excerpt') or '')}</summary>"
+            f'<content type="html">{escape(post.get("html_content") or "")}</content>'
+            "</entry>\n"
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n<feed xmlns="http://www.w3.org/2005/Atom">\n'
+        f"<title>{escape(FEED_TITLE)}</title>\n"
+        f"<subtitle>{escape(FEED_DESCRIPTION)}</subtitle>\n"
+        f'<link href="{escape(base_url)}/blog"/>\n'
+        f'<link href="{escape(base_url)}/blog/atom.xml" rel="self"/>\n'
+        f"<id>{escape(base_url)}/blog</id>\n"
+        f"<updated>{updated.isoformat()}</updated>\n"
+        f"<author><name>BudasAI</name></author>\n"
+        + "".join(entries)
+        + "</feed>\n"
+    )
+
+
+def get_feed(base_url: str, kind: str) -> Feed:
+    """Return the cached feed, building it if needed. Blocking: run it off the event loop."""
+    base_url = FEED_BASE_URL or base_url.rstrip("/")
+    key = (base_url, kind)
+    feed = _feeds.get(key)
+    if feed is not None and not feed.expired():
+        return feed
+
+    generation = _generation
+    posts = _posts()
+    updated = max(
+        (
+            _parse(post.get("update_at")) or _parse(post.get("date")) or _parse(post.get("create_at"))
+            for post in posts
+        ),
+        key=lambda value: value or datetime.min.replace(tzinfo=timezone.utc),
+        default=None,
+    ) or datetime.now(timezone.utc)
+    render = _render_atom if kind == ATOM else _render_rss
+    feed = Feed(render(base_url, posts, updated).encode(), updated)
+    with _lock:
+        if generation == _generation:
+            _feeds[key] = feed
+    return feed
+
+
+def invalidate(key=None) -> None:
+    global _generation
+    with _lock:
+        _generation += 1
+        _feeds.clear()
+
+
+cache_bus.subscribe(cache_bus.BLOGS, invalidate)
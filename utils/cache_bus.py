@@ -0,0 +1,159 @@
+import asyncio
+import json
+import os
+import socket
+import tempfile
+import time
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Cache invalidation between the workers of one host (see launcher.py).
+#
+# Every worker binds a Unix datagram socket in CACHE_BUS_DIR. publish() applies
+# the event in the calling worker and sends one datagram to every other socket
+# in the directory, so the other workers drop the stale entries within
+# milliseconds. Nothing external is needed; if a datagram is lost, the
+# affected cache still expires through its own TTL.
+CACHE_BUS_DIR = os.getenv("CACHE_BUS_DIR", "").strip() or os.path.join(
+    tempfile.gettempdir(), f"budasai-cache-bus-{os.getenv('PORT', '8000')}"
+)
+
+# Event kinds. One per admin-editable data set; the key narrows an event to
+# one row when the publisher knows it (None means "everything of this kind").
+SITE_SETTINGS = "site_settings"
+PRICING_PLANS = "pricing_plans"
+AI_TOOLS = "ai_tools"  # tools, details, use cases and FAQs
+BLOGS = "blogs"
+STORIES = "stories"
+USER_PROFILES = "user_profiles"
+BILLING = "billing"  # billing records, i.e. entitlements
+WORKFLOWS = "workflows"
+
+EVENT_KINDS = frozenset({
+    SITE_SETTINGS, PRICING_PLANS, AI_TOOLS, BLOGS, STORIES, USER_PROFILES, BILLING, WORKFLOWS,
+})
+
+_MAX_DATAGRAM = 4096
+
+_handlers: dict[str, list] = {}
+_sock: socket.socket | None = None
+_sock_path: str | None = None
+
+
+def subscribe(kind: str, handler) -> None:
+    """Call handler(key) whenever an event of this kind is published by any worker."""
+    if kind not in EVENT_KINDS:
+        raise ValueError(f"Unknown cache event kind: {kind}")
+    _handlers.setdefault(kind, []).append(handler)
+
+
+def _apply(kind: str, key) -> None:
+    for handler in _handlers.get(kind, ()):
+        try:
+            handler(key)
+        except Exception as e:
+            print(f"⚠️ [CACHE_BUS] {kind} handler {getattr(handler, '__name__', handler)} failed: {e}")
+
+
+def _peers():
+    try:
+        names = os.listdir(CACHE_BUS_DIR)
+    except OSError:
+        return []
+    return [
+        os.path.join(CACHE_BUS_DIR, name)
+        for name in names
+        if name.endswith(".sock") and os.path.join(CACHE_BUS_DIR, name) != _sock_path
+    ]
+
+
+def _broadcast(payload: bytes) -> None:
+    if not hasattr(socket, "AF_UNIX"):
+        return
+
+    sender = _sock
+    if sender is None:
+        sender = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        sender.setblocking(False)
+    try:
+        for path in _peers():
+            try:
+                sender.sendto(payload, path)
+            except (ConnectionRefusedError, FileNotFoundError):
+                # Left behind by a worker that was killed; nobody reads it.
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+            except BlockingIOError:
+                print(f"⚠️ [CACHE_BUS] Peer {os.path.basename(path)} is backed up, event dropped")
+            except OSError as e:
+                print(f"⚠️ [CACHE_BUS] Unable to reach {os.path.basename(path)}: {e}")
+    finally:
+        if sender is not _sock:
+            sender.close()
+
+
+def publish(kind: str, key=None) -> None:
+    """Invalidate kind (optionally one key) in this worker and in every other worker."""
+    if kind not in EVENT_KINDS:
+        raise ValueError(f"Unknown cache event kind: {kind}")
+    _apply(kind, key)
+    payload = json.dumps({"kind": kind, "key": key, "pid": os.getpid(), "ts": time.time()}).encode()
+    _broadcast(payload)
+
+
+def _on_readable() -> None:
+    while True:
+        try:
+            data = _sock.recv(_MAX_DATAGRAM)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError as e:
+            print(f"⚠️ [CACHE_BUS] Receive failed: {e}")
+            return
+        try:
+            event = json.loads(data)
+            kind = event["kind"]
+        except (ValueError, KeyError, TypeError):
+            print("⚠️ [CACHE_BUS] Ignoring malformed event")
+            continue
+        if kind in EVENT_KINDS:
+            _apply(kind, event.get("key"))
+
+
+def start() -> None:
+    """Bind this worker's socket and listen on the running event loop."""
+    global _sock, _sock_path
+    if _sock is not None or not hasattr(socket, "AF_UNIX"):
+        return
+    try:
+        os.makedirs(CACHE_BUS_DIR, mode=0o700, exist_ok=True)
+        path = os.path.join(CACHE_BUS_DIR, f"{os.getpid()}.sock")
+        if os.path.exists(path):
+            os.unlink(path)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        sock.setblocking(False)
+        sock.bind(path)
+        _sock, _sock_path = sock, path
+        asyncio.get_running_loop().add_reader(sock.fileno(), _on_readable)
+    except Exception as e:
+        print(f"⚠️ [CACHE_BUS] Disabled, caches stay per worker until their TTL: {e}")
+        stop()
+
+
+def stop() -> None:
+    global _sock, _sock_path
+    if _sock is not None:
+        try:
+            asyncio.get_running_loop().remove_reader(_sock.fileno())
+        except Exception:
+            pass
+        _sock.close()
+    if _sock_path:
+        try:
+            os.unlink(_sock_path)
+        except OSError:
+            pass
+    _sock, _sock_path = None, None
@@ -0,0 +1,240 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from urllib.parse import urlparse
+import httpx
+from dotenv import load_dotenv
+from tenacity import (
+    Retrying,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential,
+)
+
+load_dotenv()
+
+# Circuit breaker for every call to the Supabase host, applied at the transport
+# of the shared sync client (utils.http_clients), so all queries are covered
+# without touching the call sites.
+#
+# closed     calls go through; the last good response of every REST read is kept
+# open       entered once the recent failure or slow-call rate crosses the limit;
+#            calls fail in microseconds, REST reads are answered from the last
+#            good response when there is one
+# half_open  after SUPABASE_BREAKER_OPEN_SECONDS one probe call goes through;
+#            success closes the circuit, failure opens it again
+BREAKER_ENABLED = os.getenv("SUPABASE_BREAKER_ENABLED", "true").strip().lower() == "true"
+BREAKER_WINDOW = int(os.getenv("SUPABASE_BREAKER_WINDOW", "20"))
+BREAKER_MIN_CALLS = int(os.getenv("SUPABASE_BREAKER_MIN_CALLS", "5"))
+BREAKER_FAILURE_RATE = float(os.getenv("SUPABASE_BREAKER_FAILURE_RATE", "0.5"))
+BREAKER_SLOW_CALL_MS = int(os.getenv("SUPABASE_BREAKER_SLOW_CALL_MS", "2500"))
+BREAKER_OPEN_SECONDS = float(os.getenv("SUPABASE_BREAKER_OPEN_SECONDS", "15"))
+# Stored responses are bounded per entry and in total (per worker). Bodies over
+# the per-entry cap, such as whole-table dumps, are never stored; the least
+# recently used entries are dropped to stay under the total.
+LAST_GOOD_MAX_ENTRIES = int(os.getenv("SUPABASE_LAST_GOOD_MAX_ENTRIES", "500"))
+LAST_GOOD_MAX_BYTES = int(os.getenv("SUPABASE_LAST_GOOD_MAX_BYTES", str(256 * 1024)))
+LAST_GOOD_MAX_TOTAL_BYTES = int(os.getenv("SUPABASE_LAST_GOOD_MAX_TOTAL_BYTES", str(32 * 1024 * 1024)))
+
+SUPABASE_HOST = urlparse(os.getenv("SUPABASE_URL") or "").netloc
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+_READ_METHODS = {"GET", "HEAD"}
+_RETRYABLE_ERRORS = (httpx.ConnectError, httpx.RemoteProtocolError)
+
+
+class CircuitOpenError(httpx.TransportError):
+    """Raised instead of calling Supabase while the circuit is open."""
+
+
+class CircuitBreaker:
+    def __init__(self, name: str):
+        self.name = name
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.calls = deque(maxlen=BREAKER_WINDOW)  # True = failed or slow
+        self.probe_in_flight = False
+        self.times_opened = 0
+        self.short_circuited = 0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a call may go out now. Reserves the probe slot when half-open."""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() - self.opened_at >= BREAKER_OPEN_SECONDS:
+                self.state = HALF_OPEN
+                self.probe_in_flight = False
+            if self.state == HALF_OPEN and not self.probe_in_flight:
+                self.probe_in_flight = True
+                return True
+            self.short_circuited += 1
+            return False
+
+    def record(self, failed: bool) -> None:
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self.probe_in_flight = False
+                if failed:
+                    self._open("probe failed")
+                else:
+                    self.state = CLOSED
+                    self.calls.clear()
+                    print(f"✅ [BREAKER] {self.name} closed, probe succeeded")
+                return
+
+            self.calls.append(failed)
+            if self.state == CLOSED and len(self.calls) >= BREAKER_MIN_CALLS:
+                rate = sum(self.calls) / len(self.calls)
+                if rate >= BREAKER_FAILURE_RATE:
+                    self._open(f"{rate:.0%} of the last {len(self.calls)} calls failed or were slow")
+
+    def _open(self, reason: str) -> None:
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        self.times_opened += 1
+        print(f"⚠️ [BREAKER] {self.name} open for {BREAKER_OPEN_SECONDS:.0f}s: {reason}")
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "state": self.state,
+                "recent_calls": len(self.calls),
+                "recent_failures": sum(self.calls),
+                "times_opened": self.times_opened,
+                "short_circuited": self.short_circuited,
+            }
+
+
+class _LastGoodStore:
+    """LRU of the last successful response per REST read."""
+
+    def __init__(self):
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.served = 0
+
+    @staticmethod
+    def key(request: httpx.Request) -> str:
+        # The Authorization header is part of the key so a stored response is
+        # only ever replayed to a caller with the same credentials.
+        parts = [
+            request.method,
+            str(request.url),
+            request.headers.get("authorization", ""),
+            request.headers.get("prefer", ""),
+            request.headers.get("range", ""),
+            request.headers.get("accept", ""),
+            request.headers.get("accept-profile", ""),
+        ]
+        return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+    def save(self, key: str, response: httpx.Response) -> None:
+        if len(response.content) > LAST_GOOD_MAX_BYTES:
+            return
+        headers = [
+            (name, value) for name, value in response.headers.multi_items()
+            if name.lower() not in ("content-encoding", "content-length", "transfer-encoding")
+        ]
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.total_bytes -= len(previous[2])
+            self._entries[key] = (response.status_code, headers, response.content, time.time())
+            self.total_bytes += len(response.content)
+            while len(self._entries) > LAST_GOOD_MAX_ENTRIES or self.total_bytes > LAST_GOOD_MAX_TOTAL_BYTES:
+                _key, evicted = self._entries.popitem(last=False)
+                self.total_bytes -= len(evicted[2])
+
+    def replay(self, key: str, request: httpx.Request) -> httpx.Response | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            self.served += 1
+        status_code, headers, content, saved_at = entry
+        response = httpx.Response(status_code, headers=headers, content=content, request=request)
+        response.headers["X-Served-Stale"] = f"{int(time.time() - saved_at)}s"
+        return response
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+breaker = CircuitBreaker("supabase")
+last_good = _LastGoodStore()
+
+
+class BreakerTransport(httpx.BaseTransport):
+    """Wraps a sync transport; only requests to the Supabase host are guarded."""
+
+    def __init__(self, inner: httpx.BaseTransport):
+        self.inner = inner
+
+    def _send(self, request: httpx.Request) -> httpx.Response:
+        if request.method not in _READ_METHODS:
+            return self.inner.handle_request(request)
+        # Idempotent reads get one quick retry on a dropped or refused connection.
+        for attempt in Retrying(
+            retry=retry_if_exception_type(_RETRYABLE_ERRORS),
+            stop=stop_after_attempt(2),
+            wait=wait_exponential(multiplier=0.05, max=0.2),
+            reraise=True,
+        ):
+            with attempt:
+                return self.inner.handle_request(request)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if not BREAKER_ENABLED or request.url.netloc.decode() != SUPABASE_HOST:
+            return self.inner.handle_request(request)
+
+        cacheable = request.method in _READ_METHODS and request.url.path.startswith("/rest/v1/")
+        key = last_good.key(request) if cacheable else None
+
+        if not breaker.allow():
+            stale = last_good.replay(key, request) if cacheable else None
+            if stale is not None:
+                return stale
+            raise CircuitOpenError(f"Supabase circuit is open, skipped {request.method} {request.url.path}")
+
+        started = time.perf_counter()
+        try:
+            response = self._send(request)
+        except Exception as e:
+            breaker.record(failed=True)
+            stale = last_good.replay(key, request) if cacheable and isinstance(e, httpx.TransportError) else None
+            if stale is not None:
+                return stale
+            raise
+
+        slow = (time.perf_counter() - started) * 1000 >= BREAKER_SLOW_CALL_MS
+        breaker.record(failed=response.status_code >= 500 or slow)
+        if cacheable and response.status_code >= 500:
+            stale = last_good.replay(key, request)
+            if stale is not None:
+                response.close()
+                return stale
+        if cacheable and response.status_code < 300:
+            response.read()
+            last_good.save(key, response)
+        return response
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+def breaker_stats() -> dict:
+    return {
+        **breaker.snapshot(),
+        "last_good_entries": len(last_good),
+        "last_good_bytes": last_good.total_bytes,
+        "last_good_served": last_good.served,
+    }
@@ -0,0 +1,183 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from dotenv import load_dotenv
+
+from database import supabase
+from utils import cache_bus
+
+load_dotenv()
+
+# The AI tool catalog behind the /premium compare tab: the tool dropdown, the
+# compare columns and their JSON payload. Built from ai_tools once per catalog
+# version and served from memory until a cache_bus AI_TOOLS event (an admin
+# tool write on any worker) or COMPARE_CATALOG_TTL. The payload is serialized
+# once and served as-is by /premium/compare.json, which /premium links with
+# ?v=<version>; its content hash is the version and the ETag.
+COMPARE_CATALOG_TTL = float(os.getenv("COMPARE_CATALOG_TTL", "600"))
+
+TOOL_COLUMNS = (
+    "id, name, image_url, best_for, quality_score, ease_score, accuracy_score, speed_score, value_score, "
+    "creativity_score, integration_score, consistency_score, support_score, time_saved_score"
+)
+
+SCORE_COLUMNS = {
+    "Output Quality": "quality_score",
+    "Ease of Use": "ease_score",
+    "Accuracy": "accuracy_score",
+    "Speed": "speed_score",
+    "Value for Money": "value_score",
+    "Creativity": "creativity_score",
+    "Integration": "integration_score",
+    "Consistency": "consistency_score",
+    "Support & Updates": "support_score",
+    "Time Saved": "time_saved_score",
+}
+
+NOT_UPDATED = "Data not updated yet"
+
+
+def _orjson_available() -> bool:
+    try:
+        import orjson  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+if _orjson_available():
+    import orjson
+
+    def dumps(value) -> bytes:
+        return orjson.dumps(value)
+else:
+    def dumps(value) -> bytes:
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+_lock = threading.Lock()
+_catalog = None
+_generation = 0  # bumped by invalidate(); a catalog built before a bump is not cached
+
+
+class CompareCatalog:
+    def __init__(self, tools: list[dict], compare_tools: list[dict]):
+        self.tools = tools  # dropdown entries, display order
+        self.compare_tools = compare_tools
+        self.default_slugs = [tool["slug"] for tool in compare_tools[:3] if tool.get("slug")]
+        payload = dumps({tool["slug"]: tool for tool in compare_tools if tool.get("slug")})
+        # "</script>" never appears literally, so the payload is also safe to inline.
+        self.payload = payload.replace(b"</", b"<\\/")
+        self.version = hashlib.sha1(self.payload).hexdigest()[:16]
+        self.etag = f'"{self.version}"'
+        self.built_at = time.monotonic()
+
+    def expired(self) -> bool:
+        return time.monotonic() - self.built_at >= COMPARE_CATALOG_TTL
+
+    def not_modified(self, if_none_match: str | None) -> bool:
+        if if_none_match is None:
+            return False
+        return self.etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*"
+
+
+def _safe_float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _compare_entry(name: str, slug: str, icon: str, image_url: str, best_for: str, overall: float, scores: dict) -> dict:
+    return {
+        "name": name,
+        "slug": slug,
+        "icon": icon,
+        "image_url": image_url,
+        "tagline": best_for or NOT_UPDATED,
+        "overall": overall,
+        "scores": scores,
+        "benchmarks": {"MMLU": None, "HumanEval": None, "GSM8K": None, "HellaSwag": None, "TruthfulQA": None},
+        "details": {
+            "Company": NOT_UPDATED,
+            "Founded": NOT_UPDATED,
+            "Headquarters": NOT_UPDATED,
+            "Website": NOT_UPDATED,
+            "Best For": best_for or NOT_UPDATED,
+        },
+        "pros": [NOT_UPDATED],
+        "cons": [NOT_UPDATED],
+        "pricing": [{"name": "Plan", "price": NOT_UPDATED, "desc": NOT_UPDATED}],
+        "usecases": [{"icon": "📌", "title": "Use Case", "desc": NOT_UPDATED}],
+    }
+
+
+def from_rows(rows: list[dict]) -> CompareCatalog:
+    """Build a catalog from ai_tools rows in display order; no rows gives the placeholder column."""
+    from routes.pages import infer_tool_icon, slugify_tool_name
+
+    tools = []
+    compare_tools = {}
+    for row in rows:
+        name = row.get("name") or "Untitled"
+        slug = slugify_tool_name(name)
+        scores = {label: _safe_float(row.get(column)) for label, column in SCORE_COLUMNS.items()}
+        overall = round(sum(scores.values()) / len(scores), 1)
+        tools.append({
+            "id": row.get("id"),
+            "name": name,
+            "slug": slug,
+            "icon": infer_tool_icon(name),
+            "image_url": row.get("image_url") or "",
+            "best_for": row.get("best_for") or "",
+            "overall": overall,
+        })
+        # Later rows with the same slug win, as they did in the per-request build.
+        compare_tools[slug] = _compare_entry(
+            name, slug, infer_tool_icon(name), row.get("image_url") or "", row.get("best_for") or "", overall, scores
+        )
+
+    ordered = [compare_tools[tool["slug"]] for tool in tools]
+    if not ordered:
+        ordered = [_compare_entry("Claude", "claude", "🤖", "", "", 0, {label: 0 for label in SCORE_COLUMNS})]
+    return CompareCatalog(tools, ordered)
+
+
+def _build() -> CompareCatalog:
+    rows = (
+        supabase.table("ai_tools")
+        .select(TOOL_COLUMNS)
+        .order("display_order", desc=False)
+        .execute()
+        .data
+        or []
+    )
+    return from_rows(rows)
+
+
+def get_catalog() -> CompareCatalog:
+    """Return the current catalog, building it if needed. Blocking: run it off the event loop."""
+    global _catalog
+    catalog = _catalog
+    if catalog is not None and not catalog.expired():
+        return catalog
+
+    generation = _generation
+    catalog = _build()
+    with _lock:
+        if generation == _generation:
+            _catalog = catalog
+    print(f"✅ [COMPARE] Built catalog {catalog.version}: {len(catalog.tools)} tools, {len(catalog.payload)} bytes")
+    return catalog
+
+
+def invalidate(key=None) -> None:
+    global _catalog, _generation
+    with _lock:
+        _generation += 1
+        _catalog = None
+
+
+cache_bus.subscribe(cache_bus.AI_TOOLS, invalidate)
@@ -1,8 +1,8 @@
 import os
 import time
-import httpx
 from fastapi import Request
 from dotenv import load_dotenv
+from utils.http_clients import get_async_client
 from pricing import (
     BASE_PRICE_INR,
     ADVANCE_PLAN_PRICE,
@@ -54,9 +54,8 @@ async def load_currency_rates():
 
         try:
             print(f"🔵 [LOAD_CURRENCY_RATES] Fetching from Google Sheet...")
-            async with httpx.AsyncClient(follow_redirects=True) as client:
-                resp = await client.get(SHEET_CSV_URL, timeout=10.0)
-                resp.raise_for_status()
+            resp = await get_async_client().get(SHEET_CSV_URL, timeout=10.0)
+            resp.raise_for_status()
             
             print(f"🔵 [LOAD_CURRENCY_RATES] Parsing CSV...")
             lines = resp.text.splitlines()
@@ -0,0 +1,210 @@
+import os
+import threading
+import time
+import weakref
+import httpx
+from dotenv import load_dotenv
+from utils.metrics import observe_outbound
+
+load_dotenv()
+
+# One pooled, keep-alive client per I/O style for every outbound call in a
+# worker: Supabase (sync), resend (sync) and the currency sheet (async). The
+# pools are opened in the lifespan and closed at shutdown, so a request never
+# pays for a TLS handshake that an earlier request already did.
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "30"))
+HTTP_POOL_TIMEOUT = float(os.getenv("HTTP_POOL_TIMEOUT", "5"))
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "50"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "90"))
+
+
+def _h2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "true").strip().lower() == "true" and _h2_available()
+
+
+class _PoolStats:
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.connections_opened = 0
+        self._seen = weakref.WeakSet()
+
+    def record(self, client: str, request, started: float, pool, error: bool = False) -> None:
+        elapsed = time.perf_counter() - started
+        self.requests += 1
+        self.errors += int(error)
+        self.total_seconds += elapsed
+        observe_outbound(client, request.url.host, elapsed, error)
+        # A connection we have not seen before means a new TCP/TLS handshake.
+        for connection in list(pool.connections):
+            if connection not in self._seen:
+                self._seen.add(connection)
+                self.connections_opened += 1
+
+    def snapshot(self, pool) -> dict:
+        connections = list(pool.connections) if pool is not None else []
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "avg_ms": round(self.total_seconds * 1000 / self.requests, 1) if self.requests else 0.0,
+            "connections_opened": self.connections_opened,
+            "connections_open": len(connections),
+            "connections_idle": sum(1 for c in connections if c.is_idle()),
+            "connections_http2": sum(1 for c in connections if "HTTP2" in type(getattr(c, "_connection", None)).__name__),
+        }
+
+
+class _MeteredTransport(httpx.HTTPTransport):
+    def __init__(self, stats: _PoolStats, **kwargs):
+        super().__init__(**kwargs)
+        self.stats = stats
+
+    def handle_request(self, request):
+        started = time.perf_counter()
+        try:
+            response = super().handle_request(request)
+        except Exception:
+            self.stats.record("sync", request, started, self._pool, error=True)
+            raise
+        self.stats.record("sync", request, started, self._pool)
+        return response
+
+
+class _MeteredAsyncTransport(httpx.AsyncHTTPTransport):
+    def __init__(self, stats: _PoolStats, **kwargs):
+        super().__init__(**kwargs)
+        self.stats = stats
+
+    async def handle_async_request(self, request):
+        started = time.perf_counter()
+        try:
+            response = await super().handle_async_request(request)
+        except Exception:
+            self.stats.record("async", request, started, self._pool, error=True)
+            raise
+        self.stats.record("async", request, started, self._pool)
+        return response
+
+
+_sync_client: httpx.Client | None = None
+_async_client: httpx.AsyncClient | None = None
+_sync_stats = _PoolStats()
+_async_stats = _PoolStats()
+_lock = threading.Lock()
+
+
+def _client_kwargs() -> dict:
+    return {
+        "timeout": httpx.Timeout(
+            HTTP_READ_TIMEOUT,
+            connect=HTTP_CONNECT_TIMEOUT,
+            pool=HTTP_POOL_TIMEOUT,
+        ),
+        "follow_redirects": True,
+    }
+
+
+def _transport_kwargs() -> dict:
+    return {
+        "http2": HTTP2_ENABLED,
+        "limits": httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+        ),
+        "retries": 1,  # reconnect once when a kept-alive connection was closed remotely
+    }
+
+
+def get_sync_client() -> httpx.Client:
+    """Shared blocking client (Supabase, resend). Supabase calls are traced and pass the circuit breaker."""
+    global _sync_client
+    if _sync_client is None:
+        with _lock:
+            if _sync_client is None:
+                from utils.circuit_breaker import BreakerTransport
+                from utils.query_trace import TracingTransport
+                _sync_client = httpx.Client(
+                    transport=TracingTransport(
+                        BreakerTransport(_MeteredTransport(_sync_stats, **_transport_kwargs()))
+                    ),
+                    **_client_kwargs(),
+                )
+    return _sync_client
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Shared async client for calls made from the event loop."""
+    global _async_client
+    if _async_client is None:
+        _async_client = httpx.AsyncClient(
+            transport=_MeteredAsyncTransport(_async_stats, **_transport_kwargs()),
+            **_client_kwargs(),
+        )
+    return _async_client
+
+
+def open_clients() -> None:
+    get_sync_client()
+    get_async_client()
+
+
+async def close_clients() -> None:
+    global _sync_client, _async_client
+    sync_client, async_client = _sync_client, _async_client
+    _sync_client = _async_client = None
+    # The Supabase client was built around the sync client closed below; it is
+    # rebuilt on the next pool by the first query after a restart.
+    if sync_client is not None:
+        from database import reset_supabase
+        reset_supabase()
+    if async_client is not None:
+        await async_client.aclose()
+    if sync_client is not None:
+        sync_client.close()
+
+
+def _pool_of(client):
+    transport = getattr(client, "_transport", None)
+    while hasattr(transport, "inner"):  # unwrap the tracing and breaker layers
+        transport = transport.inner
+    return getattr(transport, "_pool", None)
+
+
+def pool_stats() -> dict:
+    from utils.circuit_breaker import breaker_stats
+    return {
+        "http2": HTTP2_ENABLED,
+        "sync": _sync_stats.snapshot(_pool_of(_sync_client)),
+        "async": _async_stats.snapshot(_pool_of(_async_client)),
+        "supabase_breaker": breaker_stats(),
+    }
+
+
+class ResendHTTPClient:
+    """resend.default_http_client backed by the shared sync pool."""
+
+    def request(self, method, url, headers, json=None):
+        response = get_sync_client().request(method, url, headers=headers, json=json)
+        return response.content, response.status_code, response.headers
+
+
+def _forget_after_fork() -> None:
+    # Pooled sockets belong to the parent; a forked worker opens its own.
+    global _sync_client, _async_client, _sync_stats, _async_stats, _lock
+    _sync_client = _async_client = None
+    _sync_stats, _async_stats = _PoolStats(), _PoolStats()
+    _lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_forget_after_fork)
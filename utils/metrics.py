@@ -0,0 +1,292 @@
+import asyncio
+import bisect
+import json
+import os
+import tempfile
+import threading
+import time
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# In-process metrics in Prometheus text format.
+#
+# Recording is a dict lookup plus a few integer adds, cheap enough to leave on
+# in production. Each worker also writes its snapshot to METRICS_DIR every
+# METRICS_FLUSH_SECONDS, and /internal/metrics merges every live worker's
+# snapshot, so one scrape covers the whole launcher (see launcher.py).
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").strip().lower() == "true"
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "").strip()
+METRICS_FLUSH_SECONDS = float(os.getenv("METRICS_FLUSH_SECONDS", "5"))
+METRICS_DIR = os.getenv("METRICS_DIR", "").strip() or os.path.join(
+    tempfile.gettempdir(), f"budasai-metrics-{os.getenv('PORT', '8000')}"
+)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+RENDER_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...]):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self.values: dict[tuple, object] = {}
+        self._lock = threading.Lock()
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *label_values, amount: float = 1) -> None:
+        with self._lock:
+            self.values[label_values] = self.values.get(label_values, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def inc(self, *label_values, amount: float = 1) -> None:
+        with self._lock:
+            self.values[label_values] = self.values.get(label_values, 0) + amount
+
+    def dec(self, *label_values, amount: float = 1) -> None:
+        self.inc(*label_values, amount=-amount)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...], buckets: tuple[float, ...]):
+        super().__init__(name, help_text, labels)
+        self.buckets = buckets
+
+    def observe(self, seconds: float, *label_values) -> None:
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self.values.get(label_values)
+            if series is None:
+                # [per-bucket counts..., +Inf count, sum]
+                series = self.values[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += seconds
+
+
+_registry: list[_Metric] = []
+
+
+def _register(metric):
+    _registry.append(metric)
+    return metric
+
+
+http_requests_total = _register(Counter(
+    "http_requests_total", "HTTP requests by route template and status.", ("method", "route", "status")
+))
+http_request_duration = _register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route"), LATENCY_BUCKETS
+))
+http_requests_in_flight = _register(Gauge(
+    "http_requests_in_flight", "HTTP requests currently being served.", ()
+))
+template_render_duration = _register(Histogram(
+    "template_render_duration_seconds", "Jinja2 template render time.", ("template",), RENDER_BUCKETS
+))
+outbound_requests_total = _register(Counter(
+    "outbound_requests_total", "Outbound HTTP calls by client, host and outcome.", ("client", "host", "outcome")
+))
+outbound_request_duration = _register(Histogram(
+    "outbound_request_duration_seconds", "Outbound HTTP call latency.", ("client", "host"), LATENCY_BUCKETS
+))
+
+
+def observe_outbound(client: str, host: str, seconds: float, error: bool) -> None:
+    if not METRICS_ENABLED:
+        return
+    outbound_requests_total.inc(client, host, "error" if error else "ok")
+    outbound_request_duration.observe(seconds, client, host)
+
+
+# ---------------------------------------------------------------------------
+# Request middleware
+# ---------------------------------------------------------------------------
+
+class MetricsMiddleware:
+    """Pure ASGI middleware: per-route latency, status counts and in-flight gauge."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not METRICS_ENABLED:
+            return await self.app(scope, receive, send)
+
+        started = time.perf_counter()
+        status = {"code": 500}
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_requests_in_flight.dec()
+            route = scope.get("route")
+            if route is not None:
+                template = route.path
+            elif scope["path"].startswith("/static/"):
+                template = "/static"
+            else:
+                template = "<unmatched>"
+            method = scope["method"]
+            http_requests_total.inc(method, template, str(status["code"]))
+            http_request_duration.observe(time.perf_counter() - started, method, template)
+
+
+# ---------------------------------------------------------------------------
+# Cross-worker snapshots and exposition
+# ---------------------------------------------------------------------------
+
+def snapshot() -> dict:
+    data = {}
+    for metric in _registry:
+        with metric._lock:
+            data[metric.name] = [
+                [list(labels), list(value) if isinstance(value, list) else value]
+                for labels, value in metric.values.items()
+            ]
+    return data
+
+
+def _snapshot_path(pid: int) -> str:
+    return os.path.join(METRICS_DIR, f"{pid}.json")
+
+
+def write_snapshot() -> None:
+    try:
+        os.makedirs(METRICS_DIR, mode=0o700, exist_ok=True)
+        path = _snapshot_path(os.getpid())
+        with open(path + ".tmp", "w") as f:
+            json.dump(snapshot(), f)
+        os.replace(path + ".tmp", path)
+    except OSError as e:
+        print(f"⚠️ [METRICS] Unable to write snapshot: {e}")
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+        return True
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+
+
+def _worker_snapshots() -> list[dict]:
+    snapshots = [snapshot()]
+    try:
+        names = os.listdir(METRICS_DIR)
+    except OSError:
+        return snapshots
+    for name in names:
+        if not name.endswith(".json"):
+            continue
+        pid = int(name[:-5]) if name[:-5].isdigit() else 0
+        if not pid or pid == os.getpid():
+            continue
+        path = os.path.join(METRICS_DIR, name)
+        if not _pid_alive(pid):
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+            continue
+        try:
+            with open(path) as f:
+                snapshots.append(json.load(f))
+        except (OSError, ValueError):
+            continue
+    return snapshots
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(names, values, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render_text() -> str:
+    """Merge every worker's snapshot and render Prometheus text format 0.0.4."""
+    merged: dict[str, dict[tuple, object]] = {metric.name: {} for metric in _registry}
+    for worker in _worker_snapshots():
+        for name, series in worker.items():
+            target = merged.get(name)
+            if target is None:
+                continue
+            for labels, value in series:
+                key = tuple(labels)
+                if isinstance(value, list):
+                    current = target.get(key)
+                    target[key] = value if current is None else [a + b for a, b in zip(current, value)]
+                else:
+                    target[key] = target.get(key, 0) + value
+
+    lines = []
+    for metric in _registry:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        for labels, value in sorted(merged[metric.name].items()):
+            if metric.kind != "histogram":
+                lines.append(f"{metric.name}{_label_text(metric.labels, labels)} {_format_number(value)}")
+                continue
+            cumulative = 0
+            for bound, count in zip((*metric.buckets, float("inf")), value[:-1]):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{bound!r}"'
+                lines.append(f"{metric.name}_bucket{_label_text(metric.labels, labels, le)} {cumulative}")
+            lines.append(f"{metric.name}_sum{_label_text(metric.labels, labels)} {repr(float(value[-1]))}")
+            lines.append(f"{metric.name}_count{_label_text(metric.labels, labels)} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+
+_flush_task: asyncio.Task | None = None
+
+
+async def _flush_forever() -> None:
+    while True:
+        await asyncio.sleep(METRICS_FLUSH_SECONDS)
+        await asyncio.to_thread(write_snapshot)
+
+
+def start() -> None:
+    """Start publishing this worker's snapshot for the other workers' scrapes."""
+    global _flush_task
+    if METRICS_ENABLED and _flush_task is None:
+        _flush_task = asyncio.get_running_loop().create_task(_flush_forever())
+
+
+def stop() -> None:
+    global _flush_task
+    if _flush_task is not None:
+        _flush_task.cancel()
+        _flush_task = None
+    # A drained worker's counts leave with it; Prometheus treats that as a reset.
+    try:
+        os.unlink(_snapshot_path(os.getpid()))
+    except OSError:
+        pass
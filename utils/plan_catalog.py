@@ -0,0 +1,80 @@
+import copy
+import os
+import threading
+import time
+from dotenv import load_dotenv
+
+from database import select_existing
+from utils import cache_bus
+
+load_dotenv()
+
+# Every pricing plan, loaded once with the union of the columns the pages and
+# the admin billing form use, indexed by id and in display order. Dropped when
+# an admin pricing write publishes cache_bus PRICING_PLANS (on any worker) or
+# after PLAN_CATALOG_TTL, so /products, /premium, /profile and a checkout click
+# on /plan-action normally read no pricing_plans rows at all.
+PLAN_CATALOG_TTL = float(os.getenv("PLAN_CATALOG_TTL", "600"))
+
+PLAN_COLUMNS = [
+    "id", "plan_name", "plan_heading", "plan_subheading", "price_inr", "discount_percent", "price_note",
+    "features_heading_1", "features_list_1", "features_heading_2", "features_list_2",
+    "is_active", "is_popular", "badge_text", "button_text", "button_url", "button_action", "show_terms",
+    "card_bg_color", "badge_bg_color", "badge_text_color", "display_order", "updated_at",
+]
+
+_lock = threading.Lock()
+_catalog = None
+_generation = 0  # bumped by invalidate(); a catalog loaded before a bump is not cached
+
+
+class PlanCatalog:
+    """Read-only: callers that decorate plans (prices, labels) work on plans() copies."""
+
+    def __init__(self, rows: list[dict]):
+        self._rows = rows  # display order, as loaded
+        self._by_id = {str(row.get("id")): row for row in rows if row.get("id") is not None}
+        self.loaded_at = time.monotonic()
+
+    def expired(self) -> bool:
+        return time.monotonic() - self.loaded_at >= PLAN_CATALOG_TTL
+
+    def plans(self, active_only: bool = False) -> list[dict]:
+        """Copies of the plans in display order."""
+        return [copy.deepcopy(row) for row in self._rows if row.get("is_active") or not active_only]
+
+    def get(self, plan_id, active_only: bool = False) -> dict | None:
+        """A copy of one plan, or None."""
+        row = self._by_id.get(str(plan_id))
+        if row is None or (active_only and not row.get("is_active")):
+            return None
+        return copy.deepcopy(row)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+
+def get_catalog() -> PlanCatalog:
+    """Return the current plan catalog, loading it if needed. Blocking: run it off the event loop."""
+    global _catalog
+    catalog = _catalog
+    if catalog is not None and not catalog.expired():
+        return catalog
+
+    generation = _generation
+    catalog = PlanCatalog(select_existing("pricing_plans", PLAN_COLUMNS, lambda query: query.order("display_order")))
+    with _lock:
+        if generation == _generation:
+            _catalog = catalog
+    print(f"✅ [PLAN_CATALOG] Loaded {len(catalog)} plans")
+    return catalog
+
+
+def invalidate(key=None) -> None:
+    global _catalog, _generation
+    with _lock:
+        _generation += 1
+        _catalog = None
+
+
+cache_bus.subscribe(cache_bus.PRICING_PLANS, invalidate)
@@ -0,0 +1,213 @@
+import contextvars
+import os
+import time
+from collections import Counter
+from urllib.parse import parse_qsl, urlparse
+import httpx
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Per-request tracing of every Supabase call, recorded at the transport of the
+# shared sync client (utils.http_clients). Calls made through asyncio.to_thread
+# are attributed to the request too, because the thread runs in a copy of the
+# request's context.
+QUERY_TRACE_ENABLED = os.getenv("QUERY_TRACE_ENABLED", "true").strip().lower() == "true"
+QUERY_BUDGET_COUNT = int(os.getenv("QUERY_BUDGET_COUNT", "10"))
+QUERY_BUDGET_MS = float(os.getenv("QUERY_BUDGET_MS", "750"))
+# Print the report for every request, not only the ones over budget.
+QUERY_TRACE_REPORT_ALL = os.getenv("QUERY_TRACE_REPORT_ALL", "false").strip().lower() == "true"
+# X-Query-Count / X-Query-Time headers; on by default only outside production.
+_default_headers = "false" if os.getenv("RAILWAY_ENVIRONMENT") else "true"
+QUERY_TRACE_HEADERS = os.getenv("QUERY_TRACE_HEADERS", _default_headers).strip().lower() == "true"
+
+SUPABASE_HOST = urlparse(os.getenv("SUPABASE_URL") or "").netloc
+
+# Repeats of one query shape (same table, operation and filter columns, different
+# values) at or above this count are reported as N+1 candidates.
+N_PLUS_ONE_THRESHOLD = 3
+
+_NON_FILTER_PARAMS = {"select", "order", "limit", "offset", "on_conflict", "columns"}
+
+_current: contextvars.ContextVar = contextvars.ContextVar("query_trace", default=None)
+
+
+class QueryTrace:
+    def __init__(self, label: str):
+        self.label = label
+        self.calls: list[dict] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.calls)
+
+    @property
+    def total_ms(self) -> float:
+        return sum(call["ms"] for call in self.calls)
+
+    def over_budget(self) -> bool:
+        return self.count > QUERY_BUDGET_COUNT or self.total_ms > QUERY_BUDGET_MS
+
+    def duplicates(self) -> list[tuple[str, int]]:
+        seen = Counter(call["fingerprint"] for call in self.calls)
+        return [(fingerprint, n) for fingerprint, n in seen.items() if n > 1]
+
+    def n_plus_one(self) -> list[tuple[str, int]]:
+        variants: dict[str, set] = {}
+        for call in self.calls:
+            variants.setdefault(call["shape"], set()).add(call["fingerprint"])
+        return [(shape, len(v)) for shape, v in variants.items() if len(v) >= N_PLUS_ONE_THRESHOLD]
+
+    def report(self) -> str:
+        lines = [
+            f"🔎 [QUERY_TRACE] {self.label}: {self.count} queries, {self.total_ms:.0f}ms "
+            f"(budget {QUERY_BUDGET_COUNT} / {QUERY_BUDGET_MS:.0f}ms)"
+        ]
+        for index, call in enumerate(self.calls, 1):
+            filters = " ".join(call["filters"]) or "-"
+            rows = "?" if call["rows"] is None else call["rows"]
+            lines.append(
+                f"   {index:>2}. {call['operation']:<6} {call['table']:<28} {call['ms']:7.1f}ms "
+                f"{rows:>5} rows {call['bytes']:>8}B  {call['status']}  {filters}"
+            )
+        for shape, n in self.n_plus_one():
+            lines.append(f"   ⚠️ N+1: {shape} ran {n} times with different values")
+        for fingerprint, n in self.duplicates():
+            lines.append(f"   ⚠️ duplicate: {fingerprint} ran {n} times")
+        return "\n".join(lines)
+
+
+def current_trace() -> QueryTrace | None:
+    return _current.get()
+
+
+def start_trace(label: str) -> contextvars.Token:
+    return _current.set(QueryTrace(label))
+
+
+def end_trace(token: contextvars.Token) -> QueryTrace | None:
+    trace = _current.get()
+    _current.reset(token)
+    return trace
+
+
+def _describe(request: httpx.Request) -> tuple[str, str]:
+    path = request.url.path
+    for prefix in ("/rest/v1/rpc/", "/rest/v1/", "/auth/v1/", "/storage/v1/", "/functions/v1/"):
+        if path.startswith(prefix):
+            name = path[len(prefix):] or "/"
+            break
+    else:
+        prefix, name = "", path
+
+    if prefix == "/rest/v1/rpc/":
+        return "rpc", name
+    if prefix != "/rest/v1/":
+        return request.method.lower(), prefix.strip("/").split("/")[0] + ":" + name
+
+    prefer = request.headers.get("prefer", "")
+    operation = {
+        "GET": "select",
+        "HEAD": "count",
+        "PATCH": "update",
+        "DELETE": "delete",
+        "POST": "upsert" if "resolution=" in prefer else "insert",
+    }.get(request.method, request.method.lower())
+    return operation, name
+
+
+def _row_count(response: httpx.Response | None) -> int | None:
+    if response is None:
+        return None
+    content_range = response.headers.get("content-range", "")
+    span = content_range.split("/")[0]
+    if "-" in span:
+        start, _, end = span.partition("-")
+        if start.isdigit() and end.isdigit():
+            return int(end) - int(start) + 1
+    if content_range.startswith("*"):
+        return 0
+    return None
+
+
+def record(request: httpx.Request, response: httpx.Response | None, started: float, status: str) -> None:
+    trace = _current.get()
+    if trace is None:
+        return
+    operation, table = _describe(request)
+    params = parse_qsl(request.url.query.decode(), keep_blank_values=True)
+    filters = [f"{key}={value}" for key, value in params if key not in _NON_FILTER_PARAMS]
+    filter_shape = ",".join(
+        f"{key}={value.split('.', 1)[0]}" for key, value in params if key not in _NON_FILTER_PARAMS
+    )
+    body = request.content if request.method != "GET" else b""
+    trace.calls.append({
+        "operation": operation,
+        "table": table,
+        "filters": filters,
+        "rows": _row_count(response),
+        "bytes": len(response.content) if response is not None else 0,
+        "ms": (time.perf_counter() - started) * 1000,
+        "status": status,
+        "shape": f"{operation} {table} [{filter_shape}]",
+        "fingerprint": f"{request.method} {request.url.path}?{request.url.query.decode()} {hash(body)}",
+    })
+
+
+class TracingTransport(httpx.BaseTransport):
+    """Records each Supabase call into the current request's trace."""
+
+    def __init__(self, inner: httpx.BaseTransport):
+        self.inner = inner
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if _current.get() is None or request.url.netloc.decode() != SUPABASE_HOST:
+            return self.inner.handle_request(request)
+
+        started = time.perf_counter()
+        try:
+            response = self.inner.handle_request(request)
+        except Exception as e:
+            record(request, None, started, type(e).__name__)
+            raise
+        # Supabase clients read the whole body right away, so reading it here
+        # only moves that work and gives an exact payload size.
+        response.read()
+        status = "stale" if "x-served-stale" in response.headers else str(response.status_code)
+        record(request, response, started, status)
+        return response
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+class QueryTraceMiddleware:
+    """Pure ASGI middleware: one trace per request, budget warnings, debug headers."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not QUERY_TRACE_ENABLED:
+            return await self.app(scope, receive, send)
+
+        token = start_trace(f"{scope['method']} {scope['path']}")
+        trace = current_trace()
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start" and QUERY_TRACE_HEADERS:
+                headers = list(message.get("headers", []))
+                headers.append((b"x-query-count", str(trace.count).encode()))
+                headers.append((b"x-query-time", f"{trace.total_ms:.1f}ms".encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            end_trace(token)
+            if trace.over_budget():
+                print(f"⚠️ [QUERY_BUDGET] {trace.label} exceeded the query budget")
+                print(trace.report())
+            elif QUERY_TRACE_REPORT_ALL and trace.calls:
+                print(trace.report())
@@ -0,0 +1,91 @@
+import os
+import time
+from dotenv import load_dotenv
+from limits import parse, storage, strategies
+
+load_dotenv()
+
+# "memory://" keeps counters per worker. Point this at a shared backend
+# (e.g. "redis://host:6379" or "memcached://host:11211") so limits hold
+# across every worker/instance.
+RATE_LIMIT_STORAGE_URI = os.getenv("RATE_LIMIT_STORAGE_URI", "memory://").strip() or "memory://"
+
+# Contact form limits (limits library notation, e.g. "1 per 12 hours").
+CONTACT_EMAIL_LIMIT = os.getenv("CONTACT_RATE_LIMIT_EMAIL", "1 per 12 hours")
+CONTACT_IP_LIMIT = os.getenv("CONTACT_RATE_LIMIT_IP", "5 per hour")
+
+# Admin login limits. Both are hit before any password hashing happens; a
+# successful login clears the account's attempts.
+ADMIN_LOGIN_IP_LIMIT = os.getenv("ADMIN_LOGIN_RATE_LIMIT_IP", "10 per 15 minutes")
+ADMIN_LOGIN_ACCOUNT_LIMIT = os.getenv("ADMIN_LOGIN_RATE_LIMIT_ACCOUNT", "5 per 15 minutes")
+
+
+def _build_storage():
+    try:
+        return storage.storage_from_string(RATE_LIMIT_STORAGE_URI)
+    except Exception as e:
+        print(f"⚠️ [RATE_LIMIT] Unable to use '{RATE_LIMIT_STORAGE_URI}' ({e}), falling back to memory://")
+        return storage.MemoryStorage()
+
+
+_storage = _build_storage()
+_strategy = strategies.MovingWindowRateLimiter(_storage)
+
+
+class SlidingWindowLimiter:
+    """
+    Sliding-window limiter for a single namespace (e.g. "contact:email").
+
+    Backed by the `limits` moving-window strategy. If the shared backend is
+    unreachable the limiter fails open so the route keeps working.
+    """
+
+    def __init__(self, namespace: str, limit: str):
+        self.namespace = namespace
+        self.limit = parse(limit)
+
+    def hit(self, key: str) -> bool:
+        """Record one attempt for key. Returns False when the limit is exceeded."""
+        try:
+            return _strategy.hit(self.limit, self.namespace, key)
+        except Exception as e:
+            print(f"⚠️ [RATE_LIMIT] {self.namespace} hit failed: {e}")
+            return True
+
+    def test(self, key: str) -> bool:
+        """Check whether key still has room, without recording an attempt."""
+        try:
+            return _strategy.test(self.limit, self.namespace, key)
+        except Exception as e:
+            print(f"⚠️ [RATE_LIMIT] {self.namespace} test failed: {e}")
+            return True
+
+    def clear(self, key: str) -> None:
+        """Forget every recorded attempt for key."""
+        try:
+            _strategy.clear(self.limit, self.namespace, key)
+        except Exception as e:
+            print(f"⚠️ [RATE_LIMIT] {self.namespace} clear failed: {e}")
+
+    def retry_after(self, key: str) -> int:
+        """Seconds until key gets a free slot again (0 if it already has one)."""
+        try:
+            stats = _strategy.get_window_stats(self.limit, self.namespace, key)
+            if stats.remaining > 0:
+                return 0
+            return max(1, int(stats.reset_time - time.time()))
+        except Exception:
+            return 0
+
+
+contact_email_limiter = SlidingWindowLimiter("contact:email", CONTACT_EMAIL_LIMIT)
+contact_ip_limiter = SlidingWindowLimiter("contact:ip", CONTACT_IP_LIMIT)
+admin_login_ip_limiter = SlidingWindowLimiter("admin_login:ip", ADMIN_LOGIN_IP_LIMIT)
+admin_login_account_limiter = SlidingWindowLimiter("admin_login:account", ADMIN_LOGIN_ACCOUNT_LIMIT)
+
+
+def get_client_ip(request) -> str:
+    # Behind a proxy, uvicorn sets request.client from X-Forwarded-For, but only
+    # for the proxies in FORWARDED_ALLOW_IPS (see launcher.py). Trusting any
+    # other peer would let a client pick a fresh "IP" for every request.
+    return request.client.host if request.client else "unknown"
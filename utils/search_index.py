@@ -0,0 +1,373 @@
+import hashlib
+import heapq
+import html
+import math
+import os
+import re
+import threading
+import time
+from bisect import bisect_left
+from dotenv import load_dotenv
+
+from utils import cache_bus
+
+load_dotenv()
+
+# In-process full-text index over blogs and AI tools, used by /search.
+#
+# Documents are loaded from Supabase once at startup. An admin write for blogs
+# or AI tools (published on every worker via utils.cache_bus) refetches just
+# the row it names, or the whole kind when the event has no key. Either way
+# only documents whose text changed are re-tokenized. Searches read the
+# in-memory postings only and never query Supabase.
+SEARCH_ENABLED = os.getenv("SEARCH_ENABLED", "true").strip().lower() == "true"
+SEARCH_MAX_RESULTS = int(os.getenv("SEARCH_MAX_RESULTS", "20"))
+# Seconds before a failed index build is retried by the next search.
+SEARCH_RETRY_SECONDS = float(os.getenv("SEARCH_RETRY_SECONDS", "30"))
+
+# BM25 parameters.
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Title terms count this many times towards term frequency.
+TITLE_BOOST = 3
+# Query terms this long or longer also match indexed terms they prefix
+# ("autom" -> "automation"), at PREFIX_WEIGHT of an exact match.
+PREFIX_MIN_LENGTH = 2
+PREFIX_MAX_EXPANSIONS = 30
+PREFIX_WEIGHT = 0.7
+SNIPPET_LENGTH = 180
+
+BLOG = "blog"
+TOOL = "tool"
+KINDS = (BLOG, TOOL)
+
+# Older blog rows use is_publish instead of is_published; both are read. If
+# either column is missing the blog loads fall back to select("*").
+BLOG_COLUMNS = "id,title,category,excerpt,html_content,image_url,date,is_published,is_publish"
+
+_TAG_RE = re.compile(r"<(script|style)\b.*?</\1>|<[^>]+>", re.IGNORECASE | re.DOTALL)
+_TOKEN_RE = re.compile(r"[^\W_]+")
+_SPACE_RE = re.compile(r"\s+")
+
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have how i if in into is it its of on or our "
+    "so that the their them then there these this to was we what when where which who why "
+    "will with you your".split()
+)
+
+
+def strip_html(text: str) -> str:
+    return _SPACE_RE.sub(" ", html.unescape(_TAG_RE.sub(" ", text or ""))).strip()
+
+
+def tokenize(text: str) -> list[str]:
+    return [token for token in _TOKEN_RE.findall((text or "").lower()) if token not in STOPWORDS]
+
+
+class SearchIndex:
+    """Inverted index with BM25 ranking. All methods are thread-safe."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.postings: dict[str, dict[str, int]] = {}  # term -> {doc key: term frequency}
+        self.docs: dict[str, dict] = {}  # doc key -> stored fields, length, digest
+        self.total_length = 0
+        self._terms: list[str] | None = None  # sorted vocabulary for prefix lookups
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def _remove(self, key: str) -> None:
+        doc = self.docs.pop(key, None)
+        if doc is None:
+            return
+        for term in doc["terms"]:
+            postings = self.postings.get(term)
+            if postings is not None:
+                postings.pop(key, None)
+                if not postings:
+                    del self.postings[term]
+                    self._terms = None
+        self.total_length -= doc["length"]
+
+    def _add(self, key: str, kind: str, title: str, body: str, fields: dict, digest: str) -> None:
+        counts: dict[str, int] = {}
+        for term in tokenize(title):
+            counts[term] = counts.get(term, 0) + TITLE_BOOST
+        for term in tokenize(body):
+            counts[term] = counts.get(term, 0) + 1
+        for term, tf in counts.items():
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = self.postings[term] = {}
+                self._terms = None
+            postings[key] = tf
+        length = sum(counts.values())
+        self.docs[key] = {
+            "kind": kind,
+            "fields": fields,
+            "terms": tuple(counts),
+            "length": length,
+            "digest": digest,
+        }
+        self.total_length += length
+
+    def replace_kind(self, kind: str, documents: list[dict], keys: set[str] | None = None) -> tuple[int, int]:
+        """
+        Make the indexed documents of one kind match `documents` (dicts with key,
+        title, body and stored fields). Unchanged documents are left alone.
+        With `keys`, only those documents are touched: the ones missing from
+        `documents` are removed and every other document is kept.
+        Returns (added or changed, removed).
+        """
+        prepared = {}
+        for document in documents:
+            digest = hashlib.sha1(f"{document['title']}\0{document['body']}".encode()).hexdigest()
+            prepared[document["key"]] = (document, digest)
+
+        changed = removed = 0
+        with self._lock:
+            candidates = self.docs if keys is None else [key for key in keys if key in self.docs]
+            for key in [key for key in candidates if self.docs[key]["kind"] == kind and key not in prepared]:
+                self._remove(key)
+                removed += 1
+            for key, (document, digest) in prepared.items():
+                current = self.docs.get(key)
+                if current is not None and current["digest"] == digest and current["fields"] == document["fields"]:
+                    continue
+                self._remove(key)
+                self._add(key, kind, document["title"], document["body"], document["fields"], digest)
+                changed += 1
+        return changed, removed
+
+    def _expand(self, term: str) -> list[tuple[str, float]]:
+        expansions = [(term, 1.0)] if term in self.postings else []
+        if len(term) < PREFIX_MIN_LENGTH:
+            return expansions
+        if self._terms is None:
+            self._terms = sorted(self.postings)
+        index = bisect_left(self._terms, term)
+        while index < len(self._terms) and len(expansions) < PREFIX_MAX_EXPANSIONS:
+            candidate = self._terms[index]
+            if not candidate.startswith(term):
+                break
+            if candidate != term:
+                expansions.append((candidate, PREFIX_WEIGHT))
+            index += 1
+        return expansions
+
+    def search(self, query: str, kind: str | None = None, limit: int = SEARCH_MAX_RESULTS) -> list[dict]:
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+
+        with self._lock:
+            if not self.docs:
+                return []
+            doc_count = len(self.docs)
+            avg_length = self.total_length / doc_count
+            scores: dict[str, float] = {}
+            for term in terms:
+                # Best expansion per document, so one query term cannot score
+                # several times through its prefixes.
+                best: dict[str, float] = {}
+                for candidate, weight in self._expand(term):
+                    postings = self.postings[candidate]
+                    idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                    for key, tf in postings.items():
+                        length = self.docs[key]["length"]
+                        score = weight * idf * tf * (BM25_K1 + 1) / (
+                            tf + BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length)
+                        )
+                        if score > best.get(key, 0.0):
+                            best[key] = score
+                for key, score in best.items():
+                    scores[key] = scores.get(key, 0.0) + score
+
+            if kind is not None:
+                scores = {key: score for key, score in scores.items() if self.docs[key]["kind"] == kind}
+            top = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+            return [
+                {"kind": self.docs[key]["kind"], "score": round(score, 4), **self.docs[key]["fields"]}
+                for key, score in top
+            ]
+
+
+_index = SearchIndex()
+_pending: dict[str, set | None] = {}  # kind -> ids to refetch, None for the whole kind
+_pending_lock = threading.Lock()
+_worker: threading.Thread | None = None
+_loaded: set[str] = set()
+_last_failure = 0.0
+_blog_columns = BLOG_COLUMNS
+
+
+def _snippet(text: str) -> str:
+    text = strip_html(text)
+    if len(text) <= SNIPPET_LENGTH:
+        return text
+    return text[:SNIPPET_LENGTH].rsplit(" ", 1)[0] + "…"
+
+
+def _blog_rows(ids) -> list[dict]:
+    global _blog_columns
+    from database import supabase
+
+    query = supabase.table("blogs").select(_blog_columns)
+    if ids is not None:
+        query = query.in_("id", list(ids))
+    try:
+        return query.execute().data or []
+    except Exception as e:
+        if _blog_columns == "*" or "is_publish" not in str(e):
+            raise
+        print(f"⚠️ [SEARCH] blogs lacks a publish column, reading select(\"*\"): {e}")
+        _blog_columns = "*"
+        return _blog_rows(ids)
+
+
+def _load_blogs(ids=None) -> list[dict]:
+    """Blog documents; only the given blog ids when `ids` is set."""
+    rows = _blog_rows(ids)
+    documents = []
+    for row in rows:
+        if not (row.get("is_published") or row.get("is_publish")):
+            continue
+        documents.append({
+            "key": f"{BLOG}:{row['id']}",
+            "title": row.get("title") or "",
+            "body": " ".join([
+                row.get("category") or "",
+                row.get("excerpt") or "",
+                strip_html(row.get("html_content") or ""),
+            ]),
+            "fields": {
+                "id": row["id"],
+                "title": row.get("title") or "",
+                "category": row.get("category") or "",
+                "image_url": row.get("image_url") or "",
+                "date": row.get("date") or "",
+                "snippet": _snippet(row.get("excerpt") or row.get("html_content") or ""),
+            },
+        })
+    return documents
+
+
+def _load_tools(ids=None) -> list[dict]:
+    """Tool documents; only the given tool ids when `ids` is set."""
+    from database import supabase
+
+    def narrow(query, column):
+        return query if ids is None else query.in_(column, list(ids))
+
+    tools = (
+        narrow(supabase.table("ai_tools").select("id,name,image_url,best_for"), "id")
+        .eq("is_active", True)
+        .execute()
+        .data
+        or []
+    )
+    details = narrow(
+        supabase.table("ai_tool_details").select("ai_tool_id,tagline,company,about"), "ai_tool_id"
+    ).execute().data or []
+    faqs = narrow(supabase.table("ai_tool_faqs").select("ai_tool_id,question,answer"), "ai_tool_id").execute().data or []
+
+    extra_text: dict = {}
+    for row in details:
+        extra_text.setdefault(row.get("ai_tool_id"), []).extend(
+            [row.get("tagline") or "", row.get("company") or "", strip_html(row.get("about") or "")]
+        )
+    for row in faqs:
+        extra_text.setdefault(row.get("ai_tool_id"), []).extend(
+            [row.get("question") or "", strip_html(row.get("answer") or "")]
+        )
+
+    documents = []
+    for tool in tools:
+        documents.append({
+            "key": f"{TOOL}:{tool['id']}",
+            "title": tool.get("name") or "",
+            "body": " ".join([tool.get("best_for") or "", *extra_text.get(tool["id"], [])]),
+            "fields": {
+                "id": tool["id"],
+                "title": tool.get("name") or "",
+                "image_url": tool.get("image_url") or "",
+                "snippet": _snippet(tool.get("best_for") or ""),
+            },
+        })
+    return documents
+
+
+_LOADERS = {BLOG: _load_blogs, TOOL: _load_tools}
+
+
+def _run_pending() -> None:
+    global _worker, _last_failure
+    while True:
+        with _pending_lock:
+            if not _pending:
+                _worker = None
+                return
+            kind, ids = _pending.popitem()
+        if kind not in _loaded:
+            ids = None  # nothing to patch yet, load the whole kind
+        started = time.perf_counter()
+        try:
+            if ids is None:
+                changed, removed = _index.replace_kind(kind, _LOADERS[kind]())
+                _loaded.add(kind)
+            else:
+                keys = {f"{kind}:{doc_id}" for doc_id in ids}
+                changed, removed = _index.replace_kind(kind, _LOADERS[kind](ids), keys=keys)
+            print(
+                f"✅ [SEARCH] Indexed {kind}s{'' if ids is None else f' {sorted(ids)}'}: {changed} updated, "
+                f"{removed} removed, {len(_index)} documents ({(time.perf_counter() - started) * 1000:.0f}ms)"
+            )
+        except Exception as e:
+            _last_failure = time.monotonic()
+            print(f"⚠️ [SEARCH] Failed to index {kind}s: {e}")
+
+
+def _queue(kind: str, ids: set | None) -> None:
+    global _worker
+    if not SEARCH_ENABLED:
+        return
+    with _pending_lock:
+        queued = _pending.get(kind, set())
+        _pending[kind] = None if ids is None or queued is None else queued | ids
+        if _worker is None:
+            _worker = threading.Thread(target=_run_pending, name="search-index", daemon=True)
+            _worker.start()
+
+
+def refresh(*kinds: str) -> None:
+    """Reload the given kinds (default: all) on a background thread."""
+    for kind in kinds or KINDS:
+        _queue(kind, None)
+
+
+def refresh_document(kind: str, doc_id) -> None:
+    """Refetch and reindex one blog or tool on a background thread."""
+    _queue(kind, {doc_id})
+
+
+def is_ready() -> bool:
+    return _loaded.issuperset(KINDS)
+
+
+def search(query: str, kind: str | None = None, limit: int = SEARCH_MAX_RESULTS) -> list[dict]:
+    if not is_ready() and _worker is None and time.monotonic() - _last_failure >= SEARCH_RETRY_SECONDS:
+        refresh(*(k for k in KINDS if k not in _loaded))
+    return _index.search(query, kind=kind, limit=limit)
+
+
+def stats() -> dict:
+    return {
+        "ready": is_ready(),
+        "documents": len(_index),
+        "terms": len(_index.postings),
+    }
+
+
+cache_bus.subscribe(cache_bus.BLOGS, lambda key: refresh(BLOG) if key is None else refresh_document(BLOG, key))
+cache_bus.subscribe(cache_bus.AI_TOOLS, lambda key: refresh(TOOL) if key is None else refresh_document(TOOL, key))
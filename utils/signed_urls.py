@@ -0,0 +1,54 @@
+import os
+import threading
+import time
+from dotenv import load_dotenv
+
+from database import supabase
+
+load_dotenv()
+
+# Signed Supabase Storage URLs shared by every user. A URL is signed for
+# SIGNED_URL_TTL seconds and handed out until SIGNED_URL_REFRESH_MARGIN seconds
+# before it expires, so whoever gets it still has that long to start the
+# download. One worker signs each object at most once per
+# (TTL - margin), however many users click at the same time.
+SIGNED_URL_TTL = int(os.getenv("SIGNED_URL_TTL", "900"))
+SIGNED_URL_REFRESH_MARGIN = min(int(os.getenv("SIGNED_URL_REFRESH_MARGIN", "60")), SIGNED_URL_TTL // 2)
+
+_lock = threading.Lock()  # guards _urls and _key_locks; never held while signing
+_urls: dict = {}  # (bucket, path) -> (reuse until, signed URL)
+_key_locks: dict = {}  # (bucket, path) -> lock held while that object is signed
+
+
+def _key_lock(key) -> threading.Lock:
+    with _lock:
+        return _key_locks.setdefault(key, threading.Lock())
+
+
+def get_signed_url(bucket: str, path: str) -> str:
+    """Return a signed URL for bucket/path, reusing a fresh one. Blocking: run it off the event loop."""
+    key = (bucket, path)
+    cached = _urls.get(key)
+    if cached is not None and time.monotonic() < cached[0]:
+        return cached[1]
+
+    # One signing request per object, even for a burst of concurrent clicks.
+    # Different objects are signed in parallel.
+    with _key_lock(key):
+        cached = _urls.get(key)
+        if cached is not None and time.monotonic() < cached[0]:
+            return cached[1]
+        signed_at = time.monotonic()
+        url = supabase.storage.from_(bucket).create_signed_url(path, SIGNED_URL_TTL)["signedURL"]
+        with _lock:
+            # Expired entries are dropped whenever a new URL is signed.
+            for stale in [k for k, (until, _url) in _urls.items() if until <= signed_at]:
+                del _urls[stale]
+            _urls[key] = (signed_at + SIGNED_URL_TTL - SIGNED_URL_REFRESH_MARGIN, url)
+        return url
+
+
+def clear() -> None:
+    with _lock:
+        _urls.clear()
+        _key_locks.clear()
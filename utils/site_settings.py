@@ -0,0 +1,60 @@
+import os
+import threading
+import time
+from dotenv import load_dotenv
+
+from database import supabase
+from utils import cache_bus
+
+load_dotenv()
+
+# site_settings (key -> value) held in memory. The whole table is read at once
+# and kept until /admin/settings/update publishes cache_bus SITE_SETTINGS (on
+# any worker) or SITE_SETTINGS_TTL passes.
+SITE_SETTINGS_TTL = float(os.getenv("SITE_SETTINGS_TTL", "600"))
+
+DEFAULT_PDF_FILENAME = "BudasAI Insight Feb 2026.pdf"
+
+_lock = threading.Lock()
+_settings = None  # (loaded at, {key: value})
+_generation = 0  # bumped by invalidate(); settings read before a bump are not cached
+
+
+def _load() -> dict:
+    try:
+        rows = supabase.table("site_settings").select("key,value").execute().data or []
+    except Exception as e:
+        # PGRST205: the table has not been created; every setting uses its default.
+        if "PGRST205" in str(e) and "site_settings" in str(e):
+            return {}
+        raise
+    return {row["key"]: row["value"] for row in rows}
+
+
+def get_all() -> dict:
+    """Return every setting. Blocking: run it off the event loop."""
+    global _settings
+    cached = _settings
+    if cached is not None and time.monotonic() - cached[0] < SITE_SETTINGS_TTL:
+        return cached[1]
+
+    generation = _generation
+    settings = _load()
+    with _lock:
+        if generation == _generation:
+            _settings = (time.monotonic(), settings)
+    return settings
+
+
+def get(key: str, default=None):
+    return get_all().get(key) or default
+
+
+def invalidate(key=None) -> None:
+    global _settings, _generation
+    with _lock:
+        _generation += 1
+        _settings = None
+
+
+cache_bus.subscribe(cache_bus.SITE_SETTINGS, invalidate)
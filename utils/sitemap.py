@@ -0,0 +1,175 @@
+import os
+import threading
+from datetime import datetime
+from xml.sax.saxutils import escape
+from dotenv import load_dotenv
+
+from database import select_existing
+from utils import cache_bus
+
+load_dotenv()
+
+# /sitemap.xml built from the blogs, ai_tools and stories tables.
+#
+# URL entries are cached per source and a source is reloaded only after a
+# cache_bus event for its table (i.e. an admin write on any worker). Rendered
+# XML is cached per shard; the first request after a change streams the XML
+# while caching it. Past SITEMAP_MAX_URLS, /sitemap.xml becomes a sitemap
+# index of /sitemap-<n>.xml shards (the protocol allows 50,000 URLs per file).
+SITEMAP_MAX_URLS = min(int(os.getenv("SITEMAP_MAX_URLS", "50000")), 50000)
+# Absolute site URL used in <loc>; falls back to the request's base URL.
+SITEMAP_BASE_URL = os.getenv("BASE_URL", "").strip().rstrip("/")
+
+_CHUNK_URLS = 500
+
+# Static pages: path -> source whose newest lastmod the page inherits.
+STATIC_PAGES = {
+    "/": None,
+    "/ai-tools": "tools",
+    "/blog": "blogs",
+    "/story": "stories",
+    "/products": None,
+    "/premium": None,
+    "/about": None,
+    "/term-condition": None,
+}
+
+_lock = threading.Lock()
+_sources: dict[str, list[tuple[str, str]]] = {}  # source -> [(path, lastmod)]
+_rendered: dict = {}  # (base url, shard) -> bytes; shard None is /sitemap.xml
+_generation = 0  # bumped by invalidate(); results built before a bump are not cached
+
+
+def _lastmod(row: dict, *columns: str) -> str:
+    for column in columns:
+        value = row.get(column)
+        if not value:
+            continue
+        try:
+            return datetime.fromisoformat(str(value).replace("Z", "+00:00")).date().isoformat()
+        except ValueError:
+            continue
+    return ""
+
+
+def _load_blogs() -> list[tuple[str, str]]:
+    from routes.pages import clean_title_for_url
+
+    rows = select_existing("blogs", ["id", "title", "is_published", "is_publish", "update_at", "create_at", "date"])
+    return [
+        (f"/blog/{row['id']}/{clean_title_for_url(row.get('title') or '')}",
+         _lastmod(row, "update_at", "create_at", "date"))
+        for row in rows
+        if row.get("is_published") or row.get("is_publish")
+    ]
+
+
+def _load_tools() -> list[tuple[str, str]]:
+    from routes.pages import slugify_tool_name
+
+    rows = select_existing(
+        "ai_tools", ["id", "name", "updated_at", "created_at"], lambda query: query.eq("is_active", True)
+    )
+    return [
+        (f"/ai-tool-{slugify_tool_name(row.get('name') or '')}", _lastmod(row, "updated_at", "created_at"))
+        for row in rows
+        if slugify_tool_name(row.get("name") or "")
+    ]
+
+
+def _load_stories() -> list[tuple[str, str]]:
+    # Stories have no pages of their own; they only date /story.
+    rows = select_existing("stories", ["id", "update_at", "updated_at", "created_at"])
+    newest = max((_lastmod(row, "update_at", "updated_at", "created_at") for row in rows), default="")
+    return [("/story", newest)] if newest else []
+
+
+_LOADERS = {"blogs": _load_blogs, "tools": _load_tools, "stories": _load_stories}
+
+
+def _entries() -> list[tuple[str, str]]:
+    """All (path, lastmod) entries, loading only the sources that are not cached."""
+    sources = {}
+    for source, loader in _LOADERS.items():
+        entries = _sources.get(source)
+        if entries is None:
+            generation = _generation
+            entries = loader()
+            with _lock:
+                if generation == _generation:
+                    _sources[source] = entries
+        sources[source] = entries
+
+    newest = {source: max((lastmod for _, lastmod in entries), default="") for source, entries in sources.items()}
+    pages = [(path, newest.get(source, "") if source else "") for path, source in STATIC_PAGES.items()]
+    return pages + sources["blogs"] + sources["tools"]
+
+
+def _url_xml(base_url: str, path: str, lastmod: str) -> str:
+    lastmod_xml = f"<lastmod>{lastmod}</lastmod>" if lastmod else ""
+    return f"<url><loc>{escape(base_url + path)}</loc>{lastmod_xml}</url>\n"
+
+
+def _stream_urlset(base_url: str, entries: list[tuple[str, str]]):
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+    for start in range(0, len(entries), _CHUNK_URLS):
+        yield "".join(_url_xml(base_url, path, lastmod) for path, lastmod in entries[start:start + _CHUNK_URLS])
+    yield "</urlset>\n"
+
+
+def _stream_index(base_url: str, shards: list[list[tuple[str, str]]]):
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+    for number, shard in enumerate(shards, 1):
+        lastmod = max((lastmod for _, lastmod in shard), default="")
+        lastmod_xml = f"<lastmod>{lastmod}</lastmod>" if lastmod else ""
+        yield f"<sitemap><loc>{escape(base_url)}/sitemap-{number}.xml</loc>{lastmod_xml}</sitemap>\n"
+    yield "</sitemapindex>\n"
+
+
+def _caching(key, generation: int, chunks):
+    parts = []
+    for chunk in chunks:
+        encoded = chunk.encode()
+        parts.append(encoded)
+        yield encoded
+    with _lock:
+        if generation == _generation:
+            _rendered[key] = b"".join(parts)
+
+
+def render(base_url: str, shard: int | None = None):
+    """
+    Return cached XML bytes, a generator of XML chunks that fills the cache as it
+    is consumed, or None when the shard does not exist. Blocking: run it off the
+    event loop.
+    """
+    base_url = SITEMAP_BASE_URL or base_url.rstrip("/")
+    key = (base_url, shard)
+    cached = _rendered.get(key)
+    if cached is not None:
+        return cached
+
+    generation = _generation
+    entries = _entries()
+    shards = [entries[start:start + SITEMAP_MAX_URLS] for start in range(0, len(entries), SITEMAP_MAX_URLS)]
+    if shard is None:
+        chunks = _stream_urlset(base_url, entries) if len(shards) <= 1 else _stream_index(base_url, shards)
+    elif len(shards) > 1 and 1 <= shard <= len(shards):
+        chunks = _stream_urlset(base_url, shards[shard - 1])
+    else:
+        return None
+    return _caching(key, generation, chunks)
+
+
+def invalidate(*sources: str) -> None:
+    global _generation
+    with _lock:
+        _generation += 1
+        for source in sources:
+            _sources.pop(source, None)
+        _rendered.clear()
+
+
+cache_bus.subscribe(cache_bus.BLOGS, lambda key: invalidate("blogs"))
+cache_bus.subscribe(cache_bus.AI_TOOLS, lambda key: invalidate("tools"))
+cache_bus.subscribe(cache_bus.STORIES, lambda key: invalidate("stories"))
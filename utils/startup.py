@@ -0,0 +1,88 @@
+import builtins
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# Set STARTUP_PROFILE=false to skip the import timer and the boot report.
+STARTUP_PROFILE = os.getenv("STARTUP_PROFILE", "true").strip().lower() == "true"
+STARTUP_REPORT_TOP_IMPORTS = int(os.getenv("STARTUP_REPORT_TOP_IMPORTS", "12"))
+
+_started = time.perf_counter()
+_phases: list[tuple[str, float]] = []
+
+# Top-level package -> seconds spent importing its own modules (time spent in
+# other packages it pulls in is charged to those packages instead).
+_import_seconds: dict[str, float] = {}
+_import_stack: list[list] = []
+_original_import = None
+_main_thread_id = threading.get_ident()
+
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    if (
+        level
+        or name in sys.modules
+        or threading.get_ident() != _main_thread_id
+    ):
+        return _original_import(name, globals, locals, fromlist, level)
+
+    package = name.partition(".")[0]
+    if _import_stack and _import_stack[-1][0] == package:
+        return _original_import(name, globals, locals, fromlist, level)
+
+    frame = [package, time.perf_counter(), 0.0]
+    _import_stack.append(frame)
+    try:
+        return _original_import(name, globals, locals, fromlist, level)
+    finally:
+        _import_stack.pop()
+        elapsed = time.perf_counter() - frame[1]
+        _import_seconds[package] = _import_seconds.get(package, 0.0) + elapsed - frame[2]
+        if _import_stack:
+            _import_stack[-1][2] += elapsed
+
+
+def install_import_timer() -> None:
+    global _original_import
+    if not STARTUP_PROFILE or _original_import is not None:
+        return
+    _original_import = builtins.__import__
+    builtins.__import__ = _timed_import
+
+
+def uninstall_import_timer() -> None:
+    global _original_import
+    if _original_import is None:
+        return
+    builtins.__import__ = _original_import
+    _original_import = None
+
+
+@contextmanager
+def phase(name: str):
+    """Time one startup step, e.g. `with phase("import routes"): ...`."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _phases.append((name, time.perf_counter() - started))
+
+
+def report() -> None:
+    """Print the startup phases and the slowest imported packages."""
+    uninstall_import_timer()
+    if not STARTUP_PROFILE:
+        return
+
+    total = time.perf_counter() - _started
+    lines = [f"⏱️ [STARTUP] Ready in {total * 1000:.0f}ms ({len(sys.modules)} modules loaded)"]
+    for name, seconds in _phases:
+        lines.append(f"   {seconds * 1000:8.1f}ms  {name}")
+    if _import_seconds:
+        lines.append("   slowest imports (self time per package):")
+        slowest = sorted(_import_seconds.items(), key=lambda item: item[1], reverse=True)
+        for package, seconds in slowest[:STARTUP_REPORT_TOP_IMPORTS]:
+            lines.append(f"   {seconds * 1000:8.1f}ms  {package}")
+    print("\n".join(lines))
@@ -0,0 +1,72 @@
+import os
+import tempfile
+import time
+from dotenv import load_dotenv
+from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+from utils.metrics import template_render_duration
+
+load_dotenv()
+
+TEMPLATE_DIR = "templates"
+
+# Reload templates from disk on change only while developing locally. In
+# production every worker keeps its compiled templates for its whole life.
+_default_reload = "false" if os.getenv("RAILWAY_ENVIRONMENT") else "true"
+TEMPLATE_AUTO_RELOAD = os.getenv("TEMPLATE_AUTO_RELOAD", _default_reload).strip().lower() == "true"
+
+# Compiled template bytecode survives restarts here, so a fresh worker loads
+# bytecode instead of parsing and compiling every template again.
+TEMPLATE_CACHE_DIR = os.getenv("TEMPLATE_CACHE_DIR", ".jinja_cache").strip()
+
+
+def _build_bytecode_cache() -> FileSystemBytecodeCache | None:
+    for directory in (TEMPLATE_CACHE_DIR, os.path.join(tempfile.gettempdir(), "budasai-jinja-cache")):
+        if not directory:
+            continue
+        try:
+            os.makedirs(directory, exist_ok=True)
+            if os.access(directory, os.W_OK):
+                return FileSystemBytecodeCache(directory)
+        except OSError as e:
+            print(f"⚠️ [TEMPLATES] Bytecode cache dir '{directory}' unavailable: {e}")
+    print("⚠️ [TEMPLATES] Running without a bytecode cache")
+    return None
+
+
+env = Environment(
+    loader=FileSystemLoader(TEMPLATE_DIR),
+    autoescape=True,
+    auto_reload=TEMPLATE_AUTO_RELOAD,
+    bytecode_cache=_build_bytecode_cache(),
+    # Keep every template in memory; the set is small and fixed.
+    cache_size=-1,
+)
+
+class _TimedTemplates(Jinja2Templates):
+    """Records render time per template (TemplateResponse renders eagerly)."""
+
+    def TemplateResponse(self, *args, **kwargs):
+        started = time.perf_counter()
+        response = super().TemplateResponse(*args, **kwargs)
+        template_render_duration.observe(time.perf_counter() - started, response.template.name)
+        return response
+
+
+# Shared by routes.pages and admin_routes.
+templates = _TimedTemplates(env=env)
+
+
+def precompile_templates() -> int:
+    """Load every .html template into the environment cache. Returns the count."""
+    started = time.perf_counter()
+    compiled = 0
+    for name in env.list_templates(extensions=["html"]):
+        try:
+            env.get_template(name)
+            compiled += 1
+        except Exception as e:
+            print(f"❌ [TEMPLATES] Failed to compile {name}: {e}")
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    print(f"✅ [TEMPLATES] {compiled} templates ready in {elapsed_ms:.0f}ms (auto_reload={TEMPLATE_AUTO_RELOAD})")
+    return compiled
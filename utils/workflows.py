@@ -0,0 +1,235 @@
+import hashlib
+import os
+import threading
+import time
+from types import MappingProxyType
+
+from database import supabase
+from utils import cache_bus
+
+# One PostgREST request returns a workflow together with its steps and results
+# as embedded resources (premium_workflow_steps / premium_workflow_results).
+WORKFLOW_COLUMNS = (
+    "id,tool,tab,difficulty,eyebrow_text,eyebrow_color,panel_title,description,"
+    "stat_pills,tool_chips,result_summary,updated_at"
+)
+STEP_COLUMNS = (
+    "phase_number,phase_name,step_number,title,tools_used,badge_color,step_num_color,"
+    "time_estimate,description,prompt,expected_output,pro_tip"
+)
+RESULT_COLUMNS = "stat_number,value,label,color"
+
+# Flipped off if premium_workflow_save.sql has not been applied yet.
+_has_content_version = True
+
+# Premium pages read workflows from a WorkflowSnapshot: every workflow
+# assembled once per content version. An admin workflow save bumps
+# content_version and publishes cache_bus WORKFLOWS, which drops the snapshot
+# on every worker. After WORKFLOW_SNAPSHOT_TTL the versions are re-checked with
+# one narrow query, and only workflows whose version changed are refetched.
+WORKFLOW_SNAPSHOT_TTL = float(os.getenv("WORKFLOW_SNAPSHOT_TTL", "300"))
+# Changed workflows are refetched by id only for small diffs. A cold build, or
+# a diff touching most of the library or more ids than this, reads the whole
+# embedded query instead, so the request URL does not grow with the library.
+WORKFLOW_REFETCH_MAX_IDS = int(os.getenv("WORKFLOW_REFETCH_MAX_IDS", "50"))
+
+_snapshot_lock = threading.Lock()
+_snapshot = None
+_snapshot_checked_at = 0.0
+_generation = 0  # bumped by invalidate(); a snapshot built before a bump is not kept
+
+
+def _embedded_query():
+    columns = WORKFLOW_COLUMNS + (",content_version" if _has_content_version else "")
+    return (
+        supabase
+        .table("premium_workflows")
+        .select(
+            f"{columns},"
+            f"premium_workflow_steps({STEP_COLUMNS}),"
+            f"premium_workflow_results({RESULT_COLUMNS})"
+        )
+        .order("phase_number", foreign_table="premium_workflow_steps")
+        .order("step_number", foreign_table="premium_workflow_steps")
+        .order("stat_number", foreign_table="premium_workflow_results")
+    )
+
+
+def _execute_embedded(apply_filters):
+    global _has_content_version
+    try:
+        return apply_filters(_embedded_query()).execute().data or []
+    except Exception as e:
+        if not (_has_content_version and "content_version" in str(e)):
+            raise
+        print("⚠️ [WORKFLOWS] content_version column missing, run premium_workflow_save.sql")
+        _has_content_version = False
+        return apply_filters(_embedded_query()).execute().data or []
+
+
+def _version(row: dict) -> tuple:
+    return (row.get("content_version"), row.get("updated_at"))
+
+
+def _assemble(row: dict) -> dict:
+    phases_map = {}
+    for step in row.get("premium_workflow_steps") or []:
+        phase_number = step.get("phase_number") or 0
+        if phase_number not in phases_map:
+            phases_map[phase_number] = {
+                "phase_name": step.get("phase_name") or f"Phase {phase_number}",
+                "steps": [],
+            }
+        phases_map[phase_number]["steps"].append({
+            "title": step.get("title") or "",
+            "tools_used": step.get("tools_used") or "",
+            "badge_color": step.get("badge_color") or "",
+            "step_num_color": step.get("step_num_color") or "",
+            "time_estimate": step.get("time_estimate") or "",
+            "description": step.get("description") or "",
+            "prompt": step.get("prompt") or "",
+            "expected_output": step.get("expected_output") or "",
+            "pro_tip": step.get("pro_tip") or "",
+        })
+    phases = [phases_map[k] for k in sorted(phases_map.keys())]
+
+    result_rows = row.get("premium_workflow_results") or []
+    result_summary = [
+        {
+            "value": result.get("value") or "",
+            "label": result.get("label") or "",
+            "color": result.get("color") or "#ffffff",
+        }
+        for result in result_rows
+    ]
+    if not result_summary:
+        result_summary = row.get("result_summary") or []
+
+    tool_chips = row.get("tool_chips") or []
+    return {
+        "id": row.get("id"),
+        "tool": row.get("tool") or "",
+        "tab": row.get("tab") or "",
+        "difficulty": row.get("difficulty") or "Beginner",
+        "eyebrow_text": row.get("eyebrow_text") or "",
+        "eyebrow_color": row.get("eyebrow_color") or "",
+        "panel_title": row.get("panel_title") or "",
+        "description": row.get("description") or "",
+        "stat_pills": row.get("stat_pills") or [],
+        "tool_chips": tool_chips,
+        "result_summary": result_summary,
+        "phases": phases,
+        "phase_count": len(phases),
+        "step_count": sum(len(phase["steps"]) for phase in phases),
+        "tools_count": len(tool_chips),
+        "estimated_time": (result_summary[0].get("value") if result_summary else ""),
+        "content_version": row.get("content_version"),
+    }
+
+
+def load_workflow(tool: str, tab: str) -> dict | None:
+    """Load one workflow (with ordered steps and results) in a single request."""
+    rows = _execute_embedded(lambda query: query.eq("tool", tool).eq("tab", tab).limit(1))
+    return _assemble(rows[0]) if rows else None
+
+
+class WorkflowSnapshot:
+    """Every workflow, assembled, for one content version. Read-only once built."""
+
+    def __init__(self, rows: list[dict], assembled: dict):
+        from routes.pages import slugify_tool_name
+
+        workflows, tool_names, versions = {}, {}, {}
+        for row in rows:
+            tool = (row.get("tool") or "").strip() or "Untitled Tool"
+            slug = slugify_tool_name(tool)
+            key = (slug, (row.get("tab") or "").strip().lower())
+            # Rows come ordered by tool and tab; a later duplicate wins.
+            workflows[key] = assembled[row["id"]]
+            versions[key] = _version(row)
+            tool_names[slug] = tool
+
+        by_tool: dict = {}
+        for (slug, tab), workflow in workflows.items():
+            by_tool.setdefault(slug, {})[tab] = workflow
+
+        self.workflows = MappingProxyType(workflows)  # (tool slug, tab) -> workflow
+        self.versions = MappingProxyType(versions)  # (tool slug, tab) -> (content_version, updated_at)
+        self.by_tool = MappingProxyType({slug: MappingProxyType(tabs) for slug, tabs in by_tool.items()})
+        self.tool_names = MappingProxyType(tool_names)  # tool slug -> stored tool name
+        self.assembled = MappingProxyType(dict(assembled))  # workflow id -> workflow
+        self.row_versions = {row["id"]: _version(row) for row in rows}
+        self.version = hashlib.sha1(repr(sorted(self.row_versions.items(), key=str)).encode()).hexdigest()[:16]
+
+    def get(self, slug: str, tab: str) -> dict | None:
+        return self.workflows.get((slug, tab))
+
+    def tabs(self, slug: str) -> dict:
+        return self.by_tool.get(slug, {})
+
+
+def _version_rows() -> list[dict]:
+    global _has_content_version
+    columns = "id,tool,tab,updated_at" + (",content_version" if _has_content_version else "")
+    try:
+        return supabase.table("premium_workflows").select(columns).order("tool").order("tab").execute().data or []
+    except Exception as e:
+        if not (_has_content_version and "content_version" in str(e)):
+            raise
+        print("⚠️ [WORKFLOWS] content_version column missing, run premium_workflow_save.sql")
+        _has_content_version = False
+        return _version_rows()
+
+
+def _build(previous: WorkflowSnapshot | None) -> WorkflowSnapshot:
+    rows = _version_rows()
+    if previous is not None and previous.row_versions == {row["id"]: _version(row) for row in rows}:
+        return previous
+
+    assembled, changed = {}, []
+    for row in rows:
+        if previous is not None and previous.row_versions.get(row["id"]) == _version(row):
+            assembled[row["id"]] = previous.assembled[row["id"]]
+        else:
+            changed.append(row["id"])
+    if changed:
+        if previous is None or len(changed) > WORKFLOW_REFETCH_MAX_IDS or 2 * len(changed) > len(rows):
+            fetched = _execute_embedded(lambda query: query)
+        else:
+            fetched = _execute_embedded(lambda query: query.in_("id", changed))
+        wanted = set(changed)
+        for row in fetched:
+            if row["id"] in wanted:
+                assembled[row["id"]] = _assemble(row)
+    rows = [row for row in rows if row["id"] in assembled]
+
+    snapshot = WorkflowSnapshot(rows, assembled)
+    print(f"✅ [WORKFLOWS] Snapshot {snapshot.version}: {len(rows)} workflows, {len(changed)} assembled")
+    return snapshot
+
+
+def get_snapshot() -> WorkflowSnapshot:
+    """Return the current workflow snapshot. Blocking: run it off the event loop."""
+    global _snapshot, _snapshot_checked_at
+    snapshot = _snapshot
+    if snapshot is not None and time.monotonic() - _snapshot_checked_at < WORKFLOW_SNAPSHOT_TTL:
+        return snapshot
+
+    generation = _generation
+    snapshot = _build(snapshot)
+    with _snapshot_lock:
+        if generation == _generation:
+            _snapshot = snapshot
+            _snapshot_checked_at = time.monotonic()
+    return snapshot
+
+
+def invalidate(key=None) -> None:
+    """Make the next get_snapshot() re-check versions; unchanged workflows are kept."""
+    global _snapshot_checked_at, _generation
+    with _snapshot_lock:
+        _generation += 1
+        _snapshot_checked_at = 0.0
+
+
+cache_bus.subscribe(cache_bus.WORKFLOWS, invalidate)